@@ -0,0 +1,45 @@
+"""Add composite indexes for sync_states and snapshots query patterns
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add composite indexes used by sync state and snapshot lookups."""
+    op.create_index(
+        "ix_sync_states_group_status",
+        "sync_states",
+        ["sync_group_id", "status"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_sync_states_system_dataset",
+        "sync_states",
+        ["system_id", "dataset"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_snapshots_system_pool_dataset_ts",
+        "snapshots",
+        ["system_id", "pool", "dataset", "timestamp"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Remove the composite indexes."""
+    op.drop_index("ix_snapshots_system_pool_dataset_ts", table_name="snapshots")
+    op.drop_index("ix_sync_states_system_dataset", table_name="sync_states")
+    op.drop_index("ix_sync_states_group_status", table_name="sync_states")
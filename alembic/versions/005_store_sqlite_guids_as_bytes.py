@@ -0,0 +1,69 @@
+"""Store GUID columns as 16-byte blobs on SQLite
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+# Every GUID column in the schema, by table
+GUID_COLUMNS = {
+    "systems": ["id"],
+    "snapshots": ["id", "system_id"],
+    "sync_groups": ["id", "hub_system_id"],
+    "sync_group_systems": ["id", "sync_group_id", "system_id"],
+    "sync_states": ["id", "sync_group_id", "system_id"],
+}
+
+
+def _convert(source_type: str, convert) -> None:
+    """Rewrite GUID values of the given SQLite storage class using convert()."""
+    bind = op.get_bind()
+    for table, columns in GUID_COLUMNS.items():
+        for column in columns:
+            rows = bind.execute(
+                sa.text(
+                    f"SELECT DISTINCT {column} FROM {table} "  # nosec B608 - fixed identifiers
+                    f"WHERE typeof({column}) = :source_type"
+                ),
+                {"source_type": source_type},
+            ).fetchall()
+            for (value,) in rows:
+                bind.execute(
+                    sa.text(
+                        f"UPDATE {table} SET {column} = :new "  # nosec B608 - fixed identifiers
+                        f"WHERE {column} = :old"
+                    ),
+                    {"new": convert(value), "old": value},
+                )
+
+
+def upgrade():
+    """Convert SQLite GUID values from 36-char text to raw 16-byte blobs.
+
+    PostgreSQL uses the native UUID type and is left untouched. SQLite stores
+    blob values verbatim regardless of the declared CHAR(36) column type, so
+    only the values need rewriting.
+    """
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _convert("text", lambda value: uuid.UUID(value).bytes)
+
+
+def downgrade():
+    """Convert SQLite GUID values back to 36-char text."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _convert("blob", lambda value: str(uuid.UUID(bytes=bytes(value))))
@@ -0,0 +1,30 @@
+"""Add (system_id, timestamp, id) index for keyset pagination of snapshots
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "006"
+down_revision = "005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the index backing newest-first keyset pagination per system."""
+    op.create_index(
+        "ix_snapshots_system_ts_id",
+        "snapshots",
+        ["system_id", "timestamp", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Remove the keyset pagination index."""
+    op.drop_index("ix_snapshots_system_ts_id", table_name="snapshots")
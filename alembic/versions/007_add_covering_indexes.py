@@ -0,0 +1,46 @@
+"""Add covering indexes for snapshot, system and sync state lookups
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add indexes for the remaining hot filter columns."""
+    op.create_index(
+        "ix_snapshots_pool_dataset_system_ts",
+        "snapshots",
+        ["pool", "dataset", "system_id", "timestamp"],
+        unique=False,
+        postgresql_include=["id", "name"],
+    )
+    op.create_index(
+        "ix_snapshots_dataset_system",
+        "snapshots",
+        ["dataset", "system_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_systems_connectivity_status",
+        "systems",
+        ["connectivity_status"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Remove the covering indexes."""
+    op.drop_index("ix_systems_connectivity_status", table_name="systems")
+    op.drop_index("ix_snapshots_dataset_system", table_name="snapshots")
+    op.drop_index("ix_snapshots_pool_dataset_system_ts", table_name="snapshots")
@@ -0,0 +1,42 @@
+"""Make (sync_group_id, system_id) unique on sync_group_systems
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Collapse duplicate memberships and add the unique index ON CONFLICT relies on."""
+    op.execute(
+        """
+        DELETE FROM sync_group_systems
+        WHERE EXISTS (
+            SELECT 1 FROM sync_group_systems AS other
+            WHERE other.sync_group_id = sync_group_systems.sync_group_id
+              AND other.system_id = sync_group_systems.system_id
+              AND other.id < sync_group_systems.id
+        )
+        """
+    )
+    op.create_index(
+        "ix_sync_group_systems_group_system",
+        "sync_group_systems",
+        ["sync_group_id", "system_id"],
+        unique=True,
+    )
+
+
+def downgrade():
+    """Remove the unique membership index."""
+    op.drop_index("ix_sync_group_systems_group_system", table_name="sync_group_systems")
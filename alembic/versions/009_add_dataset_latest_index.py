@@ -0,0 +1,38 @@
+"""Extend the dataset/system snapshot index with timestamp
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Replace ix_snapshots_dataset_system with a (dataset, system_id, timestamp) index."""
+    op.create_index(
+        "ix_snapshots_dataset_system_ts",
+        "snapshots",
+        ["dataset", "system_id", "timestamp"],
+        unique=False,
+    )
+    op.drop_index("ix_snapshots_dataset_system", table_name="snapshots")
+
+
+def downgrade():
+    """Restore the two-column dataset/system index."""
+    op.create_index(
+        "ix_snapshots_dataset_system",
+        "snapshots",
+        ["dataset", "system_id"],
+        unique=False,
+    )
+    op.drop_index("ix_snapshots_dataset_system_ts", table_name="snapshots")
@@ -0,0 +1,73 @@
+"""Make (sync_group_id, dataset, system_id) unique on sync_states
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Sync states superseded by a more recently updated state for the same
+# (group, dataset, system); ties on updated_at keep the highest id
+_SUPERSEDED = """
+    FROM sync_states
+    WHERE EXISTS (
+        SELECT 1 FROM sync_states AS newer
+        WHERE newer.sync_group_id = sync_states.sync_group_id
+          AND newer.dataset = sync_states.dataset
+          AND newer.system_id = sync_states.system_id
+          AND (
+            newer.updated_at > sync_states.updated_at
+            OR (newer.updated_at = sync_states.updated_at AND newer.id > sync_states.id)
+          )
+    )
+"""
+
+
+def upgrade():
+    """
+    Remove duplicate sync states and add the unique index bulk upserts rely on.
+
+    Older builds could record several states for one (group, dataset, system).
+    The most recently updated one is kept; every removed row is logged.
+    """
+    bind = op.get_bind()
+    superseded = bind.execute(
+        sa.text(f"SELECT id, sync_group_id, dataset, system_id, status {_SUPERSEDED}")
+    ).all()
+    if superseded:
+        logger.warning(
+            "Removing %d duplicate sync_states rows before adding "
+            "ix_sync_states_group_dataset_system",
+            len(superseded),
+        )
+        for row in superseded:
+            logger.warning(
+                "Removing sync state %s (group %s, dataset %s, system %s, status %s)",
+                *row,
+            )
+        bind.execute(sa.text(f"DELETE {_SUPERSEDED}"))
+    op.create_index(
+        "ix_sync_states_group_dataset_system",
+        "sync_states",
+        ["sync_group_id", "dataset", "system_id"],
+        unique=True,
+    )
+
+
+def downgrade():
+    """Remove the unique sync state index."""
+    op.drop_index("ix_sync_states_group_dataset_system", table_name="sync_states")
@@ -15,6 +15,9 @@ from zfs_sync.database.base import Base, get_db
 # Import models to ensure they register with Base.metadata
 import zfs_sync.database.models  # noqa: F401
 
+# Make unplanned lazy loads on repository results raise (see repository_loader_policy)
+os.environ.setdefault("ZFS_SYNC_STRICT_LOADING", "1")
+
 # Use file-based SQLite for tests to ensure consistent database across connections
 # In-memory SQLite creates separate databases per connection, causing test failures
 _test_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
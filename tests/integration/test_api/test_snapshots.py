@@ -118,3 +118,33 @@ class TestSnapshotsEndpoints:
         data = response.json()
         assert isinstance(data, list)
         assert len(data) >= 1
+
+    def test_get_snapshot_history(self, test_client):
+        """Test that the history endpoint returns JSON-encoded snapshot entries."""
+        register_response = test_client.post(
+            "/api/v1/systems",
+            json={"hostname": "test-system-history", "platform": "linux"},
+        )
+        system_id = register_response.json()["id"]
+        api_key = register_response.json()["api_key"]
+        test_client.post(
+            "/api/v1/snapshots",
+            headers={"X-API-Key": api_key},
+            json={
+                "name": "backup-20240115-120000",
+                "pool": "tank",
+                "dataset": "tank/data",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "system_id": str(system_id),
+            },
+        )
+
+        response = test_client.get(
+            f"/api/v1/snapshots/history/{system_id}", headers={"X-API-Key": api_key}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["count"] == 1
+        assert data["history"][0]["name"] == "backup-20240115-120000"
@@ -0,0 +1,31 @@
+"""Unit tests for configuration validation."""
+
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from zfs_sync.config import validation
+
+
+class TestDirectoryWritability:
+    """Test suite for the directory writability probe."""
+
+    def test_concurrent_probes_of_same_directory(self, tmp_path):
+        """Test that validators probing one directory at once all see it as writable."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(validation._is_dir_writable, [tmp_path] * 32))
+
+        assert all(results)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_probe_not_cached(self, tmp_path, monkeypatch):
+        """Test that a directory that was not writable is probed again next time."""
+        original = tempfile.NamedTemporaryFile
+
+        def unwritable(*args, **kwargs):
+            raise PermissionError("read-only")
+
+        monkeypatch.setattr(tempfile, "NamedTemporaryFile", unwritable)
+        assert validation._is_dir_writable(tmp_path) is False
+
+        monkeypatch.setattr(tempfile, "NamedTemporaryFile", original)
+        assert validation._is_dir_writable(tmp_path) is True
@@ -0,0 +1,26 @@
+"""Unit tests for custom column types."""
+
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+
+from zfs_sync.database.base import GUID
+
+
+class TestGUID:
+    """Test suite for the GUID column type."""
+
+    @pytest.mark.parametrize("dialect", [postgresql.dialect(), sqlite.dialect()])
+    def test_malformed_string_rejected(self, dialect):
+        """Test that a malformed id raises ValueError before reaching the driver."""
+        with pytest.raises(ValueError):
+            GUID().process_bind_param("not-a-uuid-but-36-characters-long-xx", dialect)
+
+    def test_postgresql_binds_canonical_text(self):
+        """Test that PostgreSQL gets the canonical text form for UUIDs and strings."""
+        value = uuid.uuid4()
+        dialect = postgresql.dialect()
+
+        assert GUID().process_bind_param(value, dialect) == str(value)
+        assert GUID().process_bind_param(str(value).upper(), dialect) == str(value)
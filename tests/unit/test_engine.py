@@ -0,0 +1,31 @@
+"""Unit tests for database initialization helpers."""
+
+import uuid
+
+from sqlalchemy import text
+
+from zfs_sync.database.engine import _find_text_guids
+from zfs_sync.database.repositories import SystemRepository
+
+
+class TestFindTextGuids:
+    """Test suite for detecting ids stored in the pre-blob text form."""
+
+    def test_blob_ids_pass(self, test_db, sample_system_data):
+        """Test that a database written by this version reports nothing."""
+        SystemRepository(test_db).create(**sample_system_data)
+
+        assert _find_text_guids(test_db.connection()) == []
+
+    def test_text_ids_reported(self, test_db):
+        """Test that text-form ids are found so init_db can refuse to start."""
+        test_db.execute(
+            text(
+                "INSERT INTO systems (id, hostname, platform, connectivity_status, ssh_port, "
+                "created_at, updated_at) VALUES (:id, 'legacy', 'linux', 'unknown', 22, "
+                "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ),
+            {"id": str(uuid.uuid4())},
+        )
+
+        assert _find_text_guids(test_db.connection()) == ["systems.id"]
@@ -0,0 +1,155 @@
+"""Unit tests for logging configuration."""
+
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from zfs_sync import logging_config
+from zfs_sync.logging_config import (
+    BufferedRotatingFileHandler,
+    CachedTimeFormatter,
+    get_logger,
+    setup_logging,
+)
+
+
+@pytest.fixture
+def restore_root_logger():
+    """Put the root logger back the way pytest configured it."""
+    root_logger = logging.getLogger()
+    handlers, level = list(root_logger.handlers), root_logger.level
+    configured = logging_config._configured
+    flags = (logging.logThreads, logging.logProcesses, logging.logMultiprocessing)
+    asyncio_tasks = getattr(logging, "logAsyncioTasks", None)
+    yield
+    logging_config._stop_listener()
+    logging_config._configured = configured
+    root_logger.handlers[:] = handlers
+    root_logger.setLevel(level)
+    logging.logThreads, logging.logProcesses, logging.logMultiprocessing = flags
+    if asyncio_tasks is not None:
+        logging.logAsyncioTasks = asyncio_tasks
+
+
+class TestSetupLogging:
+    """Test suite for setup_logging."""
+
+    def test_file_logging_goes_through_queue(self, tmp_path, restore_root_logger):
+        """Test that the root logger only enqueues and the listener writes the file."""
+        log_file = tmp_path / "zfs_sync.log"
+        setup_logging(log_file=log_file, force=True)
+
+        root_handlers = logging.getLogger().handlers
+        assert any(isinstance(handler, QueueHandler) for handler in root_handlers)
+        assert not any(isinstance(handler, logging.FileHandler) for handler in root_handlers)
+
+        get_logger("zfs_sync.test").warning("queued %s", "record")
+        logging_config._stop_listener()
+
+        assert "queued record" in log_file.read_text()
+
+    def test_unused_record_fields_disabled(self, restore_root_logger):
+        """Test that records stop collecting thread and process details."""
+        setup_logging(force=True)
+
+        record = logging.LogRecord("zfs_sync.test", logging.INFO, __file__, 1, "m", None, None)
+
+        assert record.thread is None
+        assert record.process is None
+
+    def test_setup_is_idempotent(self, tmp_path, restore_root_logger):
+        """Test that a second call without force keeps the existing handlers."""
+        setup_logging(log_file=tmp_path / "first.log", force=True)
+        handlers = list(logging.getLogger().handlers)
+        listener = logging_config._listener
+
+        setup_logging(log_file=tmp_path / "second.log")
+
+        assert logging.getLogger().handlers == handlers
+        assert logging_config._listener is listener
+        assert not (tmp_path / "second.log").exists()
+
+    def test_repeated_setup_replaces_listener(self, tmp_path, restore_root_logger):
+        """Test that calling setup_logging again stops the previous listener."""
+        setup_logging(log_file=tmp_path / "first.log", force=True)
+        first = logging_config._listener
+        setup_logging(log_file=tmp_path / "second.log", force=True)
+
+        assert logging_config._listener is not first
+        assert first._thread is None
+
+
+class TestBufferedRotatingFileHandler:
+    """Test suite for BufferedRotatingFileHandler."""
+
+    @staticmethod
+    def _record(message: str) -> logging.LogRecord:
+        return logging.LogRecord("zfs_sync.test", logging.INFO, __file__, 1, message, None, None)
+
+    def test_records_buffer_until_flush(self, tmp_path):
+        """Test that small records are held in memory until the handler flushes."""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(log_file, flush_interval=60)
+        try:
+            handler.handle(self._record("first"))
+            handler.handle(self._record("second"))
+            assert log_file.read_text() == ""
+
+            handler.flush()
+            assert log_file.read_text() == "first\nsecond\n"
+        finally:
+            handler.close()
+
+    def test_large_batch_writes_immediately(self, tmp_path):
+        """Test that reaching flush_bytes writes the batch without waiting."""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(log_file, flush_bytes=10, flush_interval=60)
+        try:
+            handler.handle(self._record("x" * 20))
+            assert log_file.read_text() == "x" * 20 + "\n"
+        finally:
+            handler.close()
+
+    def test_batch_rolls_over(self, tmp_path):
+        """Test that a batch that would overflow maxBytes rotates the file first."""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(
+            log_file, maxBytes=30, backupCount=1, flush_interval=60
+        )
+        try:
+            handler.handle(self._record("a" * 20))
+            handler.flush()
+            handler.handle(self._record("b" * 20))
+            handler.flush()
+        finally:
+            handler.close()
+
+        assert log_file.read_text() == "b" * 20 + "\n"
+        assert (tmp_path / "buffered.log.1").read_text() == "a" * 20 + "\n"
+
+    def test_close_twice(self, tmp_path):
+        """Test that closing again (as logging.shutdown does at exit) is harmless."""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(log_file, flush_interval=60)
+        handler.handle(self._record("last"))
+        handler.close()
+        handler.close()
+
+        assert log_file.read_text() == "last\n"
+
+
+class TestCachedTimeFormatter:
+    """Test suite for CachedTimeFormatter."""
+
+    def test_matches_standard_formatter(self):
+        """Test that cached timestamps render exactly like logging.Formatter's."""
+        fmt = "%(asctime)s - %(message)s"
+        datefmt = "%Y-%m-%d %H:%M:%S"
+        cached = CachedTimeFormatter(fmt=fmt, datefmt=datefmt)
+        standard = logging.Formatter(fmt=fmt, datefmt=datefmt)
+
+        for created in (1700000000.1, 1700000000.9, 1700000001.0, 1700000000.5):
+            record = logging.LogRecord("zfs_sync.test", logging.INFO, __file__, 1, "m", None, None)
+            record.created = created
+            assert cached.format(record) == standard.format(record)
@@ -0,0 +1,244 @@
+"""Unit tests for SnapshotRepository."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from zfs_sync.database.models import SnapshotModel
+from zfs_sync.database.repositories import SnapshotRepository, SystemRepository
+
+
+class TestSnapshotRepository:
+    """Test suite for SnapshotRepository."""
+
+    def test_empty_metadata_stored_as_null(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that empty metadata is stored as NULL and read back as an empty dict."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        repo = SnapshotRepository(test_db)
+
+        snapshot = repo.create(**sample_snapshot_data, system_id=system.id, extra_metadata={})
+        tagged = repo.create(
+            **{**sample_snapshot_data, "name": "backup-20240116-120000"},
+            system_id=system.id,
+            extra_metadata={"origin": "test"},
+        )
+
+        raw = dict(test_db.execute(text("SELECT name, metadata FROM snapshots")).fetchall())
+        assert raw[snapshot.name] is None
+        assert raw[tagged.name] is not None
+
+        test_db.expire_all()
+        assert repo.get(snapshot.id).extra_metadata == {}
+        assert repo.get(tagged.id).extra_metadata == {"origin": "test"}
+
+    def test_timestamps_set_client_side(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that created_at/updated_at are bound on flush rather than fetched back."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        snapshot = SnapshotModel(**sample_snapshot_data, system_id=system.id)
+        test_db.add(snapshot)
+        test_db.flush()
+
+        # Server-side defaults would leave these expired until the next refresh
+        assert snapshot.__dict__["created_at"] is not None
+        assert snapshot.__dict__["updated_at"] is not None
+
+    def test_create_many(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that create_many inserts all rows and returns them in input order."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        repo = SnapshotRepository(test_db)
+        names = [f"backup-2024011{i}-120000" for i in range(5)]
+
+        created = repo.create_many(
+            [{**sample_snapshot_data, "name": name, "system_id": system.id} for name in names]
+        )
+
+        assert [snapshot.name for snapshot in created] == names
+        assert all(snapshot.id is not None for snapshot in created)
+        assert len(repo.get_by_system(system.id)) == len(names)
+
+    def test_create_many_batches_reselect(
+        self, test_db, sample_system_data, sample_snapshot_data, monkeypatch
+    ):
+        """Test that rows reloaded over several IN batches keep their input order."""
+        from zfs_sync.database.repositories import base_repository
+
+        monkeypatch.setattr(base_repository, "IN_CLAUSE_BATCH_SIZE", 2)
+        system = SystemRepository(test_db).create(**sample_system_data)
+        names = [f"snap-{i}" for i in range(5)]
+
+        created = SnapshotRepository(test_db).create_many(
+            [{**sample_snapshot_data, "name": name, "system_id": system.id} for name in names]
+        )
+
+        assert [snapshot.name for snapshot in created] == names
+
+    def test_create_many_empty(self, test_db):
+        """Test that create_many with no rows is a no-op."""
+        assert SnapshotRepository(test_db).create_many([]) == []
+
+    def test_get_by_system_keyset_pagination(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that paging with an (timestamp, id) cursor walks every snapshot once."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        repo = SnapshotRepository(test_db)
+        # Duplicate timestamps make the id tie-breaker matter
+        repo.create_many(
+            [
+                {**sample_snapshot_data, "name": f"snap-{i}", "system_id": system.id}
+                for i in range(7)
+            ]
+        )
+
+        seen = []
+        cursor = None
+        while True:
+            page = repo.get_by_system(system.id, limit=3, after=cursor)
+            if not page:
+                break
+            seen.extend(snapshot.name for snapshot in page)
+            cursor = (page[-1].timestamp, page[-1].id)
+
+        assert sorted(seen) == sorted(f"snap-{i}" for i in range(7))
+        assert [s.name for s in repo.get_by_system(system.id, limit=None)] == seen
+
+    def test_delete_snapshots_not_in_set(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that only snapshots missing from the reported set are deleted."""
+        system_repo = SystemRepository(test_db)
+        system = system_repo.create(**sample_system_data)
+        other = system_repo.create(**{**sample_system_data, "hostname": "other-system"})
+        repo = SnapshotRepository(test_db)
+        repo.create_many(
+            [
+                {**sample_snapshot_data, "name": name, "system_id": owner.id}
+                for name in ("keep", "stale")
+                for owner in (system, other)
+            ]
+        )
+
+        count, deleted = repo.delete_snapshots_not_in_set(
+            system.id, {(sample_snapshot_data["pool"], sample_snapshot_data["dataset"], "keep")}
+        )
+
+        assert count == 1
+        assert deleted == [(sample_snapshot_data["pool"], sample_snapshot_data["dataset"], "stale")]
+        assert [s.name for s in repo.get_by_system(system.id)] == ["keep"]
+        assert len(repo.get_by_system(other.id)) == 2
+
+        # A second sync reuses the scratch table without conflicts
+        assert repo.delete_snapshots_not_in_set(system.id, set()) == (
+            1,
+            [(sample_snapshot_data["pool"], sample_snapshot_data["dataset"], "keep")],
+        )
+
+    def test_delete_snapshots_not_in_set_after_failure(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that a failed call leaves the scratch table usable for the next one."""
+
+        system = SystemRepository(test_db).create(**sample_system_data)
+        repo = SnapshotRepository(test_db)
+        repo.create_many(
+            [
+                {**sample_snapshot_data, "name": name, "system_id": system.id}
+                for name in ("keep", "stale")
+            ]
+        )
+        key = (sample_snapshot_data["pool"], sample_snapshot_data["dataset"])
+
+        # A NULL name violates the staging table's NOT NULL after it was created
+        with pytest.raises(IntegrityError):
+            repo.delete_snapshots_not_in_set(system.id, {(*key, "keep"), (*key, None)})
+
+        assert repo.delete_snapshots_not_in_set(system.id, {(*key, "keep")}) == (
+            1,
+            [(*key, "stale")],
+        )
+
+    def test_get_by_pool_dataset_oldest_first(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that pool/dataset lookups come back in timestamp order."""
+        from datetime import timedelta
+
+        system = SystemRepository(test_db).create(**sample_system_data)
+        repo = SnapshotRepository(test_db)
+        base_time = sample_snapshot_data["timestamp"]
+        repo.create_many(
+            [
+                {
+                    **sample_snapshot_data,
+                    "name": f"snap-{day}",
+                    "timestamp": base_time + timedelta(days=day),
+                    "system_id": system.id,
+                }
+                for day in (2, 0, 1)
+            ]
+        )
+
+        snapshots = repo.get_by_pool_dataset(
+            sample_snapshot_data["pool"], sample_snapshot_data["dataset"], system.id
+        )
+
+        assert [s.name for s in snapshots] == ["snap-0", "snap-1", "snap-2"]
+
+    def test_get_by_pool_dataset_for_systems(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that one query covers the requested systems only, oldest first."""
+        from datetime import timedelta
+
+        system_repo = SystemRepository(test_db)
+        systems = [
+            system_repo.create(**{**sample_system_data, "hostname": f"host-{i}"}) for i in range(3)
+        ]
+        repo = SnapshotRepository(test_db)
+        base_time = sample_snapshot_data["timestamp"]
+        repo.create_many(
+            [
+                {
+                    **sample_snapshot_data,
+                    "name": f"snap-{i}",
+                    "timestamp": base_time + timedelta(days=-i),
+                    "system_id": system.id,
+                }
+                for i, system in enumerate(systems)
+            ]
+        )
+
+        snapshots = repo.get_by_pool_dataset_for_systems(
+            sample_snapshot_data["pool"],
+            sample_snapshot_data["dataset"],
+            [systems[0].id, systems[1].id],
+        )
+
+        assert [s.name for s in snapshots] == ["snap-1", "snap-0"]
+        assert repo.get_datasets([s.id for s in systems]) == [sample_snapshot_data["dataset"]]
+        assert SystemRepository(test_db).get_many([systems[2].id, systems[2].id]) == {
+            systems[2].id: systems[2]
+        }
+
+    def test_get_latest_dataset_rows(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that the database returns only each system's newest row of a dataset."""
+        from datetime import timedelta
+
+        system_repo = SystemRepository(test_db)
+        system = system_repo.create(**sample_system_data)
+        other = system_repo.create(**{**sample_system_data, "hostname": "other-system"})
+        repo = SnapshotRepository(test_db)
+        base_time = sample_snapshot_data["timestamp"]
+        repo.create_many(
+            [
+                {
+                    **sample_snapshot_data,
+                    "name": f"snap-{day}",
+                    "timestamp": base_time + timedelta(days=day),
+                    "system_id": system.id,
+                }
+                for day in range(3)
+            ]
+        )
+
+        rows = repo.get_latest_dataset_rows(sample_snapshot_data["dataset"], [system.id, other.id])
+
+        assert [(row[0], row[1]) for row in rows] == [(system.id, "snap-2")]
@@ -0,0 +1,39 @@
+"""Unit tests for SyncGroupRepository."""
+
+from zfs_sync.database.models import SyncGroupSystemModel
+from zfs_sync.database.repositories import SyncGroupRepository, SystemRepository
+
+
+class TestSyncGroupRepository:
+    """Test suite for SyncGroupRepository."""
+
+    def test_add_system_is_idempotent(self, test_db, sample_system_data, sample_sync_group_data):
+        """Test that adding the same system twice creates a single association."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        repo = SyncGroupRepository(test_db)
+        group = repo.create(**sample_sync_group_data)
+
+        repo.add_system(group.id, system.id)
+        repo.add_system(group.id, system.id)
+
+        associations = (
+            test_db.query(SyncGroupSystemModel)
+            .filter(SyncGroupSystemModel.sync_group_id == group.id)
+            .all()
+        )
+        assert [a.system_id for a in associations] == [system.id]
+
+    def test_get_enabled_with_systems_preloads_associations(
+        self, test_db, sample_system_data, sample_sync_group_data
+    ):
+        """Test that system associations are loaded without lazy loading."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        repo = SyncGroupRepository(test_db)
+        group = repo.create(**sample_sync_group_data)
+        repo.add_system(group.id, system.id)
+        test_db.expire_all()
+
+        (loaded,) = repo.get_enabled_with_systems()
+
+        assert "system_associations" in loaded.__dict__
+        assert [a.system_id for a in loaded.system_associations] == [system.id]
@@ -0,0 +1,81 @@
+"""Unit tests for SyncStateRepository."""
+
+from datetime import datetime, timedelta, timezone
+
+from zfs_sync.database.repositories import (
+    SyncGroupRepository,
+    SyncStateRepository,
+    SystemRepository,
+)
+
+
+class TestSyncStateRepository:
+    """Test suite for SyncStateRepository."""
+
+    def test_bulk_upsert(self, test_db, sample_system_data):
+        """Test that bulk_upsert inserts new states and updates existing ones in place."""
+        system1 = SystemRepository(test_db).create(**sample_system_data)
+        system2 = SystemRepository(test_db).create(
+            **{**sample_system_data, "hostname": "test-system-2"}
+        )
+        group = SyncGroupRepository(test_db).create(name="test-group")
+        repo = SyncStateRepository(test_db)
+        last_sync = datetime.now(timezone.utc) - timedelta(days=1)
+        existing = repo.create(
+            sync_group_id=group.id,
+            dataset="tank/data",
+            system_id=system1.id,
+            status="in_sync",
+            last_sync=last_sync,
+            error_message="old",
+        )
+        now = datetime.now(timezone.utc)
+
+        def row(system_id, message):
+            return {
+                "sync_group_id": group.id,
+                "dataset": "tank/data",
+                "system_id": system_id,
+                "status": "conflict",
+                "last_check": now,
+                "error_message": message,
+            }
+
+        repo.bulk_upsert(
+            [row(system1.id, "first"), row(system2.id, "new"), row(system1.id, "last")]
+        )
+
+        test_db.expire_all()
+        states = {state.system_id: state for state in repo.get_by_sync_group(group.id)}
+        assert len(states) == 2
+        assert states[system1.id].id == existing.id
+        assert states[system1.id].status == "conflict"
+        assert states[system1.id].error_message == "last"
+        # last_sync is kept when the upsert does not provide one
+        assert states[system1.id].last_sync.replace(tzinfo=timezone.utc) == last_sync
+        assert states[system2.id].error_message == "new"
+        assert states[system2.id].last_sync is None
+
+    def test_bulk_upsert_empty(self, test_db, sample_system_data, monkeypatch):
+        """Test that upserting no rows writes nothing and leaves unit_of_work intact."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        group = SyncGroupRepository(test_db).create(name="test-group")
+        repo = SyncStateRepository(test_db)
+        commits = []
+        real_commit = test_db.commit
+        monkeypatch.setattr(test_db, "commit", lambda: commits.append(1) or real_commit())
+
+        with repo.unit_of_work():
+            repo.bulk_upsert([])
+            assert commits == []
+            repo.create(
+                sync_group_id=group.id,
+                dataset="tank/data",
+                system_id=system.id,
+                status="in_sync",
+            )
+            repo.bulk_upsert([])
+            assert commits == []
+
+        assert len(commits) == 1
+        assert [state.dataset for state in repo.get_all()] == ["tank/data"]
@@ -1,5 +1,7 @@
 """Unit tests for SystemRepository."""
 
+import pytest
+
 from zfs_sync.database.repositories import SystemRepository
 
 
@@ -53,6 +55,182 @@ class TestSystemRepository:
         retrieved = repo.get(system.id)
         assert retrieved is None
 
+    def test_update_by_id(self, test_db, sample_system_data):
+        """Test updating a system with a single statement."""
+        repo = SystemRepository(test_db)
+        system = repo.create(**sample_system_data)
+
+        updated = repo.update_by_id(system.id, platform="freebsd")
+        assert updated.platform == "freebsd"
+        assert repo.get(system.id).platform == "freebsd"
+
+    def test_update_by_id_missing(self, test_db):
+        """Test that updating a nonexistent system returns None."""
+        from uuid import uuid4
+
+        assert SystemRepository(test_db).update_by_id(uuid4(), platform="freebsd") is None
+
+    def test_delete_by_id(self, test_db, sample_system_data):
+        """Test deleting a system with a single statement."""
+        repo = SystemRepository(test_db)
+        system = repo.create(**sample_system_data)
+
+        assert repo.delete_by_id(system.id) is True
+        assert repo.get(system.id) is None
+        assert repo.delete_by_id(system.id) is False
+
+    def test_delete_by_id_removes_dependent_rows(self, test_db, sample_system_data):
+        """Test that delete_by_id removes the system's snapshots and sync states too."""
+        from datetime import datetime, timezone
+
+        from zfs_sync.database.models import SnapshotModel, SyncStateModel
+        from zfs_sync.database.repositories import (
+            SnapshotRepository,
+            SyncGroupRepository,
+            SyncStateRepository,
+        )
+
+        repo = SystemRepository(test_db)
+        system = repo.create(**sample_system_data)
+        other = repo.create(**{**sample_system_data, "hostname": "other-system"})
+        group = SyncGroupRepository(test_db).create(name="test-group")
+        for owner in (system, other):
+            SnapshotRepository(test_db).create(
+                system_id=owner.id,
+                pool="tank",
+                dataset="tank/data",
+                name="snap-1",
+                timestamp=datetime.now(timezone.utc),
+            )
+            SyncStateRepository(test_db).create(
+                sync_group_id=group.id,
+                dataset="tank/data",
+                system_id=owner.id,
+                status="in_sync",
+            )
+
+        assert repo.delete_by_id(system.id) is True
+
+        for model in (SnapshotModel, SyncStateModel):
+            owners = [row.system_id for row in test_db.query(model).all()]
+            assert owners == [other.id]
+
+    def test_cached_api_key_rejected_after_rotation(self, test_db, sample_system_data):
+        """Test that a cached API key lookup cannot outlive the key itself."""
+        from datetime import datetime, timezone
+
+        repo = SystemRepository(test_db)
+        system = repo.create(**sample_system_data, api_key="old-key")
+        system_id = system.id
+
+        assert repo.get_id_by_api_key("old-key") == system_id
+        assert repo.touch_last_seen(system_id, "old-key", datetime.now(timezone.utc))
+
+        repo.update(system_id, api_key="new-key")
+
+        assert not repo.touch_last_seen(system_id, "old-key", datetime.now(timezone.utc))
+        assert repo.get_id_by_api_key("old-key") is None
+        assert repo.get_id_by_api_key("new-key") == system_id
+
+    def test_cached_api_key_rejected_after_update_by_id(self, test_db, sample_system_data):
+        """Test that rotating a key with update_by_id stops the old key authenticating."""
+        from zfs_sync.services.auth import AuthService
+
+        repo = SystemRepository(test_db)
+        system_id = repo.create(**sample_system_data, api_key="old-key").id
+        auth = AuthService(test_db)
+        assert auth.validate_api_key("old-key") == system_id
+
+        repo.update_by_id(system_id, api_key="new-key")
+
+        assert auth.validate_api_key("old-key") is None
+        assert auth.validate_api_key("new-key") == system_id
+
+    def test_cached_api_key_rejected_after_delete_by_id(self, test_db, sample_system_data):
+        """Test that deleting a system with delete_by_id stops its key authenticating."""
+        from zfs_sync.services.auth import AuthService
+
+        repo = SystemRepository(test_db)
+        system_id = repo.create(**sample_system_data, api_key="doomed-key").id
+        auth = AuthService(test_db)
+        assert auth.validate_api_key("doomed-key") == system_id
+
+        assert repo.delete_by_id(system_id) is True
+
+        assert auth.validate_api_key("doomed-key") is None
+
+    def test_touch_last_seen_coalesces_writes(self, test_db, sample_system_data):
+        """Test that a recently confirmed key skips the last_seen UPDATE."""
+        from datetime import datetime, timezone
+
+        from sqlalchemy import event
+
+        repo = SystemRepository(test_db)
+        system_id = repo.create(**sample_system_data, api_key="busy-key").id
+        assert repo.get_id_by_api_key("busy-key") == system_id
+        assert repo.touch_last_seen(system_id, "busy-key", datetime.now(timezone.utc))
+
+        statements = []
+        event.listen(test_db, "do_orm_execute", statements.append)
+        assert repo.touch_last_seen(system_id, "busy-key", datetime.now(timezone.utc))
+        assert statements == []
+
+        # Revoking through the repository takes effect immediately
+        repo.update(system_id, api_key=None)
+        assert not repo.touch_last_seen(system_id, "busy-key", datetime.now(timezone.utc))
+
+    def test_unit_of_work_commits_once(self, test_db, sample_system_data, monkeypatch):
+        """Test that mutations inside unit_of_work share a single commit."""
+        repo = SystemRepository(test_db)
+        commits = []
+        real_commit = test_db.commit
+        monkeypatch.setattr(test_db, "commit", lambda: commits.append(1) or real_commit())
+
+        with repo.unit_of_work():
+            first = repo.create(**sample_system_data)
+            repo.create(**{**sample_system_data, "hostname": "second-system"})
+            repo.update(first.id, platform="freebsd")
+
+        assert len(commits) == 1
+        assert len(repo.get_all()) == 2
+
+    def test_unit_of_work_rolls_back_on_error(self, test_db, sample_system_data):
+        """Test that a failure inside unit_of_work discards the whole unit."""
+        repo = SystemRepository(test_db)
+
+        with pytest.raises(ValueError):
+            with repo.unit_of_work():
+                repo.create(**sample_system_data)
+                repo.create(**sample_system_data)
+
+        assert repo.get_all() == []
+        # The session is usable again afterwards
+        assert repo.create(**sample_system_data).hostname == sample_system_data["hostname"]
+
+    def test_get_uses_identity_map(self, test_db, sample_system_data):
+        """Test that getting an already-loaded system does not query the database again."""
+        from sqlalchemy import event
+
+        repo = SystemRepository(test_db)
+        system = repo.create(**sample_system_data)
+        statements = []
+        event.listen(test_db, "do_orm_execute", statements.append)
+
+        assert repo.get(system.id) is system
+        assert statements == []
+
+    def test_has_complete_ssh_config(self, test_db, sample_system_data):
+        """Test the SSH configuration check for configured, blank and missing systems."""
+        from uuid import uuid4
+
+        repo = SystemRepository(test_db)
+        configured = repo.create(**sample_system_data, ssh_hostname="backup.example.com")
+        blank = repo.create(**{**sample_system_data, "hostname": "blank-ssh"}, ssh_hostname="")
+
+        assert repo.has_complete_ssh_config(configured.id) is True
+        assert repo.has_complete_ssh_config(blank.id) is False
+        assert repo.has_complete_ssh_config(uuid4()) is False
+
     def test_list_all_systems(self, test_db, sample_system_data):
         """Test listing all systems."""
         repo = SystemRepository(test_db)
@@ -3,10 +3,12 @@
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
+import pytest
 
 from zfs_sync.database.repositories import (
     SnapshotRepository,
     SyncGroupRepository,
+    SyncStateRepository,
     SystemRepository,
 )
 from zfs_sync.services.conflict_resolution import (
@@ -165,3 +167,199 @@ class TestConflictResolutionService:
 
         # Should return a list (may be empty if no conflicts)
         assert isinstance(conflicts, list)
+
+    def test_get_all_conflicts_matches_per_dataset_detection(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that the batched group scan finds the same conflicts as per-dataset detection."""
+        system_repo = SystemRepository(test_db)
+        system1 = system_repo.create(**sample_system_data)
+        system2 = system_repo.create(**{**sample_system_data, "hostname": "test-system-2"})
+
+        sync_group_repo = SyncGroupRepository(test_db)
+        sync_group = sync_group_repo.create(name="test-group")
+        sync_group_repo.add_system(sync_group.id, system1.id)
+        sync_group_repo.add_system(sync_group.id, system2.id)
+
+        later = sample_snapshot_data["timestamp"] + timedelta(hours=1)
+        rows = []
+        for dataset in ("tank/a", "tank/b"):
+            common = {**sample_snapshot_data, "dataset": dataset}
+            rows.append({**common, "system_id": system1.id})
+            rows.append({**common, "system_id": system2.id, "timestamp": later, "size": 2048})
+            rows.append({**common, "name": "orphan-20240116", "system_id": system1.id})
+        SnapshotRepository(test_db).create_many(rows)
+
+        service = ConflictResolutionService(test_db)
+        expected = []
+        for dataset in ("tank/a", "tank/b"):
+            expected.extend(service.detect_conflicts(sync_group.id, "tank", dataset))
+
+        def comparable(conflicts):
+            return [{k: v for k, v in c.items() if k != "detected_at"} for c in conflicts]
+
+        conflicts = service.get_all_conflicts(sync_group.id)
+
+        assert {c["type"] for c in conflicts} >= {"timestamp_mismatch", "size_mismatch"}
+        assert comparable(conflicts) == comparable(expected)
+        assert len({c["detected_at"] for c in conflicts}) == 1
+
+    def test_orphan_with_older_ancestor_not_flagged(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that only snapshots without an older same-prefix snapshot elsewhere are orphans."""
+        system_repo = SystemRepository(test_db)
+        system1 = system_repo.create(**sample_system_data)
+        system2 = system_repo.create(**{**sample_system_data, "hostname": "test-system-2"})
+
+        sync_group_repo = SyncGroupRepository(test_db)
+        sync_group = sync_group_repo.create(name="test-group")
+        sync_group_repo.add_system(sync_group.id, system1.id)
+        sync_group_repo.add_system(sync_group.id, system2.id)
+
+        base_time = sample_snapshot_data["timestamp"]
+        SnapshotRepository(test_db).create_many(
+            [
+                # Older "daily" snapshot on system2 is an ancestor of system1's
+                {
+                    **sample_snapshot_data,
+                    "name": "daily-1",
+                    "system_id": system2.id,
+                    "timestamp": base_time,
+                },
+                {
+                    **sample_snapshot_data,
+                    "name": "daily-2",
+                    "system_id": system1.id,
+                    "timestamp": base_time + timedelta(days=1),
+                },
+                # "weekly" only exists on system1
+                {
+                    **sample_snapshot_data,
+                    "name": "weekly-1",
+                    "system_id": system1.id,
+                    "timestamp": base_time + timedelta(days=2),
+                },
+            ]
+        )
+
+        service = ConflictResolutionService(test_db)
+        conflicts = service.detect_conflicts(
+            sync_group.id, sample_snapshot_data["pool"], sample_snapshot_data["dataset"]
+        )
+
+        orphans = {c["snapshot_name"] for c in conflicts if c["type"] == "orphaned_snapshot"}
+        assert orphans == {"daily-1", "weekly-1"}
+
+    def test_iter_all_conflicts_checks_group_eagerly(self, test_db):
+        """Test that a missing sync group fails on the call, not on first iteration."""
+        service = ConflictResolutionService(test_db)
+
+        with pytest.raises(ValueError):
+            service.iter_all_conflicts(uuid4())
+
+    def test_mark_conflicts_in_sync_states(self, test_db, sample_system_data):
+        """Test that every system named in a conflict gets a CONFLICT sync state."""
+        system_repo = SystemRepository(test_db)
+        system1 = system_repo.create(**sample_system_data)
+        system2 = system_repo.create(**{**sample_system_data, "hostname": "test-system-2"})
+        sync_group = SyncGroupRepository(test_db).create(name="test-group")
+        conflict = {
+            "type": "timestamp_mismatch",
+            "dataset": "tank/data",
+            "sync_group_id": str(sync_group.id),
+            "systems": {str(system1.id): {}, str(system2.id): {}},
+        }
+
+        service = ConflictResolutionService(test_db)
+        service.mark_conflicts_in_sync_states(sync_group.id, [conflict])
+
+        states = SyncStateRepository(test_db).get_by_sync_group(sync_group.id)
+        assert {state.system_id for state in states} == {system1.id, system2.id}
+        assert {state.status for state in states} == {"conflict"}
+        assert {state.error_message for state in states} == {
+            "Conflict detected: timestamp_mismatch"
+        }
+
+    def test_resolve_conflict_use_majority(self, test_db):
+        """Test that the content most systems agree on wins over a newer outlier."""
+        now = datetime.now(timezone.utc)
+        first, second, outlier = str(uuid4()), str(uuid4()), str(uuid4())
+        snapshot_ids = {first: str(uuid4()), second: str(uuid4()), outlier: str(uuid4())}
+        conflict = {
+            "type": "divergent_snapshots",
+            "snapshot_name": "backup-20240115-120000",
+            "pool": "tank",
+            "dataset": "tank/data",
+            "sync_group_id": str(uuid4()),
+            "systems": {
+                first: {
+                    "timestamp": (now - timedelta(hours=1)).isoformat(),
+                    "size": 1024,
+                    "snapshot_id": snapshot_ids[first],
+                },
+                outlier: {
+                    "timestamp": now.isoformat(),
+                    "size": 2048,
+                    "snapshot_id": snapshot_ids[outlier],
+                },
+                second: {
+                    # Same instant written with a "Z" suffix still counts as agreement
+                    "timestamp": (now - timedelta(hours=1)).isoformat().replace("+00:00", "Z"),
+                    "size": 1024,
+                    "snapshot_id": snapshot_ids[second],
+                },
+            },
+        }
+
+        service = ConflictResolutionService(test_db)
+        result = service.resolve_conflict(conflict, ConflictResolutionStrategy.USE_MAJORITY)
+
+        assert result["strategy"] == "use_majority"
+        sources = {action["source_system_id"] for action in result["actions"]}
+        assert len(sources) == 1
+        (source,) = sources
+        assert source in (first, second)
+        assert {action["snapshot_id"] for action in result["actions"]} == {snapshot_ids[source]}
+        assert outlier in {action["target_system_id"] for action in result["actions"]}
+
+    def test_resolve_conflict_use_majority_tie_goes_to_newest(self, test_db):
+        """Test that without a majority the newest system's snapshot wins."""
+        now = datetime.now(timezone.utc)
+        older, newer = str(uuid4()), str(uuid4())
+        conflict = {
+            "type": "divergent_snapshots",
+            "snapshot_name": "backup-20240115-120000",
+            "sync_group_id": str(uuid4()),
+            "systems": {
+                newer: {"timestamp": now.isoformat(), "size": 1024, "snapshot_id": str(uuid4())},
+                older: {
+                    "timestamp": (now - timedelta(hours=1)).isoformat(),
+                    "size": 1024,
+                    "snapshot_id": str(uuid4()),
+                },
+            },
+        }
+
+        service = ConflictResolutionService(test_db)
+        result = service.resolve_conflict(conflict, ConflictResolutionStrategy.USE_MAJORITY)
+
+        assert [action["source_system_id"] for action in result["actions"]] == [newer]
+
+    def test_resolve_conflict_use_newest_accepts_utc_suffix(self, test_db):
+        """Test that "Z"-suffixed timestamps from API clients compare correctly."""
+        older, newer = str(uuid4()), str(uuid4())
+        conflict = {
+            "type": "timestamp_mismatch",
+            "snapshot_name": "backup-20240115-120000",
+            "sync_group_id": str(uuid4()),
+            "systems": {
+                older: {"timestamp": "2024-01-15T12:00:00Z", "snapshot_id": str(uuid4())},
+                newer: {"timestamp": "2024-01-15T13:00:00+00:00", "snapshot_id": str(uuid4())},
+            },
+        }
+
+        service = ConflictResolutionService(test_db)
+        result = service.resolve_conflict(conflict, ConflictResolutionStrategy.USE_NEWEST)
+
+        assert [action["source_system_id"] for action in result["actions"]] == [newer]
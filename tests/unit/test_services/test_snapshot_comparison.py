@@ -47,6 +47,46 @@ class TestSnapshotComparisonService:
         assert "missing_snapshots" in comparison
         assert len(comparison["common_snapshots"]) >= 1
 
+    def test_compare_reports_latest_and_missing(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test latest, unique and missing snapshots, including a system with none."""
+        system_repo = SystemRepository(test_db)
+        system1 = system_repo.create(**sample_system_data)
+        system2 = system_repo.create(**{**sample_system_data, "hostname": "test-system-2"})
+        empty = system_repo.create(**{**sample_system_data, "hostname": "test-system-3"})
+
+        base_time = datetime.now(timezone.utc) - timedelta(days=3)
+        SnapshotRepository(test_db).create_many(
+            [
+                {
+                    **sample_snapshot_data,
+                    "name": f"tank/data@backup-{day}",
+                    "timestamp": base_time + timedelta(days=day),
+                    "system_id": system_id,
+                }
+                for system_id, days in ((system1.id, (0, 1, 2)), (system2.id, (0, 1)))
+                for day in days
+            ]
+        )
+
+        service = SnapshotComparisonService(test_db)
+        comparison = service.compare_snapshots_by_dataset(
+            dataset=sample_snapshot_data["dataset"],
+            system_ids=[system1.id, system2.id, empty.id],
+        )
+
+        assert comparison["common_snapshots"] == []
+        assert comparison["unique_snapshots"][str(system1.id)] == ["backup-2"]
+        assert comparison["missing_snapshots"][str(empty.id)] == [
+            "backup-0",
+            "backup-1",
+            "backup-2",
+        ]
+        assert comparison["latest_snapshots"][str(system1.id)]["name"] == "tank/data@backup-2"
+        assert comparison["latest_snapshots"][str(system2.id)]["name"] == "tank/data@backup-1"
+        assert str(empty.id) not in comparison["latest_snapshots"]
+
     def test_find_snapshot_differences(self, test_db, sample_system_data, sample_snapshot_data):
         """Test finding differences between two systems."""
         # Create two systems
@@ -117,3 +157,131 @@ class TestSnapshotComparisonService:
 
         assert isinstance(gaps, list)
         # Should find at least one gap (system2 missing snapshot 1)
+
+    def test_gap_lists_every_system_holding_snapshot(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that a snapshot on some but not all systems names all of its holders."""
+        system_repo = SystemRepository(test_db)
+        systems = [
+            system_repo.create(**{**sample_system_data, "hostname": f"test-system-{i}"})
+            for i in range(3)
+        ]
+        SnapshotRepository(test_db).create_many(
+            [{**sample_snapshot_data, "system_id": system.id} for system in systems[:2]]
+        )
+
+        service = SnapshotComparisonService(test_db)
+        gaps = service.get_snapshot_gaps(
+            system_ids=[system.id for system in systems],
+            dataset=sample_snapshot_data["dataset"],
+        )
+
+        assert gaps == [
+            {
+                "system_id": str(systems[2].id),
+                "missing_snapshot": sample_snapshot_data["name"],
+                "available_on_systems": [str(systems[0].id), str(systems[1].id)],
+                "dataset": sample_snapshot_data["dataset"],
+            }
+        ]
+
+    def test_gaps_do_not_share_system_lists(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that gaps for the same snapshot each get their own available_on_systems."""
+        system_repo = SystemRepository(test_db)
+        systems = [
+            system_repo.create(**{**sample_system_data, "hostname": f"test-system-{i}"})
+            for i in range(3)
+        ]
+        SnapshotRepository(test_db).create(**sample_snapshot_data, system_id=systems[0].id)
+
+        service = SnapshotComparisonService(test_db)
+        first, second = service.get_snapshot_gaps(
+            system_ids=[system.id for system in systems],
+            dataset=sample_snapshot_data["dataset"],
+        )
+        first["available_on_systems"].append("mutated")
+
+        assert second["available_on_systems"] == [str(systems[0].id)]
+
+    def test_compare_cache_invalidated_by_writes(
+        self, test_db, sample_system_data, sample_snapshot_data, monkeypatch
+    ):
+        """Test that cached comparisons are reused until the dataset's snapshots change."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        snapshot_repo = SnapshotRepository(test_db)
+        snapshot_repo.create(**sample_snapshot_data, system_id=system.id)
+        service = SnapshotComparisonService(test_db)
+        dataset = sample_snapshot_data["dataset"]
+
+        first = service.compare_snapshots_by_dataset(dataset=dataset, system_ids=[system.id])
+
+        calls = []
+        compute = service._compare_snapshots_by_dataset
+        monkeypatch.setattr(
+            service,
+            "_compare_snapshots_by_dataset",
+            lambda *args: calls.append(args) or compute(*args),
+        )
+        assert (
+            service.compare_snapshots_by_dataset(dataset=dataset, system_ids=[system.id]) == first
+        )
+        assert calls == []
+
+        snapshot_repo.create(
+            **{**sample_snapshot_data, "name": "backup-20240116-120000"}, system_id=system.id
+        )
+        refreshed = service.compare_snapshots_by_dataset(dataset=dataset, system_ids=[system.id])
+
+        assert len(calls) == 1
+        assert refreshed["common_snapshots"] == sorted(
+            [sample_snapshot_data["name"], "backup-20240116-120000"]
+        )
+
+    def test_extract_snapshot_name(self):
+        """Test that only the part after the last "@" is kept."""
+        extract = SnapshotComparisonService.extract_snapshot_name
+        assert extract("tank/data@snapshot-20240115") == "snapshot-20240115"
+        assert extract("snapshot-20240115") == "snapshot-20240115"
+        assert extract("tank/data@a@b") == "b"
+
+    def test_find_systems_with_snapshot(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that the query helpers match snapshots by their short name."""
+        from zfs_sync.services.sync_queries import find_systems_with_snapshot
+
+        system = SystemRepository(test_db).create(**sample_system_data)
+        snapshot_repo = SnapshotRepository(test_db)
+        snapshot_repo.create(
+            **{**sample_snapshot_data, "name": "tank/test/data@backup-1"}, system_id=system.id
+        )
+
+        found = find_systems_with_snapshot(
+            sample_snapshot_data["pool"],
+            sample_snapshot_data["dataset"],
+            "backup-1",
+            [system.id],
+            snapshot_repo,
+            SnapshotComparisonService(test_db),
+        )
+
+        assert found == [system.id]
+
+    def test_compare_cache_isolated_from_caller_mutation(
+        self, test_db, sample_system_data, sample_snapshot_data
+    ):
+        """Test that mutating a returned comparison does not change cached results."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        SnapshotRepository(test_db).create(**sample_snapshot_data, system_id=system.id)
+        service = SnapshotComparisonService(test_db)
+        dataset = sample_snapshot_data["dataset"]
+
+        first = service.compare_snapshots_by_dataset(dataset=dataset, system_ids=[system.id])
+        first["common_snapshots"].append("injected")
+        first["latest_snapshots"].clear()
+
+        again = service.compare_snapshots_by_dataset(dataset=dataset, system_ids=[system.id])
+
+        assert again["common_snapshots"] == [sample_snapshot_data["name"]]
+        assert str(system.id) in again["latest_snapshots"]
@@ -0,0 +1,130 @@
+"""Unit tests for SnapshotHistoryService."""
+
+from datetime import datetime, timedelta, timezone
+
+from zfs_sync.database.repositories import SnapshotRepository, SystemRepository
+from zfs_sync.services.snapshot_history import SnapshotHistoryService
+
+
+class TestSnapshotHistoryService:
+    """Test suite for SnapshotHistoryService."""
+
+    def test_get_snapshot_timeline_ordered(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that the timeline interleaves systems in timestamp order."""
+        system_repo = SystemRepository(test_db)
+        system1 = system_repo.create(**sample_system_data)
+        system2 = system_repo.create(**{**sample_system_data, "hostname": "test-system-2"})
+        base_time = sample_snapshot_data["timestamp"]
+        SnapshotRepository(test_db).create_many(
+            [
+                {
+                    **sample_snapshot_data,
+                    "name": f"snap-{hours}",
+                    "timestamp": base_time + timedelta(hours=hours),
+                    "system_id": system.id,
+                }
+                for system, hours in ((system1, 2), (system2, 0), (system1, 1), (system2, 3))
+            ]
+        )
+
+        timeline = SnapshotHistoryService(test_db).get_snapshot_timeline(
+            sample_snapshot_data["pool"], sample_snapshot_data["dataset"], [system1.id, system2.id]
+        )
+
+        assert timeline["total_count"] == 4
+        assert [s["name"] for s in timeline["snapshots"]] == [
+            "snap-0",
+            "snap-1",
+            "snap-2",
+            "snap-3",
+        ]
+        assert timeline["snapshots"][0]["system_id"] == str(system2.id)
+
+    def test_get_snapshot_statistics(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that statistics aggregate counts, sizes and dates per pool and dataset."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        now = datetime.now(timezone.utc)
+        SnapshotRepository(test_db).create_many(
+            [
+                {
+                    **sample_snapshot_data,
+                    "pool": pool,
+                    "dataset": dataset,
+                    "name": f"{pool}-{dataset}-{age}",
+                    "size": size,
+                    "timestamp": now - timedelta(days=age),
+                    "system_id": system.id,
+                }
+                for pool, dataset, age, size in (
+                    ("tank", "data", 1, 100),
+                    ("tank", "data", 2, None),
+                    ("tank", "logs", 3, 200),
+                    ("backup", "data", 4, 300),
+                    ("backup", "data", 60, 1000),
+                )
+            ]
+        )
+
+        stats = SnapshotHistoryService(test_db).get_snapshot_statistics(system.id, days=30)
+
+        assert stats["total_snapshots"] == 4
+        assert stats["total_size"] == 600
+        assert stats["average_size"] == 150
+        assert stats["pools"] == {"tank": 3, "backup": 1}
+        assert stats["datasets"] == {"tank/data": 2, "tank/logs": 1, "backup/data": 1}
+        assert stats["oldest_snapshot"].startswith((now - timedelta(days=4)).date().isoformat())
+        assert stats["newest_snapshot"].startswith((now - timedelta(days=1)).date().isoformat())
+
+    def test_get_snapshot_statistics_empty(self, test_db, sample_system_data):
+        """Test that a system without snapshots in the window gets zeroed statistics."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+
+        stats = SnapshotHistoryService(test_db).get_snapshot_statistics(system.id)
+
+        assert stats["total_snapshots"] == 0
+        assert stats["pools"] == {}
+
+    def test_track_snapshot_changes(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that reported snapshots are split into added, removed and unchanged."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        SnapshotRepository(test_db).create_many(
+            [
+                {**sample_snapshot_data, "name": name, "system_id": system.id}
+                for name in ("keep", "gone")
+            ]
+        )
+        pool, dataset = sample_snapshot_data["pool"], sample_snapshot_data["dataset"]
+
+        changes = SnapshotHistoryService(test_db).track_snapshot_changes(
+            system.id,
+            [{"pool": pool, "dataset": dataset, "name": name} for name in ("keep", "new")],
+        )
+
+        assert changes["added_snapshots"] == [f"{pool}/{dataset}@new"]
+        assert changes["removed_snapshots"] == [f"{pool}/{dataset}@gone"]
+        assert changes["unchanged_snapshots"] == [f"{pool}/{dataset}@keep"]
+
+    def test_get_snapshot_history_filters(self, test_db, sample_system_data, sample_snapshot_data):
+        """Test that history is newest first, filtered, and limited."""
+        system = SystemRepository(test_db).create(**sample_system_data)
+        base_time = sample_snapshot_data["timestamp"]
+        SnapshotRepository(test_db).create_many(
+            [
+                {
+                    **sample_snapshot_data,
+                    "dataset": dataset,
+                    "name": f"{dataset}-{hours}",
+                    "timestamp": base_time + timedelta(hours=hours),
+                    "system_id": system.id,
+                }
+                for dataset in ("data", "logs")
+                for hours in range(3)
+            ]
+        )
+
+        history = SnapshotHistoryService(test_db).get_snapshot_history(
+            system.id, dataset="data", limit=2
+        )
+
+        assert [entry["name"] for entry in history] == ["data-2", "data-1"]
+        assert history[0]["dataset"] == "data"
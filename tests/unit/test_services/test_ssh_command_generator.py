@@ -122,3 +122,14 @@ class TestSSHCommandGenerator:
         assert (
             base_index < ending_index
         ), f"Base snapshot must come before ending snapshot. Command: {command}"
+
+    def test_generated_commands_are_memoized(self):
+        """Test that repeated calls with the same arguments reuse the cached command."""
+        kwargs = dict(
+            pool="tank", dataset="cached", snapshot_name="snap-1", target_ssh_hostname="backup"
+        )
+        first = SSHCommandGenerator.generate_full_sync_command(**kwargs)
+        hits = SSHCommandGenerator.generate_full_sync_command.cache_info().hits
+
+        assert SSHCommandGenerator.generate_full_sync_command(**kwargs) == first
+        assert SSHCommandGenerator.generate_full_sync_command.cache_info().hits == hits + 1
@@ -0,0 +1,60 @@
+"""Unit tests for SyncSchedulerService."""
+
+import asyncio
+
+from sqlalchemy import event
+
+from zfs_sync.database.repositories import SyncGroupRepository, SystemRepository
+from zfs_sync.services import sync_scheduler
+from zfs_sync.services.sync_scheduler import SyncSchedulerService
+
+
+class TestSyncSchedulerService:
+    """Test suite for SyncSchedulerService."""
+
+    def test_process_all_sync_groups_loads_members_once(
+        self, test_db, sample_system_data, monkeypatch
+    ):
+        """Test that group members are read in one pass, not once per group."""
+        system_repo = SystemRepository(test_db)
+        systems = [
+            system_repo.create(**{**sample_system_data, "hostname": f"system-{i}"})
+            for i in range(3)
+        ]
+        group_repo = SyncGroupRepository(test_db)
+        expected = {}
+        for name, members in (("group-a", systems[:2]), ("group-b", systems[1:])):
+            group = group_repo.create(name=name)
+            for system in members:
+                group_repo.add_system(group.id, system.id)
+            expected[group.id] = sorted(system.id for system in members)
+        group_repo.create(name="group-single")
+        test_db.expire_all()
+
+        processed = {}
+
+        async def fake_process(sync_group_id, db, system_ids=None):
+            processed[sync_group_id] = sorted(system_ids)
+            # Real processing commits, expiring every loaded group
+            db.commit()
+
+        monkeypatch.setattr(sync_scheduler, "get_db", lambda: iter([test_db]))
+        monkeypatch.setattr(test_db, "close", lambda: None)
+        scheduler = SyncSchedulerService()
+        monkeypatch.setattr(scheduler, "_process_sync_group", fake_process)
+        scheduler._running = True
+
+        statements = []
+        engine = test_db.get_bind()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            asyncio.run(scheduler._process_all_sync_groups())
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert processed == expected
+        assert len([s for s in statements if "FROM sync_group_systems" in s]) == 1
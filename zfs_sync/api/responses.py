@@ -0,0 +1,20 @@
+"""Shared API response classes."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core's serializer.
+
+    Endpoints that return plain dicts without a response_model otherwise pay for
+    jsonable_encoder plus json.dumps; returning this response skips both. UUIDs,
+    datetimes, enums and sets are encoded natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Encode the content straight to JSON bytes."""
+        return to_json(content)
@@ -7,6 +7,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from zfs_sync.api.responses import PydanticJSONResponse
 from zfs_sync.api.schemas.snapshot import (
     SnapshotCreate,
     SnapshotDeleteResponse,
@@ -86,46 +87,56 @@ async def create_snapshots_batch(snapshots: List[SnapshotCreate], db: Session =
         f"Processing batch snapshot report: {len(snapshots)} snapshots from {len(snapshots_by_system)} system(s)"
     )
 
-    # Process snapshots with individual error handling
+    # Insert the whole batch in one statement; if that fails, retry row by row so
+    # individual failures can be reported without rejecting the rest
     repo = SnapshotRepository(db)
     created = []
     failed = []
 
-    for idx, snapshot_data in enumerate(snapshots):
-        try:
-            db_snapshot = repo.create(**snapshot_data.model_dump(by_alias=True))
-            created.append(SnapshotResponse.model_validate(db_snapshot))
-        except ValueError as e:
-            # Handle constraint violations (e.g., duplicate snapshots)
-            error_detail = str(e)
-            logger.warning(
-                f"Failed to create snapshot {idx + 1}/{len(snapshots)}: "
-                f"{snapshot_data.name} on {snapshot_data.pool}/{snapshot_data.dataset} - {error_detail}"
-            )
-            failed.append(
-                {
-                    "snapshot": snapshot_data.name,
-                    "pool": snapshot_data.pool,
-                    "dataset": snapshot_data.dataset,
-                    "error": error_detail,
-                }
-            )
-        except Exception as e:
-            # Handle other unexpected errors
-            error_detail = str(e)
-            logger.error(
-                f"Unexpected error creating snapshot {idx + 1}/{len(snapshots)}: "
-                f"{snapshot_data.name} on {snapshot_data.pool}/{snapshot_data.dataset} - {error_detail}",
-                exc_info=True,
-            )
-            failed.append(
-                {
-                    "snapshot": snapshot_data.name,
-                    "pool": snapshot_data.pool,
-                    "dataset": snapshot_data.dataset,
-                    "error": error_detail,
-                }
+    try:
+        created = [
+            SnapshotResponse.model_validate(db_snapshot)
+            for db_snapshot in repo.create_many(
+                [snapshot_data.model_dump(by_alias=True) for snapshot_data in snapshots]
             )
+        ]
+    except Exception as bulk_error:
+        logger.warning(f"Bulk snapshot insert failed, retrying individually: {bulk_error}")
+        for idx, snapshot_data in enumerate(snapshots):
+            try:
+                db_snapshot = repo.create(**snapshot_data.model_dump(by_alias=True))
+                created.append(SnapshotResponse.model_validate(db_snapshot))
+            except ValueError as e:
+                # Handle constraint violations (e.g., duplicate snapshots)
+                error_detail = str(e)
+                logger.warning(
+                    f"Failed to create snapshot {idx + 1}/{len(snapshots)}: "
+                    f"{snapshot_data.name} on {snapshot_data.pool}/{snapshot_data.dataset} - {error_detail}"
+                )
+                failed.append(
+                    {
+                        "snapshot": snapshot_data.name,
+                        "pool": snapshot_data.pool,
+                        "dataset": snapshot_data.dataset,
+                        "error": error_detail,
+                    }
+                )
+            except Exception as e:
+                # Handle other unexpected errors
+                error_detail = str(e)
+                logger.error(
+                    f"Unexpected error creating snapshot {idx + 1}/{len(snapshots)}: "
+                    f"{snapshot_data.name} on {snapshot_data.pool}/{snapshot_data.dataset} - {error_detail}",
+                    exc_info=True,
+                )
+                failed.append(
+                    {
+                        "snapshot": snapshot_data.name,
+                        "pool": snapshot_data.pool,
+                        "dataset": snapshot_data.dataset,
+                        "error": error_detail,
+                    }
+                )
 
     # Log creation summary
     logger.info(
@@ -202,30 +213,7 @@ async def compare_snapshots_by_dataset(
     """Compare snapshots across multiple systems for a dataset."""
     service = SnapshotComparisonService(db)
     result = service.compare_snapshots_by_dataset(dataset=dataset, system_ids=system_ids)
-    return result
-
-
-@router.get("/snapshots/compare-dataset")
-async def compare_snapshots_by_dataset_name(
-    dataset: str = Query(..., description="Dataset name (pool-agnostic, e.g., 'L1S4DAT1')"),
-    system_ids: List[UUID] = Query(..., description="System IDs to compare"),
-    db: Session = Depends(get_db),
-):
-    """
-    Compare snapshots for a dataset name across multiple systems (pool-agnostic).
-
-    This endpoint compares snapshots by dataset name only, ignoring pool names.
-    Useful when systems use different pool names but have the same datasets.
-
-    Returns for each system:
-    - system_id and hostname
-    - sync_status: "in_sync", "out_of_sync", or "no_snapshots"
-    - last_snapshot: Name of the latest snapshot on that system
-    - missing_count: Number of snapshots missing compared to the system with the most snapshots
-    """
-    service = SnapshotComparisonService(db)
-    result = service.compare_snapshots_by_dataset_name(dataset_name=dataset, system_ids=system_ids)
-    return result
+    return PydanticJSONResponse(result)
 
 
 @router.get("/snapshots/differences")
@@ -242,7 +230,7 @@ async def get_snapshot_differences(
         system_id_2=system_id_2,
         dataset=dataset,
     )
-    return result
+    return PydanticJSONResponse(result)
 
 
 @router.get("/snapshots/gaps")
@@ -254,7 +242,7 @@ async def get_snapshot_gaps(
     """Identify gaps in snapshot sequences across systems."""
     service = SnapshotComparisonService(db)
     gaps = service.get_snapshot_gaps(system_ids=system_ids, dataset=dataset)
-    return {"gaps": gaps, "count": len(gaps)}
+    return PydanticJSONResponse({"gaps": gaps, "count": len(gaps)})
 
 
 @router.get("/snapshots/timeline")
@@ -267,7 +255,7 @@ async def get_snapshot_timeline(
     """Get a timeline of snapshots across multiple systems."""
     service = SnapshotHistoryService(db)
     timeline = service.get_snapshot_timeline(pool=pool, dataset=dataset, system_ids=system_ids)
-    return timeline
+    return PydanticJSONResponse(timeline)
 
 
 @router.get("/snapshots/system/{system_id}", response_model=List[SnapshotResponse])
@@ -344,7 +332,7 @@ async def get_snapshot_history(
     history = service.get_snapshot_history(
         system_id=system_id, pool=pool, dataset=dataset, days=days, limit=limit
     )
-    return {"history": history, "count": len(history)}
+    return PydanticJSONResponse({"history": history, "count": len(history)})
 
 
 @router.get("/snapshots/statistics/{system_id}")
@@ -356,7 +344,7 @@ async def get_snapshot_statistics(
     """Get statistics about snapshots for a system."""
     service = SnapshotHistoryService(db)
     stats = service.get_snapshot_statistics(system_id=system_id, days=days)
-    return stats
+    return PydanticJSONResponse(stats)
 
 
 @router.get("/snapshots/{snapshot_id}", response_model=SnapshotResponse)
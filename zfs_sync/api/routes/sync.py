@@ -6,6 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from zfs_sync.api.responses import PydanticJSONResponse
 from zfs_sync.api.schemas.sync import (
     SyncStateResponse,
     SyncActionResponse,
@@ -53,7 +54,7 @@ async def get_sync_mismatches(group_id: UUID, db: Session = Depends(get_db)):
     """Detect snapshot mismatches for a sync group."""
     service = SyncCoordinationService(db)
     mismatches = service.detect_sync_mismatches(sync_group_id=group_id)
-    return {"mismatches": mismatches, "count": len(mismatches)}
+    return PydanticJSONResponse({"mismatches": mismatches, "count": len(mismatches)})
 
 
 @router.get("/sync/groups/{group_id}/actions", response_model=List[SyncActionResponse])
@@ -128,6 +129,6 @@ async def analyze_sync_group(group_id: UUID, db: Session = Depends(get_db)):
     service = SyncCoordinationService(db)
     try:
         analysis = service.analyze_sync_group(sync_group_id=group_id)
-        return analysis
+        return PydanticJSONResponse(analysis)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -34,17 +34,16 @@ async def create_sync_group(group: SyncGroupCreate, db: Session = Depends(get_db
                 detail="hub_system_id must be one of the systems in the sync group",
             )
 
-    # Create the sync group
-    db_group = repo.create(**group.model_dump(exclude={"system_ids"}, by_alias=True))
-
-    # Add system associations
     from zfs_sync.database.models import SyncGroupSystemModel
 
-    for system_id in group.system_ids:
-        association = SyncGroupSystemModel(sync_group_id=db_group.id, system_id=system_id)
-        db.add(association)
+    # Create the sync group and its system associations in one transaction
+    with repo.unit_of_work():
+        db_group = repo.create(**group.model_dump(exclude={"system_ids"}, by_alias=True))
 
-    db.commit()
+        # dict.fromkeys drops repeated IDs, which the unique membership index would reject
+        for system_id in dict.fromkeys(group.system_ids):
+            association = SyncGroupSystemModel(sync_group_id=db_group.id, system_id=system_id)
+            db.add(association)
     db.refresh(db_group)
 
     logger.info(f"Created sync group: {db_group.name} ({db_group.id})")
@@ -59,7 +58,7 @@ async def create_sync_group(group: SyncGroupCreate, db: Session = Depends(get_db
 async def list_sync_groups(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """List all sync groups."""
     repo = SyncGroupRepository(db)
-    groups = repo.get_all(skip=skip, limit=limit)
+    groups = repo.get_all_with_systems(skip=skip, limit=limit)
     responses = []
     for g in groups:
         response = SyncGroupResponse.model_validate(g)
@@ -129,7 +128,7 @@ async def update_sync_group(
         ).delete()
 
         # Add new associations
-        for system_id in group_update.system_ids:
+        for system_id in dict.fromkeys(group_update.system_ids):
             association = SyncGroupSystemModel(sync_group_id=group_id, system_id=system_id)
             db.add(association)
 
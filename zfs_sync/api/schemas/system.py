@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class SystemBase(BaseModel):
@@ -59,8 +59,4 @@ class SystemResponse(SystemBase):
     updated_at: datetime
     api_key: Optional[str] = Field(None, description="API key (only returned on creation)")
 
-    class Config:
-        """Pydantic configuration."""
-
-        from_attributes = True
-        populate_by_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
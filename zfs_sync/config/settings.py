@@ -4,6 +4,7 @@ import os
 import platform
 import re
 import socket
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -20,6 +21,25 @@ except ImportError:
     tomli = None  # type: ignore[assignment, misc]
 
 
+SQLITE_URL_PREFIX = "sqlite:///"
+
+
+@lru_cache(maxsize=16)
+def sqlite_database_path(database_url: str) -> Optional[Path]:
+    """
+    Get the database file path from a SQLite URL.
+
+    sqlite:////absolute/path/to/db.db -> /absolute/path/to/db.db
+    sqlite:///relative/path/to/db.db -> relative/path/to/db.db
+
+    Returns:
+        Path to the database file, or None if the URL is not a SQLite URL
+    """
+    if not database_url.startswith(SQLITE_URL_PREFIX):
+        return None
+    return Path(database_url[len(SQLITE_URL_PREFIX) :])
+
+
 def get_default_database_url() -> str:
     """Get default database URL based on platform."""
     system = platform.system().lower()
@@ -2,13 +2,12 @@
 
 import os
 import socket
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import OperationalError
-
-from zfs_sync.config.settings import Settings
+from zfs_sync.config.settings import Settings, sqlite_database_path
 from zfs_sync.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -33,6 +32,31 @@ class ConfigurationError(Exception):
         super().__init__(full_message)
 
 
+# Directories already probed successfully; failures are not remembered so a
+# fixed permission problem is picked up on the next check
+_writable_dirs: Set[Path] = set()
+
+
+def _is_dir_writable(directory: Path) -> bool:
+    """
+    Check whether a directory is writable by actually creating a file in it.
+
+    Unlike os.access(), this reflects what the process can really do under ACLs,
+    read-only mounts and container user mappings. Each probe uses its own
+    uniquely named file, so concurrent validators checking the same directory
+    don't trip over each other.
+    """
+    if directory in _writable_dirs:
+        return True
+    try:
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=".zfs_sync_wtest"):
+            pass
+    except OSError:
+        return False
+    _writable_dirs.add(directory)
+    return True
+
+
 def validate_configuration(settings: Settings) -> None:
     """
     Validate application configuration on startup.
@@ -48,28 +72,25 @@ def validate_configuration(settings: Settings) -> None:
     """
     logger.info("Validating configuration...")
 
-    errors = []
+    # The checks are independent and mostly wait on I/O (DB connect, DNS lookup,
+    # port probe), so run them concurrently; errors keep their declared order
+    validators = (
+        ("Database configuration", validate_database_config, (settings,)),
+        ("Log directory", validate_log_directory, ()),
+        ("Network configuration", validate_network_config, (settings,)),
+    )
+    with ThreadPoolExecutor(max_workers=len(validators)) as executor:
+        futures = [
+            (name, executor.submit(validator, *args)) for name, validator, args in validators
+        ]
 
-    # Validate database configuration
-    try:
-        validate_database_config(settings)
-        logger.debug("Database configuration validated")
-    except ConfigurationError as e:
-        errors.append(str(e))
-
-    # Validate log directory
-    try:
-        validate_log_directory()
-        logger.debug("Log directory validated")
-    except ConfigurationError as e:
-        errors.append(str(e))
-
-    # Validate network configuration
-    try:
-        validate_network_config(settings)
-        logger.debug("Network configuration validated")
-    except ConfigurationError as e:
-        errors.append(str(e))
+    errors = []
+    for name, future in futures:
+        try:
+            future.result()
+            logger.debug("%s validated", name)
+        except ConfigurationError as e:
+            errors.append(str(e))
 
     # If any errors, raise them
     if errors:
@@ -91,24 +112,21 @@ def validate_database_config(settings: Settings) -> None:
     Raises:
         ConfigurationError: If database configuration is invalid
     """
+    # Imported lazily so callers that only need ConfigurationError don't pay
+    # the SQLAlchemy import cost.
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.exc import OperationalError
+
     database_url = settings.database_url
+    db_path = sqlite_database_path(database_url)
 
-    if database_url.startswith("sqlite:///"):
+    if db_path is not None:
         # Validate SQLite database path
-        file_path = database_url.replace("sqlite:///", "", 1)
-
-        # Handle absolute paths
-        if file_path.startswith("/"):
-            db_path = Path(file_path)
-        else:
-            db_path = Path(file_path)
-
-        # Get parent directory
         parent_dir = db_path.parent
 
         # Check if parent directory exists and is writable
         if parent_dir.exists():
-            if not os.access(parent_dir, os.W_OK):
+            if not _is_dir_writable(parent_dir):
                 raise ConfigurationError(
                     f"Database directory '{parent_dir}' is not writable",
                     suggestion=(
@@ -202,7 +220,7 @@ def validate_log_directory() -> None:
             ) from e
 
     # Check if directory is writable
-    if not os.access(log_dir, os.W_OK):
+    if not _is_dir_writable(log_dir):
         raise ConfigurationError(
             f"Log directory '{log_dir}' is not writable",
             suggestion=(
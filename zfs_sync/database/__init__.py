@@ -1,6 +1,15 @@
 """Database configuration and session management."""
 
-from zfs_sync.database.base import Base, BaseModel, GUID, get_db, get_session
+from zfs_sync.database.base import Base, BaseModel, CompactJSON, GUID, get_db, get_session
 from zfs_sync.database.engine import create_engine, init_db
 
-__all__ = ["Base", "BaseModel", "GUID", "get_db", "get_session", "create_engine", "init_db"]
+__all__ = [
+    "Base",
+    "BaseModel",
+    "CompactJSON",
+    "GUID",
+    "get_db",
+    "get_session",
+    "create_engine",
+    "init_db",
+]
@@ -1,48 +1,84 @@
 """Base database models and session management."""
 
-from sqlalchemy import Column, DateTime
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, DateTime
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
 from sqlalchemy.sql import func
-from sqlalchemy.types import TypeDecorator, CHAR
+from sqlalchemy.types import BINARY, TypeDecorator
 import uuid
 
-Base = declarative_base()
-
-# SessionLocal will be set by engine module
-SessionLocal = None
-
 
 class GUID(TypeDecorator):
-    """Platform-independent GUID type for SQLAlchemy."""
+    """
+    Platform-independent GUID type for SQLAlchemy.
+
+    Uses PostgreSQL's native UUID type; other dialects store the raw 16 bytes.
+    """
 
-    impl = CHAR
+    impl = BINARY
     cache_ok = True
 
     def load_dialect_impl(self, dialect):
         if dialect.name == "postgresql":
             return dialect.type_descriptor(PostgresUUID())
         else:
-            return dialect.type_descriptor(CHAR(36))
+            return dialect.type_descriptor(BINARY(16))
 
     def process_bind_param(self, value, dialect):
         if value is None:
             return value
-        elif dialect.name == "postgresql":
-            return str(value)
-        else:
-            if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value))
-            return str(value)
+        if dialect.name == "postgresql":
+            if isinstance(value, uuid.UUID):
+                return str(value)
+            # Strings go through uuid.UUID so malformed ids raise ValueError here
+            # rather than a driver error
+            return str(uuid.UUID(value))
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        return uuid.UUID(value).bytes
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
+        if value is None or isinstance(value, uuid.UUID):
+            # PostgreSQL drivers already return UUID instances
             return value
+        # Text-form ids from before the switch to 16-byte storage are not read back;
+        # init_db() refuses to start on a database that still holds them
+        return uuid.UUID(bytes=value)
+
+
+class CompactJSON(TypeDecorator):
+    """
+    JSON column that stores empty payloads as SQL NULL.
+
+    Most rows carry no metadata, so storing NULL instead of '{}' skips the JSON
+    encode/decode round-trip for them. NULL is read back as an empty dict.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(none_as_null=True)
+
+    def process_bind_param(self, value, dialect):
+        return value or None
+
+    def process_result_value(self, value, dialect):
+        return {} if value is None else value
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all ORM models."""
+
+    # Every Mapped[uuid.UUID] column shares this single GUID instance
+    type_annotation_map = {uuid.UUID: GUID()}
+
+
+def _utcnow() -> datetime:
+    """Timestamp default computed client-side so it is bound as a literal parameter."""
+    return datetime.now(timezone.utc)
 
 
 class BaseModel(Base):
@@ -50,24 +86,25 @@ class BaseModel(Base):
 
     __abstract__ = True
 
-    id = Column(GUID(), primary_key=True, default=uuid.uuid4)  # type: ignore[assignment]
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # type: ignore[assignment]
-    updated_at = Column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
-    )  # type: ignore[assignment]
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    # server_default stays as a fallback for rows inserted with raw SQL
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utcnow, server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        onupdate=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
 
 
 def get_session() -> Session:
     """Get a database session."""
-    from zfs_sync.database.engine import SessionLocal as _SessionLocal
-
-    if _SessionLocal is None:
-        from zfs_sync.database.engine import create_engine
-
-        create_engine()
-        from zfs_sync.database.engine import SessionLocal as _SessionLocal
+    from zfs_sync.database.engine import get_session_factory
 
-    return _SessionLocal()
+    return get_session_factory()()
 
 
 def get_db():
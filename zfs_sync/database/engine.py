@@ -1,19 +1,61 @@
 """Database engine creation and initialization."""
 
+import hashlib
 import os
-from pathlib import Path
+import threading
+from typing import List, Optional
 
+from sqlalchemy import (
+    Column,
+    MetaData,
+    String,
+    Table,
+    delete,
+    event,
+    func,
+    inspect,
+    literal,
+    select,
+)
 from sqlalchemy import create_engine as sa_create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from zfs_sync.config import get_settings
-from zfs_sync.database.base import Base
+from zfs_sync.config.settings import sqlite_database_path
+from zfs_sync.database import models  # noqa: F401  # registers models with Base.metadata
+from zfs_sync.database.base import GUID, Base
 from zfs_sync.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-SessionLocal = None
+# Module-level engine cache (singleton pattern); SessionLocal is bound to it
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+SessionLocal: Optional[sessionmaker] = None
+
+# Connection pool sizing for file-backed SQLite databases
+SQLITE_POOL_SIZE = 10
+SQLITE_MAX_OVERFLOW = 20
+
+# PRAGMAs applied once per new SQLite connection; pooled connections keep them
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# Single-row table recording the hash of the schema create_all last applied; kept
+# out of Base.metadata so it never affects the hash itself
+_schema_meta = Table(
+    "_schema_meta",
+    MetaData(),
+    Column("hash", String(64), nullable=False),
+)
 
 
 def _ensure_database_directory(database_url: str) -> None:
@@ -30,23 +72,11 @@ def _ensure_database_directory(database_url: str) -> None:
         OSError: If directory creation fails
         ValueError: If database URL format is invalid
     """
-    if not database_url.startswith("sqlite:///"):
+    db_path = sqlite_database_path(database_url)
+    if db_path is None:
         # Not a SQLite database, no directory creation needed
         return
 
-    # Extract file path from SQLite URL
-    # sqlite:////absolute/path/to/db.db -> /absolute/path/to/db.db
-    # sqlite:///relative/path/to/db.db -> relative/path/to/db.db
-    file_path = database_url.replace("sqlite:///", "", 1)
-
-    # Handle absolute paths (starting with /)
-    if file_path.startswith("/"):
-        # Absolute path: sqlite:////path -> /path
-        db_path = Path(file_path)
-    else:
-        # Relative path: sqlite:///path -> path
-        db_path = Path(file_path)
-
     # Get parent directory
     parent_dir = db_path.parent
 
@@ -74,14 +104,12 @@ def _ensure_database_directory(database_url: str) -> None:
         raise PermissionError(error_msg)
 
 
-def create_engine() -> Engine:
+def _build_engine() -> Engine:
     """
-    Create and configure the database engine.
+    Build and configure a new database engine from settings.
 
     For SQLite databases, ensures the parent directory exists before creating the engine.
     """
-    global SessionLocal
-
     settings = get_settings()
 
     # Ensure database directory exists for SQLite databases
@@ -91,25 +119,78 @@ def create_engine() -> Engine:
         logger.error(f"Database directory setup failed: {e}")
         raise
 
+    # Only enable statement echo in debug mode; otherwise leave SQLAlchemy's logging
+    # hooks at their defaults so no per-statement log checks are installed
+    echo_options = {"echo": True} if settings.debug else {}
+
+    if not settings.database_url.startswith("sqlite"):
+        return sa_create_engine(settings.database_url, **echo_options)
+
+    if ":memory:" in settings.database_url:
+        # In-memory databases are per-connection, so pooling would split the data
+        return sa_create_engine(
+            settings.database_url,
+            connect_args={"check_same_thread": False},
+            **echo_options,
+        )
+
     engine = sa_create_engine(
         settings.database_url,
-        connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-        echo=settings.debug,
+        connect_args={"check_same_thread": False},
+        **echo_options,
+        poolclass=QueuePool,
+        pool_size=SQLITE_POOL_SIZE,
+        max_overflow=SQLITE_MAX_OVERFLOW,
+        pool_pre_ping=True,
     )
-
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
     return engine
 
 
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply performance PRAGMAs to a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def create_engine() -> Engine:
+    """
+    Get or create the shared database engine.
+
+    The engine and its session factory are built once per process; later calls
+    return the same instance instead of rebuilding the pool and dialect.
+    """
+    global _engine, SessionLocal  # noqa: PLW0603
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = _build_engine()
+                SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+
+    return _engine
+
+
+def get_session_factory() -> sessionmaker:
+    """Get the session factory bound to the shared engine, creating it if needed."""
+    create_engine()
+    assert SessionLocal is not None, "SessionLocal should be initialized"
+    return SessionLocal
+
+
 def init_db() -> None:
     """
     Initialize the database by creating all tables.
 
     Ensures the database directory exists before attempting to create tables.
+    create_all is skipped when the stored schema hash matches the current models,
+    so warm starts don't check every table for existence.
     """
-    # Import models to ensure they register with Base.metadata
-    import zfs_sync.database.models  # noqa: F401
-
     settings = get_settings()
 
     # Ensure database directory exists (create_engine also does this, but be explicit)
@@ -122,8 +203,61 @@ def init_db() -> None:
     engine = create_engine()
 
     try:
-        Base.metadata.create_all(bind=engine)
+        schema_hash = _schema_hash(engine)
+        with engine.begin() as conn:
+            if _stored_schema_hash(conn) == schema_hash:
+                logger.info("Database schema is up to date")
+                return
+            text_guids = _find_text_guids(conn)
+            if text_guids:
+                raise RuntimeError(
+                    "Database still stores ids as 36-character text in "
+                    f"{', '.join(text_guids)}. This version stores them as 16-byte blobs "
+                    "and cannot look up text ids; convert those values to blobs (as alembic "
+                    "revision 005 does) before starting."
+                )
+            Base.metadata.create_all(bind=conn)
+            conn.execute(delete(_schema_meta))
+            conn.execute(_schema_meta.insert().values(hash=schema_hash))
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
         raise
+
+
+def _find_text_guids(conn: Connection) -> List[str]:
+    """
+    List the SQLite GUID columns ("table.column") that still hold text-form ids.
+
+    Lookups bind 16-byte values, so rows written before the switch to blob
+    storage would silently never match. Only runs when the schema changed.
+    """
+    if conn.dialect.name != "sqlite":
+        return []
+    existing = set(inspect(conn).get_table_names())
+    found = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        for column in table.columns:
+            if isinstance(column.type, GUID) and conn.scalar(
+                select(literal(1)).where(func.typeof(column) == "text").limit(1)
+            ):
+                found.append(f"{table.name}.{column.name}")
+    return found
+
+
+def _schema_hash(engine: Engine) -> str:
+    """Hash the DDL that create_all would emit for the current models on this dialect."""
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode())
+    return digest.hexdigest()
+
+
+def _stored_schema_hash(conn: Connection) -> Optional[str]:
+    """Return the schema hash recorded by the last create_all, if any."""
+    _schema_meta.create(conn, checkfirst=True)
+    return conn.execute(select(_schema_meta.c.hash)).scalar()
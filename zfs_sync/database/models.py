@@ -1,9 +1,18 @@
 """SQLAlchemy database models."""
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import uuid
 
-from zfs_sync.database.base import BaseModel, GUID
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from zfs_sync.database.base import BaseModel, CompactJSON
+
+
+def _foreign_key(target: str, nullable: bool = False) -> Any:
+    """Indexed foreign key column; the GUID type comes from the Mapped[uuid.UUID] annotation."""
+    return mapped_column(ForeignKey(target), nullable=nullable, index=True)
 
 
 class SystemModel(BaseModel):
@@ -11,20 +20,28 @@ class SystemModel(BaseModel):
 
     __tablename__ = "systems"
 
-    hostname = Column(String(255), nullable=False, unique=True, index=True)  # type: ignore[assignment]
-    platform = Column(String(50), nullable=False)  # type: ignore[assignment]
-    connectivity_status = Column(String(20), default="unknown", nullable=False)  # type: ignore[assignment]
-    last_seen = Column(DateTime(timezone=True), nullable=True)  # type: ignore[assignment]
-    api_key = Column(String(255), nullable=True, unique=True, index=True)  # type: ignore[assignment]
-    ssh_hostname = Column(String(255), nullable=True, index=True)  # type: ignore[assignment]
-    ssh_user = Column(String(100), nullable=True)  # type: ignore[assignment]
-    ssh_port = Column(Integer, default=22, nullable=False)  # type: ignore[assignment]
-    extra_metadata = Column("metadata", JSON, default=dict)  # type: ignore[assignment]
+    hostname: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
+    platform: Mapped[str] = mapped_column(String(50), nullable=False)
+    connectivity_status: Mapped[str] = mapped_column(
+        String(20), default="unknown", nullable=False, index=True
+    )
+    last_seen: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    api_key: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True, unique=True, index=True
+    )
+    ssh_hostname: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+    ssh_user: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    ssh_port: Mapped[int] = mapped_column(Integer, default=22, nullable=False)
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column(
+        "metadata", CompactJSON(), default=dict, nullable=True
+    )
 
     # Relationships
-    snapshots = relationship("SnapshotModel", back_populates="system", cascade="all, delete-orphan")
-    sync_states = relationship(
-        "SyncStateModel", back_populates="system", cascade="all, delete-orphan"
+    snapshots: Mapped[List["SnapshotModel"]] = relationship(
+        back_populates="system", cascade="all, delete-orphan"
+    )
+    sync_states: Mapped[List["SyncStateModel"]] = relationship(
+        back_populates="system", cascade="all, delete-orphan"
     )
 
 
@@ -32,19 +49,38 @@ class SnapshotModel(BaseModel):
     """Database model for ZFS snapshots."""
 
     __tablename__ = "snapshots"
+    __table_args__ = (
+        # Covers "latest snapshot for a dataset on a system" lookups
+        Index("ix_snapshots_system_pool_dataset_ts", "system_id", "pool", "dataset", "timestamp"),
+        # Backs newest-first keyset pagination of a system's snapshots
+        Index("ix_snapshots_system_ts_id", "system_id", "timestamp", "id"),
+        # Pool/dataset lookups across systems; covering on PostgreSQL
+        Index(
+            "ix_snapshots_pool_dataset_system_ts",
+            "pool",
+            "dataset",
+            "system_id",
+            "timestamp",
+            postgresql_include=["id", "name"],
+        ),
+        # Dataset lookups across systems; also yields each system's latest snapshot
+        Index("ix_snapshots_dataset_system_ts", "dataset", "system_id", "timestamp"),
+    )
 
-    name = Column(String(255), nullable=False, index=True)  # type: ignore[assignment]
-    pool = Column(String(100), nullable=False, index=True)  # type: ignore[assignment]
-    dataset = Column(String(255), nullable=False, index=True)  # type: ignore[assignment]
-    timestamp = Column(DateTime(timezone=True), nullable=False, index=True)  # type: ignore[assignment]
-    size = Column(Integer, nullable=True)  # type: ignore[assignment]
-    system_id = Column(GUID(), ForeignKey("systems.id"), nullable=False, index=True)  # type: ignore[assignment]
-    referenced = Column(Integer, nullable=True)  # type: ignore[assignment]
-    used = Column(Integer, nullable=True)  # type: ignore[assignment]
-    extra_metadata = Column("metadata", JSON, default=dict)  # type: ignore[assignment]
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    pool: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    dataset: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    system_id: Mapped[uuid.UUID] = _foreign_key("systems.id")
+    referenced: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    used: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column(
+        "metadata", CompactJSON(), default=dict, nullable=True
+    )
 
     # Relationships
-    system = relationship("SystemModel", back_populates="snapshots")
+    system: Mapped["SystemModel"] = relationship(back_populates="snapshots")
 
 
 class SyncGroupModel(BaseModel):
@@ -52,50 +88,71 @@ class SyncGroupModel(BaseModel):
 
     __tablename__ = "sync_groups"
 
-    name = Column(String(255), nullable=False, unique=True, index=True)  # type: ignore[assignment]
-    description = Column(Text, nullable=True)  # type: ignore[assignment]
-    enabled = Column(Boolean, default=True, nullable=False)  # type: ignore[assignment]
-    sync_interval_seconds = Column(Integer, default=3600, nullable=False)  # type: ignore[assignment]
-    directional = Column(Boolean, default=False, nullable=False)  # type: ignore[assignment]
-    hub_system_id = Column(GUID(), ForeignKey("systems.id"), nullable=True, index=True)  # type: ignore[assignment]
-    extra_metadata = Column("metadata", JSON, default=dict)  # type: ignore[assignment]
+    name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    sync_interval_seconds: Mapped[int] = mapped_column(Integer, default=3600, nullable=False)
+    directional: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    hub_system_id: Mapped[Optional[uuid.UUID]] = _foreign_key("systems.id", nullable=True)
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column(
+        "metadata", CompactJSON(), default=dict, nullable=True
+    )
 
     # Many-to-many relationship with systems
-    system_associations = relationship(
-        "SyncGroupSystemModel", back_populates="sync_group", cascade="all, delete-orphan"
+    system_associations: Mapped[List["SyncGroupSystemModel"]] = relationship(
+        back_populates="sync_group", cascade="all, delete-orphan"
     )
 
     # Relationship to hub system
-    hub_system = relationship("SystemModel", foreign_keys=[hub_system_id])
+    hub_system: Mapped[Optional["SystemModel"]] = relationship(foreign_keys=[hub_system_id])
 
 
 class SyncGroupSystemModel(BaseModel):
     """Association table for sync groups and systems."""
 
     __tablename__ = "sync_group_systems"
+    __table_args__ = (
+        Index("ix_sync_group_systems_group_system", "sync_group_id", "system_id", unique=True),
+    )
 
-    sync_group_id = Column(GUID(), ForeignKey("sync_groups.id"), nullable=False, index=True)  # type: ignore[assignment]
-    system_id = Column(GUID(), ForeignKey("systems.id"), nullable=False, index=True)  # type: ignore[assignment]
+    sync_group_id: Mapped[uuid.UUID] = _foreign_key("sync_groups.id")
+    system_id: Mapped[uuid.UUID] = _foreign_key("systems.id")
 
     # Relationships
-    sync_group = relationship("SyncGroupModel", back_populates="system_associations")
-    system = relationship("SystemModel")
+    sync_group: Mapped["SyncGroupModel"] = relationship(back_populates="system_associations")
+    system: Mapped["SystemModel"] = relationship()
 
 
 class SyncStateModel(BaseModel):
     """Database model for synchronization states."""
 
     __tablename__ = "sync_states"
+    __table_args__ = (
+        Index("ix_sync_states_group_status", "sync_group_id", "status"),
+        Index("ix_sync_states_system_dataset", "system_id", "dataset"),
+        # One sync state per (group, dataset, system)
+        Index(
+            "ix_sync_states_group_dataset_system",
+            "sync_group_id",
+            "dataset",
+            "system_id",
+            unique=True,
+        ),
+    )
 
-    sync_group_id = Column(GUID(), ForeignKey("sync_groups.id"), nullable=False, index=True)  # type: ignore[assignment]
-    dataset = Column(String(255), nullable=False, index=True)  # type: ignore[assignment]
-    system_id = Column(GUID(), ForeignKey("systems.id"), nullable=False, index=True)  # type: ignore[assignment]
-    status = Column(String(20), nullable=False, default="out_of_sync", index=True)  # type: ignore[assignment]
-    last_sync = Column(DateTime(timezone=True), nullable=True)  # type: ignore[assignment]
-    last_check = Column(DateTime(timezone=True), nullable=True)  # type: ignore[assignment]
-    error_message = Column(Text, nullable=True)  # type: ignore[assignment]
-    extra_metadata = Column("metadata", JSON, default=dict)  # type: ignore[assignment]
+    sync_group_id: Mapped[uuid.UUID] = _foreign_key("sync_groups.id")
+    dataset: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    system_id: Mapped[uuid.UUID] = _foreign_key("systems.id")
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="out_of_sync", index=True
+    )
+    last_sync: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_check: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column(
+        "metadata", CompactJSON(), default=dict, nullable=True
+    )
 
     # Relationships
-    sync_group = relationship("SyncGroupModel")
-    system = relationship("SystemModel", back_populates="sync_states")
+    sync_group: Mapped["SyncGroupModel"] = relationship()
+    system: Mapped["SystemModel"] = relationship(back_populates="sync_states")
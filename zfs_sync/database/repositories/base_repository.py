@@ -1,10 +1,15 @@
 """Base repository class with common CRUD operations."""
 
-from typing import Generic, List, Optional, Type, TypeVar
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
 from uuid import UUID
 
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session, raiseload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from zfs_sync.database.base import BaseModel
 from zfs_sync.logging_config import get_logger
@@ -13,6 +18,28 @@ logger = get_logger(__name__)
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+# Set to 1 (as the test suite does) to make any unplanned lazy load raise
+STRICT_LOADING_ENV = "ZFS_SYNC_STRICT_LOADING"
+
+# Upper bound on values bound into a single IN (...) list; keeps each statement
+# under old SQLite's 999-variable limit and gives the planner a stable shape
+IN_CLAUSE_BATCH_SIZE = 999
+
+# Session.info key counting the open unit_of_work() blocks on a session
+_UNIT_OF_WORK_DEPTH = "zfs_sync_unit_of_work_depth"
+
+
+def repository_loader_policy() -> Tuple[LoaderOption, ...]:
+    """
+    Loader options applied to every repository read query.
+
+    In strict mode relationships must be loaded explicitly (selectinload/joinedload);
+    touching one that wasn't raises instead of silently issuing an N+1 query.
+    """
+    if os.getenv(STRICT_LOADING_ENV) == "1":
+        return (raiseload("*"),)
+    return ()
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository with common CRUD operations."""
@@ -22,13 +49,87 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.db = db
 
+    @contextmanager
+    def unit_of_work(self) -> Iterator[Session]:
+        """
+        Group several mutations into a single transaction.
+
+        Inside the block, repository methods flush instead of committing. The
+        outermost block commits once on success. If it raises, the whole unit is
+        rolled back. The depth is kept on the session, so every repository that
+        shares the session takes part, and nested blocks join the outer one.
+
+            with repo.unit_of_work():
+                repo.create(...)
+                repo.create(...)
+        """
+        depth = self.db.info.get(_UNIT_OF_WORK_DEPTH, 0)
+        self.db.info[_UNIT_OF_WORK_DEPTH] = depth + 1
+        try:
+            yield self.db
+        except BaseException:
+            self.db.info[_UNIT_OF_WORK_DEPTH] = depth
+            if depth == 0:
+                self.db.rollback()
+            raise
+        self.db.info[_UNIT_OF_WORK_DEPTH] = depth
+        if depth == 0:
+            self.db.commit()
+
+    def commit(self) -> None:
+        """Commit the session, or only flush it when inside unit_of_work()."""
+        if self.db.info.get(_UNIT_OF_WORK_DEPTH):
+            self.db.flush()
+        else:
+            self.db.commit()
+
+    def _rollback(self) -> None:
+        """Roll back after a failed operation, leaving an open unit_of_work() to do it."""
+        if not self.db.info.get(_UNIT_OF_WORK_DEPTH):
+            self.db.rollback()
+
+    def _query(self) -> Query:
+        """Start a read query for this repository's model with the loader policy applied."""
+        return self.db.query(self.model).options(*repository_loader_policy())
+
+    def _first(self, stmt: StatementLambdaElement) -> Optional[ModelType]:
+        """
+        Execute a cached lambda statement and return the first entity, if any.
+
+        Lambda statements are compiled once per call site and reused with fresh
+        bound values, so hot point lookups skip SQL construction and compilation.
+        """
+        policy = repository_loader_policy()
+        if policy:
+            stmt += lambda s: s.options(*policy)
+        return self.db.scalars(stmt).first()
+
     def get(self, id: UUID) -> Optional[ModelType]:
-        """Get a record by ID."""
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        """
+        Get a record by ID.
+
+        Session.get() answers from the identity map when the object is already
+        loaded in this session and only issues a SELECT otherwise.
+        """
+        return self.db.get(self.model, id, options=repository_loader_policy())
+
+    def get_many(self, ids: Iterable[UUID]) -> Dict[UUID, ModelType]:
+        """
+        Get several records by ID, keyed by ID.
+
+        Loads them with bounded IN queries instead of one get() per ID. IDs with
+        no matching record are absent from the result.
+        """
+        ids = list(dict.fromkeys(ids))
+        found: Dict[UUID, ModelType] = {}
+        for start in range(0, len(ids), IN_CLAUSE_BATCH_SIZE):
+            batch = ids[start : start + IN_CLAUSE_BATCH_SIZE]
+            found.update((obj.id, obj) for obj in self._query().filter(self.model.id.in_(batch)))
+        return found
 
     def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination."""
-        return self.db.query(self.model).offset(skip).limit(limit).all()
+        return self._query().offset(skip).limit(limit).all()
 
     def create(self, **kwargs) -> ModelType:
         """
@@ -41,11 +142,11 @@ class BaseRepository(Generic[ModelType]):
         try:
             db_obj = self.model(**kwargs)
             self.db.add(db_obj)
-            self.db.commit()
+            self.commit()
             self.db.refresh(db_obj)
             return db_obj
         except IntegrityError as e:
-            self.db.rollback()
+            self._rollback()
             error_msg = str(e.orig) if hasattr(e, "orig") else str(e)
             logger.error(f"Database integrity error creating {self.model.__name__}: {error_msg}")
             raise ValueError(
@@ -53,10 +154,53 @@ class BaseRepository(Generic[ModelType]):
                 f"Details: {error_msg}"
             ) from e
         except Exception as e:
-            self.db.rollback()
+            self._rollback()
             logger.error(f"Database error creating {self.model.__name__}: {e}")
             raise
 
+    def create_many(self, rows: List[Dict[str, Any]]) -> List[ModelType]:
+        """
+        Create many records in a single transaction.
+
+        Rows are sent as one batched INSERT ... RETURNING rather than one
+        INSERT/COMMIT/SELECT cycle per record. Either all rows are created or none.
+
+        Raises:
+            ValueError: If a unique constraint violation occurs
+            Exception: For other database errors
+        """
+        if not rows:
+            return []
+        try:
+            ids = self.db.scalars(
+                insert(self.model).returning(self.model.id, sort_by_parameter_order=True), rows
+            ).all()
+            self.commit()
+        except IntegrityError as e:
+            self._rollback()
+            error_msg = str(e.orig) if hasattr(e, "orig") else str(e)
+            logger.error(
+                f"Database integrity error bulk creating {self.model.__name__}: {error_msg}"
+            )
+            raise ValueError(
+                f"Failed to create {self.model.__name__} records: constraint violation. "
+                f"Details: {error_msg}"
+            ) from e
+        except Exception as e:
+            self._rollback()
+            logger.error(f"Database error bulk creating {self.model.__name__}: {e}")
+            raise
+
+        # Load the committed rows back in bounded IN batches, in input order
+        by_id = {}
+        for start in range(0, len(ids), IN_CLAUSE_BATCH_SIZE):
+            batch = ids[start : start + IN_CLAUSE_BATCH_SIZE]
+            by_id.update(
+                (obj.id, obj)
+                for obj in self.db.scalars(select(self.model).where(self.model.id.in_(batch)))
+            )
+        return [by_id[id] for id in ids]
+
     def update(self, id: UUID, **kwargs) -> Optional[ModelType]:
         """
         Update a record by ID.
@@ -70,10 +214,10 @@ class BaseRepository(Generic[ModelType]):
             try:
                 for key, value in kwargs.items():
                     setattr(db_obj, key, value)
-                self.db.commit()
+                self.commit()
                 self.db.refresh(db_obj)
             except IntegrityError as e:
-                self.db.rollback()
+                self._rollback()
                 error_msg = str(e.orig) if hasattr(e, "orig") else str(e)
                 logger.error(
                     f"Database integrity error updating {self.model.__name__} {id}: {error_msg}"
@@ -83,11 +227,42 @@ class BaseRepository(Generic[ModelType]):
                     f"Details: {error_msg}"
                 ) from e
             except Exception as e:
-                self.db.rollback()
+                self._rollback()
                 logger.error(f"Database error updating {self.model.__name__} {id}: {e}")
                 raise
         return db_obj
 
+    def update_by_id(self, id: UUID, **kwargs) -> Optional[ModelType]:
+        """
+        Update a record by ID with a single UPDATE ... RETURNING statement.
+
+        Unlike update(), the row is not loaded first and no refresh follows, so
+        ORM-level attribute events do not fire. Returns None if no row matched.
+
+        Raises:
+            ValueError: If a unique constraint violation occurs
+            Exception: For other database errors
+        """
+        stmt = update(self.model).where(self.model.id == id).values(**kwargs).returning(self.model)
+        try:
+            db_obj = self.db.scalars(stmt).first()
+            self.commit()
+            return db_obj
+        except IntegrityError as e:
+            self._rollback()
+            error_msg = str(e.orig) if hasattr(e, "orig") else str(e)
+            logger.error(
+                f"Database integrity error updating {self.model.__name__} {id}: {error_msg}"
+            )
+            raise ValueError(
+                f"Failed to update {self.model.__name__} {id}: constraint violation. "
+                f"Details: {error_msg}"
+            ) from e
+        except Exception as e:
+            self._rollback()
+            logger.error(f"Database error updating {self.model.__name__} {id}: {e}")
+            raise
+
     def delete(self, id: UUID) -> bool:
         """
         Delete a record by ID.
@@ -99,10 +274,30 @@ class BaseRepository(Generic[ModelType]):
         if db_obj:
             try:
                 self.db.delete(db_obj)
-                self.db.commit()
+                self.commit()
                 return True
             except Exception as e:
-                self.db.rollback()
+                self._rollback()
                 logger.error(f"Database error deleting {self.model.__name__} {id}: {e}")
                 raise
         return False
+
+    def delete_by_id(self, id: UUID) -> bool:
+        """
+        Delete a record by ID with a single DELETE statement.
+
+        Unlike delete(), ORM cascades do not run, so this is only for models whose
+        dependent rows are not managed through relationship cascades.
+
+        Raises:
+            Exception: For database errors
+        """
+        stmt = delete(self.model).where(self.model.id == id).returning(self.model.id)
+        try:
+            deleted = self.db.scalars(stmt).first() is not None
+            self.commit()
+            return deleted
+        except Exception as e:
+            self._rollback()
+            logger.error(f"Database error deleting {self.model.__name__} {id}: {e}")
+            raise
@@ -1,13 +1,39 @@
 """Repository for Snapshot operations."""
 
-from typing import List, Optional, Set, Tuple
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Column,
+    MetaData,
+    String,
+    Table,
+    delete,
+    exists,
+    func,
+    lambda_stmt,
+    select,
+    tuple_,
+)
+from sqlalchemy.orm import Query, Session
 
 from zfs_sync.database.models import SnapshotModel
 from zfs_sync.database.repositories.base_repository import BaseRepository
 
+# Keyset pagination cursor: (timestamp, id) of the last snapshot on the previous page
+SnapshotCursor = Tuple[datetime, UUID]
+
+# Per-connection scratch table holding the snapshot keys a system just reported
+_reported_snapshots = Table(
+    "_reported_snapshots",
+    MetaData(),
+    Column("pool", String(100), nullable=False),
+    Column("dataset", String(255), nullable=False),
+    Column("name", String(255), nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
 
 class SnapshotRepository(BaseRepository[SnapshotModel]):
     """Repository for Snapshot database operations."""
@@ -16,18 +42,36 @@ class SnapshotRepository(BaseRepository[SnapshotModel]):
         """Initialize snapshot repository."""
         super().__init__(SnapshotModel, db)
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[SnapshotModel]:
-        """Get all snapshots with pagination, ordered by timestamp descending (most recent first)."""
-        return (
-            self.db.query(SnapshotModel)
-            .order_by(SnapshotModel.timestamp.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    @staticmethod
+    def _newest_first(query: Query, after: Optional[SnapshotCursor]) -> Query:
+        """
+        Order a snapshot query newest first, optionally seeking past a cursor.
+
+        The (timestamp, id) ordering is total, so a cursor taken from the last row
+        of one page resumes exactly where it left off without an OFFSET scan.
+        """
+        if after is not None:
+            query = query.filter(tuple_(SnapshotModel.timestamp, SnapshotModel.id) < after)
+        return query.order_by(SnapshotModel.timestamp.desc(), SnapshotModel.id.desc())
+
+    def get_all(
+        self, skip: int = 0, limit: int = 100, after: Optional[SnapshotCursor] = None
+    ) -> List[SnapshotModel]:
+        """
+        Get all snapshots with pagination, ordered by timestamp descending (most recent first).
+
+        Pass ``after`` (the (timestamp, id) of the last row already seen) instead of
+        ``skip`` for deep pages.
+        """
+        query = self._newest_first(self._query(), after)
+        return query.offset(skip).limit(limit).all()
 
     def get_by_system(
-        self, system_id: UUID, skip: int = 0, limit: Optional[int] = 100
+        self,
+        system_id: UUID,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        after: Optional[SnapshotCursor] = None,
     ) -> List[SnapshotModel]:
         """
         Get all snapshots for a system, ordered by timestamp descending (most recent first).
@@ -36,14 +80,13 @@ class SnapshotRepository(BaseRepository[SnapshotModel]):
             system_id: System UUID
             skip: Number of records to skip (for pagination)
             limit: Maximum number of records to return (None for all, default 100)
+            after: Keyset cursor (timestamp, id) of the last snapshot already returned
 
         Returns:
             List of snapshots for the system
         """
-        query = (
-            self.db.query(SnapshotModel)
-            .filter(SnapshotModel.system_id == system_id)
-            .order_by(SnapshotModel.timestamp.desc())
+        query = self._newest_first(
+            self._query().filter(SnapshotModel.system_id == system_id), after
         )
         if skip > 0:
             query = query.offset(skip)
@@ -52,7 +95,12 @@ class SnapshotRepository(BaseRepository[SnapshotModel]):
         return query.all()
 
     def get_by_system_and_dataset(
-        self, system_id: UUID, dataset: str, skip: int = 0, limit: Optional[int] = None
+        self,
+        system_id: UUID,
+        dataset: str,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        after: Optional[SnapshotCursor] = None,
     ) -> List[SnapshotModel]:
         """
         Get all snapshots for a system and dataset, ordered by timestamp descending.
@@ -62,14 +110,16 @@ class SnapshotRepository(BaseRepository[SnapshotModel]):
             dataset: Dataset name
             skip: Number of records to skip (for pagination)
             limit: Maximum number of records to return (None for all)
+            after: Keyset cursor (timestamp, id) of the last snapshot already returned
 
         Returns:
             List of snapshots matching the system and dataset
         """
-        query = (
-            self.db.query(SnapshotModel)
-            .filter(SnapshotModel.system_id == system_id, SnapshotModel.dataset == dataset)
-            .order_by(SnapshotModel.timestamp.desc())
+        query = self._newest_first(
+            self._query().filter(
+                SnapshotModel.system_id == system_id, SnapshotModel.dataset == dataset
+            ),
+            after,
         )
         if skip > 0:
             query = query.offset(skip)
@@ -77,30 +127,105 @@ class SnapshotRepository(BaseRepository[SnapshotModel]):
             query = query.limit(limit)
         return query.all()
 
+    def get_keys_by_system(self, system_id: UUID) -> List[Tuple[str, str, str]]:
+        """
+        Get the (pool, dataset, name) of every snapshot on a system.
+
+        Returns plain rows instead of ORM entities for callers that only need the keys.
+        """
+        return self.db.execute(
+            select(SnapshotModel.pool, SnapshotModel.dataset, SnapshotModel.name).where(
+                SnapshotModel.system_id == system_id
+            )
+        ).all()
+
+    def get_pool_datasets(self, system_id: UUID) -> List[Tuple[str, str]]:
+        """Get the distinct (pool, dataset) pairs a system has snapshots for."""
+        return self.db.execute(
+            select(SnapshotModel.pool, SnapshotModel.dataset)
+            .where(SnapshotModel.system_id == system_id)
+            .distinct()
+            .order_by(SnapshotModel.pool, SnapshotModel.dataset)
+        ).all()
+
     def get_by_pool_dataset(
         self, pool: str, dataset: str, system_id: Optional[UUID] = None
     ) -> List[SnapshotModel]:
-        """Get snapshots by pool and dataset."""
-        query = self.db.query(SnapshotModel).filter(
-            SnapshotModel.pool == pool, SnapshotModel.dataset == dataset
-        )
+        """
+        Get snapshots by pool and dataset, oldest first.
+
+        With a system_id the (system_id, pool, dataset, timestamp) index returns rows
+        already in timestamp order, so the ordering costs no sort.
+        """
+        query = self._query().filter(SnapshotModel.pool == pool, SnapshotModel.dataset == dataset)
         if system_id:
             query = query.filter(SnapshotModel.system_id == system_id)
-        return query.all()
+        return query.order_by(SnapshotModel.timestamp, SnapshotModel.id).all()
 
-    def get_latest_by_dataset(
-        self, pool: str, dataset: str, system_id: UUID
-    ) -> Optional[SnapshotModel]:
-        """Get the latest snapshot for a dataset."""
+    def get_by_systems(self, system_ids: Iterable[UUID]) -> List[SnapshotModel]:
+        """
+        Get every snapshot belonging to any of the given systems in one query.
+
+        Lets callers scanning a whole sync group group snapshots in memory instead
+        of issuing one query per system and dataset.
+        """
+        system_ids = list(system_ids)
+        if not system_ids:
+            return []
+        return self._query().filter(SnapshotModel.system_id.in_(system_ids)).all()
+
+    def get_by_pool_dataset_for_systems(
+        self, pool: str, dataset: str, system_ids: Iterable[UUID]
+    ) -> List[SnapshotModel]:
+        """
+        Get a pool/dataset's snapshots on several systems in one query, oldest first.
+
+        Replaces calling get_by_pool_dataset once per system; callers group the
+        result by system_id.
+        """
+        system_ids = list(system_ids)
+        if not system_ids:
+            return []
         return (
-            self.db.query(SnapshotModel)
+            self._query()
             .filter(
                 SnapshotModel.pool == pool,
                 SnapshotModel.dataset == dataset,
-                SnapshotModel.system_id == system_id,
+                SnapshotModel.system_id.in_(system_ids),
+            )
+            .order_by(SnapshotModel.timestamp, SnapshotModel.id)
+            .all()
+        )
+
+    def get_datasets(self, system_ids: Iterable[UUID]) -> List[str]:
+        """Get the distinct dataset names any of the given systems has snapshots for."""
+        system_ids = list(system_ids)
+        if not system_ids:
+            return []
+        return list(
+            self.db.scalars(
+                select(SnapshotModel.dataset)
+                .where(SnapshotModel.system_id.in_(system_ids))
+                .distinct()
+                .order_by(SnapshotModel.dataset)
+            )
+        )
+
+    def get_latest_by_dataset(
+        self, pool: str, dataset: str, system_id: UUID
+    ) -> Optional[SnapshotModel]:
+        """Get the latest snapshot for a dataset."""
+        return self._first(
+            lambda_stmt(
+                lambda: select(SnapshotModel)
+                .where(
+                    SnapshotModel.pool == pool,
+                    SnapshotModel.dataset == dataset,
+                    SnapshotModel.system_id == system_id,
+                )
+                .order_by(SnapshotModel.timestamp.desc())
+                .limit(1)
             )
-            .order_by(SnapshotModel.timestamp.desc())
-            .first()
         )
 
     def delete_by_system(self, system_id: UUID) -> int:
@@ -110,16 +235,84 @@ class SnapshotRepository(BaseRepository[SnapshotModel]):
             .filter(SnapshotModel.system_id == system_id)
             .delete(synchronize_session=False)
         )
-        self.db.commit()
+        self.commit()
         return count
 
     def get_by_dataset(self, dataset: str, system_id: Optional[UUID] = None) -> List[SnapshotModel]:
         """Get snapshots by dataset, across all pools."""
-        query = self.db.query(SnapshotModel).filter(SnapshotModel.dataset == dataset)
+        query = self._query().filter(SnapshotModel.dataset == dataset)
         if system_id:
             query = query.filter(SnapshotModel.system_id == system_id)
         return query.all()
 
+    def get_dataset_names(self, dataset: str, system_ids: Iterable[UUID]) -> List[Tuple[UUID, str]]:
+        """
+        Get the distinct (system_id, name) pairs of a dataset's snapshots on several systems.
+
+        One query returning plain rows, for name comparisons that don't need ORM entities.
+        """
+        system_ids = list(system_ids)
+        if not system_ids:
+            return []
+        return self.db.execute(
+            select(SnapshotModel.system_id, SnapshotModel.name)
+            .where(SnapshotModel.dataset == dataset, SnapshotModel.system_id.in_(system_ids))
+            .distinct()
+        ).all()
+
+    def get_dataset_version(
+        self, dataset: str, system_ids: Iterable[UUID]
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Get (row count, newest updated_at) of a dataset's snapshots on several systems.
+
+        A cheap freshness probe: inserting or updating a snapshot moves the newest
+        updated_at, and deleting one lowers the count.
+        """
+        system_ids = list(system_ids)
+        if not system_ids:
+            return 0, None
+        count, updated_at = self.db.execute(
+            select(func.count(), func.max(SnapshotModel.updated_at)).where(
+                SnapshotModel.dataset == dataset, SnapshotModel.system_id.in_(system_ids)
+            )
+        ).one()
+        return count, updated_at
+
+    def get_latest_dataset_rows(
+        self, dataset: str, system_ids: Iterable[UUID]
+    ) -> List[Tuple[UUID, str, datetime, Optional[int]]]:
+        """
+        Get (system_id, name, timestamp, size) of each system's latest snapshot of a dataset.
+
+        The newest row per system is picked in the database, so only one row per
+        system comes back. Systems without snapshots of the dataset are omitted.
+        """
+        system_ids = list(system_ids)
+        if not system_ids:
+            return []
+        ranked = (
+            select(
+                SnapshotModel.system_id,
+                SnapshotModel.name,
+                SnapshotModel.timestamp,
+                SnapshotModel.size,
+                func.row_number()
+                .over(
+                    partition_by=SnapshotModel.system_id,
+                    order_by=(SnapshotModel.timestamp.desc(), SnapshotModel.id.desc()),
+                )
+                .label("rank"),
+            )
+            .where(SnapshotModel.dataset == dataset, SnapshotModel.system_id.in_(system_ids))
+            .subquery()
+        )
+        return self.db.execute(
+            select(ranked.c.system_id, ranked.c.name, ranked.c.timestamp, ranked.c.size).where(
+                ranked.c.rank == 1
+            )
+        ).all()
+
     def delete_snapshots_not_in_set(
         self, system_id: UUID, reported_snapshots: Set[Tuple[str, str, str]]
     ) -> tuple[int, List[Tuple[str, str, str]]]:
@@ -134,26 +327,40 @@ class SnapshotRepository(BaseRepository[SnapshotModel]):
         Returns:
             Tuple of (count of deleted snapshots, list of deleted (pool, dataset, name) tuples)
         """
-        # Get all existing snapshots for this system
-        existing = self.get_by_system(system_id, skip=0, limit=None)  # Get all, no limit
-
-        # Find snapshots to delete (in DB but not in reported set)
-        to_delete = []
-        deleted_keys = []
-        for snapshot in existing:
-            key = (snapshot.pool, snapshot.dataset, snapshot.name)
-            if key not in reported_snapshots:
-                to_delete.append(snapshot.id)
-                deleted_keys.append(key)
-
-        # Delete in bulk
-        if to_delete:
-            count = (
-                self.db.query(SnapshotModel)
-                .filter(SnapshotModel.id.in_(to_delete))
-                .delete(synchronize_session=False)
+        # Stage the reported keys in a temporary table and let the database do the
+        # anti-join, returning the deleted keys from the same statement. The table
+        # is kept for the life of the pooled connection: SQLite creates it outside
+        # the transaction, so a rollback does not drop it. Reuse it and clear out
+        # anything a failed earlier call left behind.
+        conn = self.db.connection()
+        try:
+            _reported_snapshots.create(conn, checkfirst=True)
+            conn.execute(delete(_reported_snapshots))
+            if reported_snapshots:
+                conn.execute(
+                    _reported_snapshots.insert(),
+                    [
+                        {"pool": pool, "dataset": dataset, "name": name}
+                        for pool, dataset, name in reported_snapshots
+                    ],
+                )
+            still_reported = exists().where(
+                _reported_snapshots.c.pool == SnapshotModel.pool,
+                _reported_snapshots.c.dataset == SnapshotModel.dataset,
+                _reported_snapshots.c.name == SnapshotModel.name,
             )
-            self.db.commit()
-            return count, deleted_keys
+            deleted_keys = [
+                (row.pool, row.dataset, row.name)
+                for row in self.db.execute(
+                    delete(SnapshotModel)
+                    .where(SnapshotModel.system_id == system_id, ~still_reported)
+                    .returning(SnapshotModel.pool, SnapshotModel.dataset, SnapshotModel.name)
+                    .execution_options(synchronize_session=False)
+                )
+            ]
+            self.commit()
+        except Exception:
+            self._rollback()
+            raise
 
-        return 0, []
+        return len(deleted_keys), deleted_keys
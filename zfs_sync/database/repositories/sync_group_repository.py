@@ -3,7 +3,9 @@
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, selectinload
 
 from zfs_sync.database.models import SyncGroupModel, SyncGroupSystemModel
 from zfs_sync.database.repositories.base_repository import BaseRepository
@@ -16,29 +18,55 @@ class SyncGroupRepository(BaseRepository[SyncGroupModel]):
         """Initialize sync group repository."""
         super().__init__(SyncGroupModel, db)
 
+    def get(self, id: UUID) -> Optional[SyncGroupModel]:
+        """Get a sync group by ID with its system associations loaded."""
+        return (
+            self._query()
+            .options(selectinload(SyncGroupModel.system_associations))
+            .filter(SyncGroupModel.id == id)
+            .first()
+        )
+
     def get_by_name(self, name: str) -> Optional[SyncGroupModel]:
         """Get a sync group by name."""
-        return self.db.query(SyncGroupModel).filter(SyncGroupModel.name == name).first()
+        return self._query().filter(SyncGroupModel.name == name).first()
 
     def get_enabled(self) -> List[SyncGroupModel]:
         """Get all enabled sync groups."""
-        return self.db.query(SyncGroupModel).filter(SyncGroupModel.enabled).all()
+        return self._query().filter(SyncGroupModel.enabled).all()
 
-    def add_system(self, sync_group_id: UUID, system_id: UUID) -> None:
-        """Add a system to a sync group by creating an association."""
-        # Check if association already exists
-        existing = (
-            self.db.query(SyncGroupSystemModel)
-            .filter(
-                SyncGroupSystemModel.sync_group_id == sync_group_id,
-                SyncGroupSystemModel.system_id == system_id,
-            )
-            .first()
+    def get_all_with_systems(self, skip: int = 0, limit: int = 100) -> List[SyncGroupModel]:
+        """Get sync groups with their system associations loaded in one extra query."""
+        return (
+            self._query()
+            .options(selectinload(SyncGroupModel.system_associations))
+            .offset(skip)
+            .limit(limit)
+            .all()
         )
-        if existing:
-            return  # Already associated
 
-        # Create new association
-        association = SyncGroupSystemModel(sync_group_id=sync_group_id, system_id=system_id)
-        self.db.add(association)
-        self.db.commit()
+    def get_enabled_with_systems(self) -> List[SyncGroupModel]:
+        """Get enabled sync groups with their system associations preloaded."""
+        return (
+            self._query()
+            .options(selectinload(SyncGroupModel.system_associations))
+            .filter(SyncGroupModel.enabled)
+            .all()
+        )
+
+    def add_system(self, sync_group_id: UUID, system_id: UUID) -> None:
+        """
+        Add a system to a sync group by creating an association.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING, so adding an existing member is a
+        no-op and concurrent adds cannot create duplicates.
+        """
+        dialect = self.db.get_bind().dialect.name
+        dialect_insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = (
+            dialect_insert(SyncGroupSystemModel)
+            .values(sync_group_id=sync_group_id, system_id=system_id)
+            .on_conflict_do_nothing(index_elements=["sync_group_id", "system_id"])
+        )
+        self.db.execute(stmt)
+        self.commit()
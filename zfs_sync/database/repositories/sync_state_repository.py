@@ -1,8 +1,11 @@
 """Repository for SyncState operations."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from zfs_sync.database.models import SyncStateModel
@@ -18,18 +21,14 @@ class SyncStateRepository(BaseRepository[SyncStateModel]):
 
     def get_by_sync_group(self, sync_group_id: UUID) -> List[SyncStateModel]:
         """Get all sync states for a sync group."""
-        return (
-            self.db.query(SyncStateModel)
-            .filter(SyncStateModel.sync_group_id == sync_group_id)
-            .all()
-        )
+        return self._query().filter(SyncStateModel.sync_group_id == sync_group_id).all()
 
     def get_by_dataset(
         self, sync_group_id: UUID, dataset: str, system_id: UUID
     ) -> Optional[SyncStateModel]:
         """Get sync state for a specific dataset, sync group, and system."""
         return (
-            self.db.query(SyncStateModel)
+            self._query()
             .filter(
                 SyncStateModel.sync_group_id == sync_group_id,
                 SyncStateModel.dataset == dataset,
@@ -40,8 +39,43 @@ class SyncStateRepository(BaseRepository[SyncStateModel]):
 
     def get_by_system(self, system_id: UUID) -> List[SyncStateModel]:
         """Get all sync states for a system."""
-        return self.db.query(SyncStateModel).filter(SyncStateModel.system_id == system_id).all()
+        return self._query().filter(SyncStateModel.system_id == system_id).all()
 
     def get_by_status(self, status: str) -> List[SyncStateModel]:
         """Get all sync states with a specific status."""
-        return self.db.query(SyncStateModel).filter(SyncStateModel.status == status).all()
+        return self._query().filter(SyncStateModel.status == status).all()
+
+    def bulk_upsert(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert or update many sync states in one statement.
+
+        Each row holds sync_group_id, dataset, system_id, status, last_check,
+        error_message and optionally last_sync. Existing states (matched on group,
+        dataset and system) take the new status, last_check and error_message;
+        last_sync only changes when the row provides one. When several rows target
+        the same state, the last one wins.
+        """
+        latest: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            latest[(row["sync_group_id"], row["dataset"], row["system_id"])] = {
+                "last_sync": None,
+                **row,
+            }
+        if not latest:
+            return
+
+        dialect = self.db.get_bind().dialect.name
+        dialect_insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = dialect_insert(SyncStateModel)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sync_group_id", "dataset", "system_id"],
+            set_={
+                "status": stmt.excluded.status,
+                "last_check": stmt.excluded.last_check,
+                "error_message": stmt.excluded.error_message,
+                "last_sync": func.coalesce(stmt.excluded.last_sync, SyncStateModel.last_sync),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self.db.execute(stmt, list(latest.values()))
+        self.commit()
@@ -1,12 +1,28 @@
 """Repository for System operations."""
 
-from typing import List, Optional
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
 
+from sqlalchemy import delete, exists, lambda_stmt, select, update
 from sqlalchemy.orm import Session
 
-from zfs_sync.database.models import SystemModel
+from zfs_sync.database.models import SnapshotModel, SyncStateModel, SystemModel
 from zfs_sync.database.repositories.base_repository import BaseRepository
 
+# Process-wide api_key -> (expires_at, system id, last_seen write due) cache. Only ids
+# are cached, never ORM objects. touch_last_seen() re-checks an entry against the
+# database at least every LAST_SEEN_WRITE_INTERVAL_SECONDS, and changing or deleting
+# a key through this repository drops its entry straight away
+API_KEY_CACHE_TTL_SECONDS = 60
+API_KEY_CACHE_MAXSIZE = 1024
+LAST_SEEN_WRITE_INTERVAL_SECONDS = 30
+_api_key_cache: "OrderedDict[str, Tuple[float, UUID, float]]" = OrderedDict()
+_api_key_cache_lock = threading.Lock()
+
 
 class SystemRepository(BaseRepository[SystemModel]):
     """Repository for System database operations."""
@@ -17,19 +33,139 @@ class SystemRepository(BaseRepository[SystemModel]):
 
     def get_by_hostname(self, hostname: str) -> Optional[SystemModel]:
         """Get a system by hostname."""
-        return self.db.query(SystemModel).filter(SystemModel.hostname == hostname).first()
+        return self._first(
+            lambda_stmt(lambda: select(SystemModel).where(SystemModel.hostname == hostname))
+        )
 
     def get_by_api_key(self, api_key: str) -> Optional[SystemModel]:
         """Get a system by API key."""
-        return self.db.query(SystemModel).filter(SystemModel.api_key == api_key).first()
+        return self._first(
+            lambda_stmt(lambda: select(SystemModel).where(SystemModel.api_key == api_key))
+        )
+
+    def get_id_by_api_key(self, api_key: str) -> Optional[UUID]:
+        """
+        Get the ID of the system owning an API key, served from a short-lived cache.
+
+        The result may be up to API_KEY_CACHE_TTL_SECONDS stale; confirm it with
+        touch_last_seen() (or a fresh read) before trusting it.
+        """
+        now = time.monotonic()
+        with _api_key_cache_lock:
+            entry = _api_key_cache.get(api_key)
+            if entry is not None and entry[0] > now:
+                _api_key_cache.move_to_end(api_key)
+                return entry[1]
+
+        system_id = self.db.scalar(select(SystemModel.id).where(SystemModel.api_key == api_key))
+        with _api_key_cache_lock:
+            if system_id is None:
+                _api_key_cache.pop(api_key, None)
+            else:
+                _api_key_cache[api_key] = (now + API_KEY_CACHE_TTL_SECONDS, system_id, 0.0)
+                _api_key_cache.move_to_end(api_key)
+                if len(_api_key_cache) > API_KEY_CACHE_MAXSIZE:
+                    _api_key_cache.popitem(last=False)
+        return system_id
+
+    def invalidate_api_key(self, api_key: str) -> None:
+        """Drop an API key from the lookup cache."""
+        with _api_key_cache_lock:
+            _api_key_cache.pop(api_key, None)
+
+    def update(self, id: UUID, **kwargs: Any) -> Optional[SystemModel]:
+        """Update a system, dropping its old API key from the lookup cache if it changes."""
+        if "api_key" in kwargs:
+            system = self.get(id)
+            if system is not None and system.api_key:
+                self.invalidate_api_key(system.api_key)
+        return super().update(id, **kwargs)
+
+    def delete(self, id: UUID) -> bool:
+        """Delete a system, dropping its API key from the lookup cache."""
+        system = self.get(id)
+        if system is not None and system.api_key:
+            self.invalidate_api_key(system.api_key)
+        return super().delete(id)
+
+    def update_by_id(self, id: UUID, **kwargs: Any) -> Optional[SystemModel]:
+        """Update a system in one statement, dropping its old API key from the cache."""
+        if "api_key" in kwargs:
+            self._invalidate_stored_api_key(id)
+        return super().update_by_id(id, **kwargs)
+
+    def delete_by_id(self, id: UUID) -> bool:
+        """
+        Delete a system and its snapshots and sync states without loading them.
+
+        The dependent rows are deleted in the same transaction, standing in for the
+        ORM cascade that delete() would run. The system's API key is dropped from
+        the cache.
+        """
+        self._invalidate_stored_api_key(id)
+        with self.unit_of_work():
+            self.db.execute(delete(SnapshotModel).where(SnapshotModel.system_id == id))
+            self.db.execute(delete(SyncStateModel).where(SyncStateModel.system_id == id))
+            return super().delete_by_id(id)
+
+    def _invalidate_stored_api_key(self, id: UUID) -> None:
+        """Drop the API key currently stored for a system from the lookup cache."""
+        api_key = self.db.scalar(select(SystemModel.api_key).where(SystemModel.id == id))
+        if api_key:
+            self.invalidate_api_key(api_key)
+
+    def touch_last_seen(self, system_id: UUID, api_key: str, seen_at: datetime) -> bool:
+        """
+        Record that a system was seen, provided it still owns the given API key.
+
+        Checking the key in the same UPDATE is what makes cached key lookups safe:
+        a revoked or rotated key matches no row. Writes are coalesced, so a key
+        confirmed less than LAST_SEEN_WRITE_INTERVAL_SECONDS ago returns True
+        without touching the database. Returns True if the key is valid.
+
+        Changing or deleting a key through this repository drops it from this
+        process's cache at once, but the cache is per process: a key revoked by
+        another worker keeps authenticating here for up to
+        LAST_SEEN_WRITE_INTERVAL_SECONDS (30 s).
+        """
+        now = time.monotonic()
+        with _api_key_cache_lock:
+            entry = _api_key_cache.get(api_key)
+            if entry is not None and entry[1] == system_id and entry[2] > now:
+                return True
+
+        stmt = (
+            update(SystemModel)
+            .where(SystemModel.id == system_id, SystemModel.api_key == api_key)
+            .values(last_seen=seen_at)
+            .returning(SystemModel.id)
+        )
+        try:
+            updated = self.db.scalars(stmt).first() is not None
+            self.commit()
+        except Exception:
+            self._rollback()
+            raise
+        if not updated:
+            self.invalidate_api_key(api_key)
+            return False
+        with _api_key_cache_lock:
+            entry = _api_key_cache.get(api_key)
+            if entry is not None and entry[1] == system_id:
+                _api_key_cache[api_key] = (
+                    entry[0],
+                    system_id,
+                    now + LAST_SEEN_WRITE_INTERVAL_SECONDS,
+                )
+        return True
 
     def get_all_online(self) -> List[SystemModel]:
         """Get all online systems."""
-        return self.db.query(SystemModel).filter(SystemModel.connectivity_status == "online").all()
+        return self._query().filter(SystemModel.connectivity_status == "online").all()
 
     def get_by_ssh_hostname(self, ssh_hostname: str) -> Optional[SystemModel]:
         """Get a system by SSH hostname."""
-        return self.db.query(SystemModel).filter(SystemModel.ssh_hostname == ssh_hostname).first()
+        return self._query().filter(SystemModel.ssh_hostname == ssh_hostname).first()
 
     def has_complete_ssh_config(self, system_id: str) -> bool:
         """
@@ -41,7 +177,15 @@ class SystemRepository(BaseRepository[SystemModel]):
         Returns:
             True if system has ssh_hostname configured, False otherwise
         """
-        system = self.get(system_id)
-        if not system:
-            return False
-        return system.ssh_hostname is not None and system.ssh_hostname != ""
+        # Let the database answer with a single boolean instead of loading the row
+        return bool(
+            self.db.scalar(
+                select(
+                    exists().where(
+                        SystemModel.id == system_id,
+                        SystemModel.ssh_hostname.is_not(None),
+                        SystemModel.ssh_hostname != "",
+                    )
+                )
+            )
+        )
@@ -1,17 +1,172 @@
 """Logging configuration for ZFS Sync."""
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from zfs_sync.config import get_settings
 
+# Background listener that owns the file handler; replaced on every reconfiguration
+_listener: Optional[QueueListener] = None
+
+# Set once setup_logging has run, so later calls leave the handlers alone
+_configured = False
+_configured_lock = threading.Lock()
+
+
+def _stop_listener() -> None:
+    """Stop the background log listener, writing out queued records and closing its handlers."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that reuses the formatted timestamp for records in the same second.
+
+    Only valid for date formats without sub-second fields, which is all
+    formatTime() can render anyway.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the formatter with an empty timestamp cache."""
+        super().__init__(*args, **kwargs)
+        # (second, formatted) swapped as one tuple so concurrent handlers never see a torn pair
+        self._cached_time: Tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Format the record's creation time, at most once per second per date format."""
+        if datefmt != self.datefmt or datefmt is None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(datefmt, self.converter(second))
+            self._cached_time = (second, formatted)
+        return formatted
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that writes records in batches.
+
+    Formatted records collect in memory. They are written in one go once
+    flush_bytes have built up, or after at most flush_interval seconds. The
+    rollover size check runs once per batch instead of once per record.
+    """
+
+    def __init__(
+        self,
+        *args,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 0.2,
+        **kwargs,
+    ):
+        """
+        Initialize the handler and start its periodic flush thread.
+
+        Args:
+            flush_bytes: Buffered size that triggers an immediate write
+            flush_interval: Longest time in seconds a record waits in the buffer
+        """
+        super().__init__(*args, **kwargs)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="log-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        """Flush every flush_interval seconds until the handler is closed."""
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer a record, writing the batch out once it is large enough."""
+        try:
+            msg = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        # handle() already holds self.lock around emit()
+        self._buffer.append(msg)
+        self._buffered += len(msg)
+        if self._buffered >= self.flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out buffered records, rolling the file over first if the batch would overflow it."""
+        self.acquire()
+        try:
+            if not self._buffer:
+                return
+            data = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0:
+                self.stream.seek(0, 2)
+                if self.stream.tell() + len(data) >= self.maxBytes:
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+            self.stream.write(data)
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Stop the flush thread and write out anything still buffered."""
+        self._stop_flushing.set()
+        self.acquire()
+        try:
+            self.flush()
+            super().close()
+        finally:
+            self.release()
+
+
+def setup_logging(log_file: Optional[Path] = None, force: bool = False) -> None:
+    """
+    Configure structured logging for the application.
+
+    Only the first call takes effect; later calls return immediately rather
+    than closing and reopening the handlers. Pass force=True to reconfigure.
+    """
+    global _configured
+
+    with _configured_lock:
+        if _configured and not force:
+            return
+        _configure_logging(log_file)
+        _configured = True
+
+
+def _configure_logging(log_file: Optional[Path]) -> None:
+    """Install the root logger's handlers, replacing any existing ones."""
+    global _listener
 
-def setup_logging(log_file: Optional[Path] = None) -> None:
-    """Configure structured logging for the application."""
     settings = get_settings()
+    level = getattr(logging, settings.log_level)
 
     # Create logs directory if it doesn't exist
     # Handle permission errors gracefully (e.g., in test environments)
@@ -27,34 +182,47 @@ def setup_logging(log_file: Optional[Path] = None) -> None:
 
     # Configure root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, settings.log_level))
+    root_logger.setLevel(level)
 
     # Clear existing handlers
     root_logger.handlers.clear()
+    _stop_listener()
+
+    # The format below uses no thread, process or task fields, so skip collecting
+    # them; a format that adds any of them must turn the matching flag back on
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    if hasattr(logging, "logAsyncioTasks"):  # Python 3.12+
+        logging.logAsyncioTasks = False
 
     # Create formatter
-    formatter = logging.Formatter(
+    formatter = CachedTimeFormatter(
         fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, settings.log_level))
+    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
     root_logger.addHandler(console_handler)
 
-    # File handler with rotation
+    # File handler with rotation. Callers only enqueue records; a listener thread
+    # does the write and rollover checks so disk latency stays off the request path
     if use_file_logging and log_file:
         try:
-            file_handler = RotatingFileHandler(
+            file_handler = BufferedRotatingFileHandler(
                 log_file,
                 maxBytes=settings.log_max_bytes,
                 backupCount=settings.log_backup_count,
             )
-            file_handler.setLevel(getattr(logging, settings.log_level))
+            file_handler.setLevel(level)
             file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
+            log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+            _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+            _listener.start()
+            root_logger.addHandler(QueueHandler(log_queue))
         except (PermissionError, OSError) as e:
             # If we can't create or write to the log file (e.g., in test environments),
             # skip file logging but continue with console logging
@@ -69,6 +237,7 @@ def setup_logging(log_file: Optional[Path] = None) -> None:
     # Set levels for third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
 
 
 def get_logger(name: str) -> logging.Logger:
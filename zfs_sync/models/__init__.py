@@ -1,8 +1,8 @@
 """Core data models for ZFS Sync."""
 
-from zfs_sync.models.system import System
+from zfs_sync.models.system import ConnectivityStatus, System
 from zfs_sync.models.snapshot import Snapshot
 from zfs_sync.models.sync_group import SyncGroup
 from zfs_sync.models.sync_state import SyncState, SyncStatus
 
-__all__ = ["System", "Snapshot", "SyncGroup", "SyncState", "SyncStatus"]
+__all__ = ["ConnectivityStatus", "System", "Snapshot", "SyncGroup", "SyncState", "SyncStatus"]
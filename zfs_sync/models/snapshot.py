@@ -1,10 +1,10 @@
 """Snapshot model representing a ZFS snapshot."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Snapshot(BaseModel):
@@ -23,12 +23,14 @@ class Snapshot(BaseModel):
     used: Optional[int] = Field(
         default=None, description="Used space in bytes (space unique to this snapshot)"
     )
-    metadata: dict = Field(default_factory=dict, description="Additional snapshot metadata")
-
-    class Config:
-        """Pydantic configuration."""
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None, description="Additional snapshot metadata"
+    )
 
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174001",
                 "name": "backup-20240115-103000",
@@ -40,4 +42,5 @@ class Snapshot(BaseModel):
                 "referenced": 536870912,
                 "used": 1048576,
             }
-        }
+        },
+    )
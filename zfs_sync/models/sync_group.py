@@ -1,9 +1,9 @@
 """SyncGroup model for grouping systems that should maintain synchronized snapshots."""
 
-from typing import List
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SyncGroup(BaseModel):
@@ -11,8 +11,8 @@ class SyncGroup(BaseModel):
 
     id: UUID = Field(default_factory=uuid4, description="Unique identifier for the sync group")
     name: str = Field(..., description="Name of the sync group")
-    system_ids: List[UUID] = Field(
-        default_factory=list, description="List of system IDs in this sync group"
+    system_ids: Tuple[UUID, ...] = Field(
+        default_factory=tuple, description="List of system IDs in this sync group"
     )
     enabled: bool = Field(
         default=True, description="Whether synchronization is enabled for this group"
@@ -20,12 +20,14 @@ class SyncGroup(BaseModel):
     sync_interval_seconds: int = Field(
         default=3600, description="Interval between sync checks in seconds"
     )
-    metadata: dict = Field(default_factory=dict, description="Additional sync group metadata")
-
-    class Config:
-        """Pydantic configuration."""
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None, description="Additional sync group metadata"
+    )
 
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174002",
                 "name": "production-backup-group",
@@ -36,4 +38,5 @@ class SyncGroup(BaseModel):
                 "enabled": True,
                 "sync_interval_seconds": 3600,
             }
-        }
+        },
+    )
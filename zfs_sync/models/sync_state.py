@@ -2,10 +2,10 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SyncStatus(str, Enum):
@@ -24,7 +24,7 @@ class SyncState(BaseModel):
     id: UUID = Field(default_factory=uuid4, description="Unique identifier for the sync state")
     sync_group_id: UUID = Field(..., description="ID of the sync group this state belongs to")
     snapshot_id: UUID = Field(..., description="ID of the snapshot being tracked")
-    system_ids: List[UUID] = Field(
+    system_ids: Tuple[UUID, ...] = Field(
         ..., description="List of system IDs that should have this snapshot"
     )
     status: SyncStatus = Field(default=SyncStatus.OUT_OF_SYNC, description="Current sync status")
@@ -33,12 +33,14 @@ class SyncState(BaseModel):
     )
     last_check: Optional[datetime] = Field(default=None, description="Timestamp of last sync check")
     error_message: Optional[str] = Field(default=None, description="Error message if sync failed")
-    metadata: dict = Field(default_factory=dict, description="Additional sync state metadata")
-
-    class Config:
-        """Pydantic configuration."""
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None, description="Additional sync state metadata"
+    )
 
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174003",
                 "sync_group_id": "123e4567-e89b-12d3-a456-426614174002",
@@ -51,4 +53,5 @@ class SyncState(BaseModel):
                 "last_sync": "2024-01-15T10:30:00Z",
                 "last_check": "2024-01-15T11:30:00Z",
             }
-        }
+        },
+    )
@@ -1,10 +1,19 @@
 """System model representing a ZFS system."""
 
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Any, Dict, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ConnectivityStatus(str, Enum):
+    """Connectivity status of a system."""
+
+    ONLINE = "online"
+    OFFLINE = "offline"
+    UNKNOWN = "unknown"
 
 
 class System(BaseModel):
@@ -13,8 +22,9 @@ class System(BaseModel):
     id: UUID = Field(default_factory=uuid4, description="Unique identifier for the system")
     hostname: str = Field(..., description="Hostname of the system")
     platform: str = Field(..., description="Operating system platform (e.g., 'linux', 'freebsd')")
-    connectivity_status: str = Field(
-        default="unknown", description="Current connectivity status (online, offline, unknown)"
+    connectivity_status: ConnectivityStatus = Field(
+        default=ConnectivityStatus.UNKNOWN,
+        description="Current connectivity status (online, offline, unknown)",
     )
     ssh_hostname: Optional[str] = Field(
         None, description="SSH hostname/IP (can differ from API hostname)"
@@ -25,12 +35,14 @@ class System(BaseModel):
         default=None, description="Timestamp of last successful communication"
     )
     api_key: Optional[str] = Field(default=None, description="API key for authentication")
-    metadata: dict = Field(default_factory=dict, description="Additional system metadata")
-
-    class Config:
-        """Pydantic configuration."""
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None, description="Additional system metadata"
+    )
 
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174000",
                 "hostname": "zfs-server-01",
@@ -39,4 +51,5 @@ class System(BaseModel):
                 "last_seen": "2024-01-15T10:30:00Z",
                 "metadata": {"pool_count": 3, "zfs_version": "2.1.0"},
             }
-        }
+        },
+    )
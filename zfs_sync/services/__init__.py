@@ -1,13 +1,28 @@
 """Business logic services."""
 
-from zfs_sync.services.conflict_resolution import (
-    ConflictResolutionService,
-    ConflictResolutionStrategy,
-    ConflictType,
-)
-from zfs_sync.services.snapshot_comparison import SnapshotComparisonService
-from zfs_sync.services.snapshot_history import SnapshotHistoryService
-from zfs_sync.services.sync_coordination import SyncCoordinationService
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from zfs_sync.services.conflict_resolution import (
+        ConflictResolutionService,
+        ConflictResolutionStrategy,
+        ConflictType,
+    )
+    from zfs_sync.services.snapshot_comparison import SnapshotComparisonService
+    from zfs_sync.services.snapshot_history import SnapshotHistoryService
+    from zfs_sync.services.sync_coordination import SyncCoordinationService
+
+# Re-exports are imported on first access (PEP 562), so importing one service
+# module doesn't pull in every other service's dependencies
+_EXPORTS = {
+    "SnapshotComparisonService": "snapshot_comparison",
+    "SnapshotHistoryService": "snapshot_history",
+    "SyncCoordinationService": "sync_coordination",
+    "ConflictResolutionService": "conflict_resolution",
+    "ConflictResolutionStrategy": "conflict_resolution",
+    "ConflictType": "conflict_resolution",
+}
 
 __all__ = [
     "SnapshotComparisonService",
@@ -17,3 +32,19 @@ __all__ = [
     "ConflictResolutionStrategy",
     "ConflictType",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a re-exported service on first access and cache it on the package."""
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """Include the lazily imported re-exports in dir()."""
+    return sorted(set(globals()) | set(__all__))
@@ -39,7 +39,7 @@ class AuthService:
 
         api_key = self.generate_api_key()
         self.system_repo.update(system_id, api_key=api_key)
-        logger.info(f"Generated API key for system {system_id}")
+        logger.info("Generated API key for system %s", system_id)
         return api_key
 
     def validate_api_key(self, api_key: str) -> Optional[UUID]:
@@ -52,13 +52,22 @@ class AuthService:
         if not api_key:
             return None
 
-        system = self.system_repo.get_by_api_key(api_key)
-        if system:
-            # Update last_seen timestamp
-            from datetime import datetime, timezone
+        system_id = self.system_repo.get_id_by_api_key(api_key)
+        if system_id is None:
+            return None
+
+        # Update last_seen timestamp; this also confirms the (possibly cached) key
+        from datetime import datetime, timezone
+
+        if self.system_repo.touch_last_seen(system_id, api_key, datetime.now(timezone.utc)):
+            return system_id
 
-            self.system_repo.update(system.id, last_seen=datetime.now(timezone.utc))
-            return system.id
+        # The cached key was revoked or rotated; fall back to a fresh lookup
+        system_id = self.system_repo.get_id_by_api_key(api_key)
+        if system_id is not None and self.system_repo.touch_last_seen(
+            system_id, api_key, datetime.now(timezone.utc)
+        ):
+            return system_id
         return None
 
     def revoke_api_key(self, system_id: UUID) -> None:
@@ -71,10 +80,10 @@ class AuthService:
             )
 
         self.system_repo.update(system_id, api_key=None)
-        logger.info(f"Revoked API key for system {system_id}")
+        logger.info("Revoked API key for system %s", system_id)
 
     def rotate_api_key(self, system_id: UUID) -> str:
         """Rotate (generate new) API key for a system."""
         new_key = self.create_api_key_for_system(system_id)
-        logger.info(f"Rotated API key for system {system_id}")
+        logger.info("Rotated API key for system %s", system_id)
         return new_key
@@ -1,8 +1,13 @@
 """Service for detecting and resolving snapshot conflicts."""
 
+import sys
+from bisect import bisect_left
+from collections import Counter
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -15,11 +20,39 @@ from zfs_sync.database.repositories import (
 )
 from zfs_sync.logging_config import get_logger
 from zfs_sync.models import SyncStatus
-from zfs_sync.services.snapshot_comparison import SnapshotComparisonService
+from zfs_sync.services.snapshot_comparison import (
+    SnapshotComparisonService,
+    extract_snapshot_name,
+)
 
 logger = get_logger(__name__)
 
 
+# Sort key for conflict systems whose timestamp is missing or unparsable
+_EARLIEST = datetime.min.replace(tzinfo=timezone.utc)
+
+if sys.version_info >= (3, 11):
+    _fromisoformat = datetime.fromisoformat
+else:
+
+    def _fromisoformat(timestamp_str: str) -> datetime:
+        # datetime.fromisoformat() only accepts a "Z" UTC suffix from Python 3.11
+        return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(timestamp_str: str) -> datetime:
+    """
+    Parse an ISO timestamp from a conflict payload, or return _EARLIEST.
+
+    Memoized: conflicts over the same snapshots repeat the same timestamps.
+    """
+    try:
+        return _fromisoformat(timestamp_str)
+    except ValueError:
+        return _EARLIEST
+
+
 class ConflictType(str, Enum):
     """Types of conflicts that can occur."""
 
@@ -41,6 +74,37 @@ class ConflictResolutionStrategy(str, Enum):
     USE_MAJORITY = "use_majority"  # Use snapshot present on most systems
 
 
+class _PrefixIndex:
+    """
+    Earliest snapshot timestamp per system, keyed by snapshot name prefix.
+
+    The prefix is the part of a normalized snapshot name before its first "-".
+    """
+
+    def __init__(self, names_and_snapshots: List[Tuple[str, SnapshotModel]]):
+        self._earliest: Dict[str, Dict[UUID, datetime]] = {}
+        for name, snapshot in names_and_snapshots:
+            by_system = self._earliest.setdefault(name.partition("-")[0], {})
+            earliest = by_system.get(snapshot.system_id)
+            if earliest is None or snapshot.timestamp < earliest:
+                by_system[snapshot.system_id] = snapshot.timestamp
+        self._prefixes = sorted(self._earliest)
+
+    def has_older(self, name: str, exclude_system_id: UUID, before: datetime) -> bool:
+        """Whether another system has an older snapshot whose name starts with name's prefix."""
+        prefix = name.partition("-")[0]
+        # A name starts with a "-"-free prefix exactly when its own prefix does,
+        # and those prefixes form one contiguous run in sorted order
+        for i in range(bisect_left(self._prefixes, prefix), len(self._prefixes)):
+            other_prefix = self._prefixes[i]
+            if not other_prefix.startswith(prefix):
+                break
+            for system_id, earliest in self._earliest[other_prefix].items():
+                if system_id != exclude_system_id and earliest < before:
+                    return True
+        return False
+
+
 class ConflictResolutionService:
     """Service for detecting and resolving snapshot conflicts."""
 
@@ -53,15 +117,19 @@ class ConflictResolutionService:
         self.comparison_service = SnapshotComparisonService(db)
 
     def detect_conflicts(
-        self, sync_group_id: UUID, pool: str, dataset: str
+        self,
+        sync_group_id: UUID,
+        pool: str,
+        dataset: str,
+        detected_at: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Detect conflicts for a specific dataset in a sync group.
 
+        detected_at is the ISO timestamp stamped on every conflict; it defaults to now.
+
         Returns a list of detected conflicts with details.
         """
-        logger.info(f"Detecting conflicts for {pool}/{dataset} in sync group {sync_group_id}")
-
         sync_group = self.sync_group_repo.get(sync_group_id)
         if not sync_group:
             raise ValueError(
@@ -74,159 +142,134 @@ class ConflictResolutionService:
         if len(system_ids) < 2:
             return []  # No conflicts possible with less than 2 systems
 
-        conflicts = []
+        # Get all snapshots for this dataset across systems in one query
+        all_snapshots: Dict[UUID, List[SnapshotModel]] = {system_id: [] for system_id in system_ids}
+        for snapshot in self.snapshot_repo.get_by_pool_dataset_for_systems(
+            pool, dataset, system_ids
+        ):
+            all_snapshots[snapshot.system_id].append(snapshot)
 
-        # Get all snapshots for this dataset across systems
-        all_snapshots: Dict[UUID, List[SnapshotModel]] = {}
-        for system_id in system_ids:
-            snapshots = self.snapshot_repo.get_by_pool_dataset(
-                pool=pool, dataset=dataset, system_id=system_id
-            )
-            all_snapshots[system_id] = snapshots
+        return list(
+            self._iter_dataset_conflicts(sync_group_id, pool, dataset, all_snapshots, detected_at)
+        )
 
-        # Extract snapshot names (normalized)
-        snapshot_names_by_system: Dict[UUID, Dict[str, SnapshotModel]] = {}
+    def _iter_dataset_conflicts(
+        self,
+        sync_group_id: UUID,
+        pool: str,
+        dataset: str,
+        all_snapshots: Dict[UUID, List[SnapshotModel]],
+        detected_at: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield conflicts in one dataset from snapshots already grouped by system.
+
+        all_snapshots maps every system in the sync group to its snapshots of the dataset.
+        """
+        logger.info(f"Detecting conflicts for {pool}/{dataset} in sync group {sync_group_id}")
+
+        # Extract snapshot names (normalized) once; the orphan and ancestor
+        # checks below look them up by snapshot id
+        name_by_snapshot_id: Dict[UUID, str] = {}
+        # Normalized name -> the snapshot carrying it on each system that has it
+        snapshots_by_name: Dict[str, Dict[UUID, SnapshotModel]] = {}
         for system_id, snapshots in all_snapshots.items():
-            names_dict = {}
             for snapshot in snapshots:
-                name = self.comparison_service.extract_snapshot_name(snapshot.name)
-                names_dict[name] = snapshot
-            snapshot_names_by_system[system_id] = names_dict
+                name = extract_snapshot_name(snapshot.name)
+                name_by_snapshot_id[snapshot.id] = name
+                snapshots_by_name.setdefault(name, {})[system_id] = snapshot
 
-        # Find all unique snapshot names
-        all_names = set()
-        for names_dict in snapshot_names_by_system.values():
-            all_names.update(names_dict.keys())
+        group_id = str(sync_group_id)
+        if detected_at is None:
+            detected_at = datetime.now(timezone.utc).isoformat()
 
         # Check for conflicts
-        for snapshot_name in all_names:
-            # Find which systems have this snapshot
-            systems_with_snapshot = [
-                sid
-                for sid, names_dict in snapshot_names_by_system.items()
-                if snapshot_name in names_dict
-            ]
-
-            if len(systems_with_snapshot) == 0:
+        for snapshot_name, snapshots_by_system in snapshots_by_name.items():
+            # Gather timestamps, sizes and ids in a single pass over the systems
+            unique_timestamps = set()
+            unique_sizes = set()
+            snapshot_ids = set()
+            for snap in snapshots_by_system.values():
+                unique_timestamps.add(snap.timestamp)
+                if snap.size:
+                    unique_sizes.add(snap.size)
+                snapshot_ids.add(snap.id)
+
+            # Timestamp mismatch: same name, different timestamps
+            timestamp_mismatch = len(unique_timestamps) > 1
+            # Size mismatch: same name, different (known) sizes
+            size_mismatch = len(unique_sizes) > 1
+            # Divergent snapshots (same name, different content) are detected when
+            # the same snapshot name has different snapshot IDs across systems
+            divergent = len(snapshot_ids) > 1
+
+            if not (timestamp_mismatch or size_mismatch or divergent):
                 continue
 
-            # Get snapshot details from each system
-            snapshots_by_system = {
-                sid: snapshot_names_by_system[sid][snapshot_name] for sid in systems_with_snapshot
+            # Every conflict for this name reports the same systems; build the
+            # payload once and share it (conflict records are treated as read-only)
+            systems_payload = {
+                str(sid): {
+                    "timestamp": snap.timestamp.isoformat(),
+                    "size": snap.size,
+                    "snapshot_id": str(snap.id),
+                }
+                for sid, snap in snapshots_by_system.items()
             }
-
-            # Check for timestamp mismatches
-            timestamps = {sid: snap.timestamp for sid, snap in snapshots_by_system.items()}
-            unique_timestamps = set(timestamps.values())
-            if len(unique_timestamps) > 1:
-                conflicts.append(
-                    {
-                        "type": ConflictType.TIMESTAMP_MISMATCH.value,
+            for conflict_type, severity, detected in (
+                (ConflictType.TIMESTAMP_MISMATCH, "medium", timestamp_mismatch),
+                (ConflictType.SIZE_MISMATCH, "low", size_mismatch),
+                (ConflictType.DIVERGENT_SNAPSHOTS, "high", divergent),
+            ):
+                if detected:
+                    yield {
+                        "type": conflict_type.value,
                         "snapshot_name": snapshot_name,
                         "pool": pool,
                         "dataset": dataset,
-                        "sync_group_id": str(sync_group_id),
-                        "systems": {
-                            str(sid): {
-                                "timestamp": snap.timestamp.isoformat(),
-                                "size": snap.size,
-                                "snapshot_id": str(snap.id),
-                            }
-                            for sid, snap in snapshots_by_system.items()
-                        },
-                        "severity": "medium",
-                        "detected_at": datetime.now(timezone.utc).isoformat(),
+                        "sync_group_id": group_id,
+                        "systems": systems_payload,
+                        "severity": severity,
+                        "detected_at": detected_at,
                     }
-                )
-
-            # Check for size mismatches
-            sizes = {sid: snap.size for sid, snap in snapshots_by_system.items() if snap.size}
-            if len(sizes) > 1:
-                unique_sizes = set(sizes.values())
-                if len(unique_sizes) > 1:
-                    conflicts.append(
-                        {
-                            "type": ConflictType.SIZE_MISMATCH.value,
-                            "snapshot_name": snapshot_name,
-                            "pool": pool,
-                            "dataset": dataset,
-                            "sync_group_id": str(sync_group_id),
-                            "systems": {
-                                str(sid): {
-                                    "timestamp": snap.timestamp.isoformat(),
-                                    "size": snap.size,
-                                    "snapshot_id": str(snap.id),
-                                }
-                                for sid, snap in snapshots_by_system.items()
-                            },
-                            "severity": "low",
-                            "detected_at": datetime.now(timezone.utc).isoformat(),
-                        }
-                    )
-
-            # Check for divergent snapshots (same name, different content)
-            # This is detected when we have the same snapshot name but different
-            # snapshot IDs across systems
-            snapshot_ids = {str(snap.id) for snap in snapshots_by_system.values()}
-            if len(snapshot_ids) > 1:
-                conflicts.append(
-                    {
-                        "type": ConflictType.DIVERGENT_SNAPSHOTS.value,
-                        "snapshot_name": snapshot_name,
-                        "pool": pool,
-                        "dataset": dataset,
-                        "sync_group_id": str(sync_group_id),
-                        "systems": {
-                            str(sid): {
-                                "timestamp": snap.timestamp.isoformat(),
-                                "size": snap.size,
-                                "snapshot_id": str(snap.id),
-                            }
-                            for sid, snap in snapshots_by_system.items()
-                        },
-                        "severity": "high",
-                        "detected_at": datetime.now(timezone.utc).isoformat(),
-                    }
-                )
 
         # Check for missing base snapshots (orphaned snapshots)
+        prefix_index = _PrefixIndex(
+            [
+                (name_by_snapshot_id[snapshot.id], snapshot)
+                for snapshots in all_snapshots.values()
+                for snapshot in snapshots
+            ]
+        )
         for system_id, snapshots in all_snapshots.items():
             for snapshot in snapshots:
-                snapshot_name = self.comparison_service.extract_snapshot_name(snapshot.name)
+                snapshot_name = name_by_snapshot_id[snapshot.id]
                 # Check if this snapshot exists on other systems
-                other_systems_have = any(
-                    snapshot_name in snapshot_names_by_system.get(other_id, {})
-                    for other_id in system_ids
-                    if other_id != system_id
-                )
+                other_systems_have = len(snapshots_by_name[snapshot_name]) > 1
 
                 if not other_systems_have:
                     # Check if there's a common ancestor
                     has_ancestor = self._has_common_ancestor(
-                        snapshot, all_snapshots, system_ids, system_id
+                        snapshot, snapshot_name, system_id, prefix_index
                     )
 
                     if not has_ancestor:
-                        conflicts.append(
-                            {
-                                "type": ConflictType.ORPHANED_SNAPSHOT.value,
-                                "snapshot_name": snapshot_name,
-                                "pool": pool,
-                                "dataset": dataset,
-                                "sync_group_id": str(sync_group_id),
-                                "systems": {
-                                    str(system_id): {
-                                        "timestamp": snapshot.timestamp.isoformat(),
-                                        "size": snapshot.size,
-                                        "snapshot_id": str(snapshot.id),
-                                    }
-                                },
-                                "severity": "medium",
-                                "detected_at": datetime.now(timezone.utc).isoformat(),
-                            }
-                        )
-
-        return conflicts
+                        yield {
+                            "type": ConflictType.ORPHANED_SNAPSHOT.value,
+                            "snapshot_name": snapshot_name,
+                            "pool": pool,
+                            "dataset": dataset,
+                            "sync_group_id": group_id,
+                            "systems": {
+                                str(system_id): {
+                                    "timestamp": snapshot.timestamp.isoformat(),
+                                    "size": snapshot.size,
+                                    "snapshot_id": str(snapshot.id),
+                                }
+                            },
+                            "severity": "medium",
+                            "detected_at": detected_at,
+                        }
 
     def resolve_conflict(
         self,
@@ -274,20 +317,9 @@ class ConflictResolutionService:
 
         if strategy == ConflictResolutionStrategy.USE_NEWEST:
             # Find system with newest timestamp
-            # Parse ISO timestamp strings to datetime objects for proper comparison
-            def get_timestamp(system_data: Dict[str, Any]) -> datetime:
-                timestamp_str = system_data.get("timestamp", "")
-                if isinstance(timestamp_str, str):
-                    try:
-                        return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                    except (ValueError, AttributeError):
-                        # Fallback to epoch if parsing fails
-                        return datetime.min.replace(tzinfo=timezone.utc)
-                return datetime.min.replace(tzinfo=timezone.utc)
-
             newest_system = max(
                 systems.items(),
-                key=lambda x: get_timestamp(x[1]),
+                key=lambda x: self._system_timestamp(x[1]),
             )
             return self._create_resolution_action(conflict, newest_system[0], "use_newest")
 
@@ -300,10 +332,19 @@ class ConflictResolutionService:
             return self._create_resolution_action(conflict, largest_system[0], "use_largest")
 
         if strategy == ConflictResolutionStrategy.USE_MAJORITY:
-            # Use the snapshot that appears on most systems
-            # For now, use the first system (would need more complex logic for true majority)
-            first_system = list(systems.keys())[0]
-            return self._create_resolution_action(conflict, first_system, "use_majority")
+            # Use the snapshot that appears on most systems; ties go to the newest.
+            # snapshot_id is each system's own row id, so systems vote on content
+            content = {
+                sid: (self._system_timestamp(info), info.get("size"))
+                for sid, info in systems.items()
+            }
+            votes = Counter(content.values())
+            most_votes = max(votes.values())
+            majority_system = max(
+                (sid for sid in systems if votes[content[sid]] == most_votes),
+                key=lambda sid: content[sid][0],
+            )
+            return self._create_resolution_action(conflict, majority_system, "use_majority")
 
         if strategy == ConflictResolutionStrategy.AUTO_RESOLVE:
             # Default auto-resolve: use newest
@@ -314,6 +355,14 @@ class ConflictResolutionService:
             "message": f"Unknown strategy: {strategy}",
         }
 
+    @staticmethod
+    def _system_timestamp(system_data: Dict[str, Any]) -> datetime:
+        """Parse a conflict system's ISO timestamp, falling back to the earliest datetime."""
+        timestamp_str = system_data.get("timestamp", "")
+        if isinstance(timestamp_str, str):
+            return _parse_timestamp(timestamp_str)
+        return _EARLIEST
+
     def _create_resolution_action(
         self, conflict: Dict, source_system_id: str, reason: str
     ) -> Dict[str, Any]:
@@ -347,33 +396,26 @@ class ConflictResolutionService:
     def _has_common_ancestor(
         self,
         snapshot: SnapshotModel,
-        all_snapshots: Dict[UUID, List[SnapshotModel]],
-        system_ids: List[UUID],
+        snapshot_name: str,
         current_system_id: UUID,
+        prefix_index: _PrefixIndex,
     ) -> bool:
         """Check if a snapshot has a common ancestor on other systems."""
         # Simplified: check if there's an older snapshot with same name pattern
         # In a real implementation, this would check ZFS snapshot relationships
-        snapshot_name = self.comparison_service.extract_snapshot_name(snapshot.name)
-
-        for other_system_id in system_ids:
-            if other_system_id == current_system_id:
-                continue
-
-            other_snapshots = all_snapshots.get(other_system_id, [])
-            for other_snap in other_snapshots:
-                other_name = self.comparison_service.extract_snapshot_name(other_snap.name)
-                # Check if there's a snapshot with similar name pattern (simplified check)
-                if other_name.startswith(
-                    snapshot_name.split("-")[0] if "-" in snapshot_name else snapshot_name
-                ):
-                    if other_snap.timestamp < snapshot.timestamp:
-                        return True
-
-        return False
+        return prefix_index.has_older(snapshot_name, current_system_id, snapshot.timestamp)
 
     def get_all_conflicts(self, sync_group_id: UUID) -> List[Dict[str, Any]]:
         """Get all conflicts for a sync group across all datasets."""
+        return list(self.iter_all_conflicts(sync_group_id))
+
+    def iter_all_conflicts(self, sync_group_id: UUID) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all conflicts for a sync group, one dataset at a time.
+
+        The sync group is checked and its snapshots loaded up front, so a missing
+        group raises ValueError here; conflicts are then detected as they are consumed.
+        """
         sync_group = self.sync_group_repo.get(sync_group_id)
         if not sync_group:
             raise ValueError(
@@ -381,21 +423,26 @@ class ConflictResolutionService:
                 f"Cannot detect conflicts for non-existent sync group."
             )
 
-        # Get all unique datasets from snapshots in this sync group
         system_ids = [assoc.system_id for assoc in sync_group.system_associations]
-        datasets = set()
-
-        for system_id in system_ids:
-            snapshots = self.snapshot_repo.get_by_system(system_id)
-            for snapshot in snapshots:
-                datasets.add((snapshot.pool, snapshot.dataset))
-
-        all_conflicts = []
-        for pool, dataset in datasets:
-            conflicts = self.detect_conflicts(sync_group_id, pool, dataset)
-            all_conflicts.extend(conflicts)
-
-        return all_conflicts
+        if len(system_ids) < 2:
+            return iter(())  # No conflicts possible with less than 2 systems
+
+        # Load the whole group's snapshots in one query and group them by
+        # (pool, dataset) and system, rather than querying per system and dataset
+        snapshots_by_dataset: Dict[Tuple[str, str], Dict[UUID, List[SnapshotModel]]] = {}
+        for snapshot in self.snapshot_repo.get_by_systems(system_ids):
+            by_system = snapshots_by_dataset.get((snapshot.pool, snapshot.dataset))
+            if by_system is None:
+                by_system = {system_id: [] for system_id in system_ids}
+                snapshots_by_dataset[(snapshot.pool, snapshot.dataset)] = by_system
+            by_system[snapshot.system_id].append(snapshot)
+
+        # One detection timestamp for the whole scan
+        detected_at = datetime.now(timezone.utc).isoformat()
+        return chain.from_iterable(
+            self._iter_dataset_conflicts(sync_group_id, pool, dataset, all_snapshots, detected_at)
+            for (pool, dataset), all_snapshots in sorted(snapshots_by_dataset.items())
+        )
 
     def mark_conflict_resolved(
         self,
@@ -413,38 +460,38 @@ class ConflictResolutionService:
         conflict = resolution.get("conflict", {})
         actions = resolution.get("actions", [])
 
-        # Update sync states for affected systems
-        from zfs_sync.services.sync_coordination import SyncCoordinationService
-
-        sync_service = SyncCoordinationService(self.db)
-
         # Mark all systems involved in the conflict
         systems_involved = conflict.get("systems", {})
         sync_group_id = UUID(conflict.get("sync_group_id"))
         dataset = conflict.get("dataset")
+        target_system_ids = {UUID(action["target_system_id"]) for action in actions}
+        now = datetime.now(timezone.utc)
 
+        # Update sync states for affected systems in one upsert
+        rows = []
         for system_id_str in systems_involved.keys():
             system_id = UUID(system_id_str)
 
             # Update sync state to reflect conflict resolution
             if actions:
                 # If there are actions, mark target systems as syncing
-                target_system_ids = [UUID(action["target_system_id"]) for action in actions]
-                if system_id in target_system_ids:
-                    sync_service.update_sync_state(
-                        sync_group_id=sync_group_id,
-                        dataset=dataset,
-                        system_id=system_id,
-                        status=SyncStatus.SYNCING,  # Will be updated to IN_SYNC after actual sync
-                    )
+                if system_id not in target_system_ids:
+                    continue
+                status = SyncStatus.SYNCING  # Will be updated to IN_SYNC after actual sync
             else:
                 # If no actions, mark as resolved (conflict acknowledged)
-                sync_service.update_sync_state(
-                    sync_group_id=sync_group_id,
-                    dataset=dataset,
-                    system_id=system_id,
-                    status=SyncStatus.OUT_OF_SYNC,  # Reset to out_of_sync for re-evaluation
-                )
+                status = SyncStatus.OUT_OF_SYNC  # Reset to out_of_sync for re-evaluation
+            rows.append(
+                {
+                    "sync_group_id": sync_group_id,
+                    "dataset": dataset,
+                    "system_id": system_id,
+                    "status": status.value,
+                    "last_check": now,
+                    "error_message": None,
+                }
+            )
+        self.sync_state_repo.bulk_upsert(rows)
 
         return {
             "conflict_id": conflict_id,
@@ -455,29 +502,27 @@ class ConflictResolutionService:
         }
 
     def mark_conflicts_in_sync_states(
-        self, sync_group_id: UUID, conflicts: List[Dict[str, Any]]
+        self, sync_group_id: UUID, conflicts: Iterable[Dict[str, Any]]
     ) -> None:
         """
         Mark sync states as having conflicts when conflicts are detected.
 
         This updates the sync state status to CONFLICT for affected snapshots.
         """
-        from zfs_sync.services.sync_coordination import SyncCoordinationService
-
-        sync_service = SyncCoordinationService(self.db)
-
-        for conflict in conflicts:
-            systems = conflict.get("systems", {})
-            dataset = conflict.get("dataset")
-            sync_group_id = UUID(conflict.get("sync_group_id"))
-
-            for system_id_str in systems.keys():
-                system_id = UUID(system_id_str)
-
-                sync_service.update_sync_state(
-                    sync_group_id=sync_group_id,
-                    dataset=dataset,
-                    system_id=system_id,
-                    status=SyncStatus.CONFLICT,
-                    error_message=f"Conflict detected: {conflict.get('type')}",
-                )
+        now = datetime.now(timezone.utc)
+        # One upsert for every (conflict, system) pair; when a state appears in
+        # several conflicts the last one's message wins, as with sequential updates
+        self.sync_state_repo.bulk_upsert(
+            [
+                {
+                    "sync_group_id": UUID(conflict.get("sync_group_id")),
+                    "dataset": conflict.get("dataset"),
+                    "system_id": UUID(system_id_str),
+                    "status": SyncStatus.CONFLICT.value,
+                    "last_check": now,
+                    "error_message": f"Conflict detected: {conflict.get('type')}",
+                }
+                for conflict in conflicts
+                for system_id_str in conflict.get("systems", {}).keys()
+            ]
+        )
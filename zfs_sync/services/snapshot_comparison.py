@@ -1,17 +1,67 @@
 """Service for comparing snapshot states across systems."""
 
+import copy
+import threading
+import time
+from collections import Counter, OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Set
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
-from zfs_sync.database.models import SnapshotModel
 from zfs_sync.database.repositories import SnapshotRepository
 from zfs_sync.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Process-wide (dataset, system ids) -> (expires_at, version, result) cache of
+# compare_snapshots_by_dataset. An entry is only served while the dataset's snapshot
+# version (row count, newest updated_at) is unchanged, so writes invalidate it on
+# the next call; the TTL bounds how long an unused entry is kept
+COMPARISON_CACHE_TTL_SECONDS = 30
+COMPARISON_CACHE_MAXSIZE = 512
+_ComparisonKey = Tuple[str, FrozenSet[UUID]]
+_ComparisonVersion = Tuple[int, Optional[datetime]]
+_comparison_cache: (
+    "OrderedDict[_ComparisonKey, Tuple[float, _ComparisonVersion, Dict[str, Any]]]"
+) = OrderedDict()
+_comparison_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8192)
+def extract_snapshot_name(full_name: str) -> str:
+    """
+    Extract snapshot name from full ZFS snapshot path.
+
+    Example: "tank/data@snapshot-20240115" -> "snapshot-20240115"
+
+    Memoized: the same names are normalized over and over while comparing
+    systems, and the result depends only on the input string. rpartition also
+    returns names without an "@" unchanged, without building a list.
+    """
+    return full_name.rpartition("@")[2]
+
+
+def _progressive_intersection(sets: Iterable[Set[str]]) -> Set[str]:
+    """
+    Intersect sets smallest first, stopping as soon as the result is empty.
+
+    With very uneven systems (a new replica holding a handful of snapshots next
+    to ones holding thousands) the result never grows past the smallest set, and
+    no further sets are touched once nothing is common.
+    """
+    ordered = sorted(sets, key=len)
+    if not ordered:
+        return set()
+    result = set(ordered[0])
+    for names in ordered[1:]:
+        if not result:
+            break
+        result &= names
+    return result
+
 
 class SnapshotComparisonService:
     """Service for comparing and analyzing snapshot states."""
@@ -21,6 +71,19 @@ class SnapshotComparisonService:
         self.db = db
         self.snapshot_repo = SnapshotRepository(db)
 
+    def _load_dataset_names(self, dataset: str, system_ids: List[UUID]) -> Dict[UUID, Set[str]]:
+        """
+        Load each system's normalized snapshot names for a dataset.
+
+        Fetches only (system, name) pairs for every system in one query; names are
+        normalized by removing the pool/dataset prefix. Every system in system_ids
+        gets a (possibly empty) name set.
+        """
+        system_snapshot_names: Dict[UUID, Set[str]] = {system_id: set() for system_id in system_ids}
+        for system_id, name in self.snapshot_repo.get_dataset_names(dataset, system_ids):
+            system_snapshot_names[system_id].add(extract_snapshot_name(name))
+        return system_snapshot_names
+
     def compare_snapshots_by_dataset(self, dataset: str, system_ids: List[UUID]) -> Dict[str, Any]:
         """
         Compare snapshots for a specific dataset across multiple systems.
@@ -31,23 +94,39 @@ class SnapshotComparisonService:
             - unique_snapshots: Dict mapping system_id to unique snapshot names
             - missing_snapshots: Dict mapping system_id to missing snapshot names
             - latest_snapshots: Dict mapping system_id to latest snapshot info
+
+        Results are cached per (dataset, systems) and reused while the dataset's
+        snapshots are unchanged. Callers always get a deep copy, so mutating a
+        result cannot leak into the cached entry or other requests.
         """
+        if not system_ids:
+            return self._compare_snapshots_by_dataset(dataset, system_ids)
+
+        key = (dataset, frozenset(system_ids))
+        version = self.snapshot_repo.get_dataset_version(dataset, system_ids)
+        now = time.monotonic()
+        cached = None
+        with _comparison_cache_lock:
+            entry = _comparison_cache.get(key)
+            if entry is not None and entry[0] > now and entry[1] == version:
+                _comparison_cache.move_to_end(key)
+                cached = entry[2]
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        result = self._compare_snapshots_by_dataset(dataset, system_ids)
+        with _comparison_cache_lock:
+            _comparison_cache[key] = (now + COMPARISON_CACHE_TTL_SECONDS, version, result)
+            _comparison_cache.move_to_end(key)
+            if len(_comparison_cache) > COMPARISON_CACHE_MAXSIZE:
+                _comparison_cache.popitem(last=False)
+        return copy.deepcopy(result)
+
+    def _compare_snapshots_by_dataset(self, dataset: str, system_ids: List[UUID]) -> Dict[str, Any]:
+        """Compare a dataset's snapshots across systems, without the result cache."""
         logger.info("Comparing snapshots for %s across %s systems", dataset, len(system_ids))
 
-        # Get snapshots for each system
-        system_snapshots: Dict[UUID, List[SnapshotModel]] = {}
-        for system_id in system_ids:
-            snapshots = self.snapshot_repo.get_by_dataset(dataset=dataset, system_id=system_id)
-            system_snapshots[system_id] = snapshots
-
-        # Extract snapshot names (normalize by removing pool/dataset prefix)
-        system_snapshot_names: Dict[UUID, Set[str]] = {}
-        for system_id, snapshots in system_snapshots.items():
-            names = {self.extract_snapshot_name(snapshot.name) for snapshot in snapshots}
-            system_snapshot_names[system_id] = names
-
-        # Find common snapshots (intersection of all sets)
-        if not system_snapshot_names:
+        if not system_ids:
             return {
                 "common_snapshots": [],
                 "unique_snapshots": {},
@@ -55,46 +134,41 @@ class SnapshotComparisonService:
                 "latest_snapshots": {},
             }
 
-        common_snapshots = (
-            set.intersection(*system_snapshot_names.values()) if system_snapshot_names else set()
-        )
+        system_snapshot_names = self._load_dataset_names(dataset, system_ids)
+
+        # Find common snapshots (intersection of all sets)
+        common_snapshots = _progressive_intersection(system_snapshot_names.values())
+
+        # Count how many systems hold each name; a name held by exactly one
+        # system is unique to it, and every counted name is in the union
+        name_counts: Counter = Counter()
+        for names in system_snapshot_names.values():
+            name_counts.update(names)
 
         # Find unique snapshots per system
-        unique_snapshots: Dict[UUID, List[str]] = {}
-        for system_id, names in system_snapshot_names.items():
-            other_names = (
-                set.union(
-                    *[names for sid, names in system_snapshot_names.items() if sid != system_id]
-                )
-                if len(system_snapshot_names) > 1
-                else set()
-            )
-            unique = names - other_names
-            unique_snapshots[system_id] = sorted(list(unique))
+        unique_snapshots: Dict[UUID, List[str]] = {
+            system_id: sorted(name for name in names if name_counts[name] == 1)
+            for system_id, names in system_snapshot_names.items()
+        }
 
         # Find missing snapshots per system
-        missing_snapshots: Dict[UUID, List[str]] = {}
-        all_snapshots = (
-            set.union(*system_snapshot_names.values()) if system_snapshot_names else set()
-        )
-        for system_id, names in system_snapshot_names.items():
-            missing = all_snapshots - names
-            missing_snapshots[system_id] = sorted(list(missing))
-
-        # Find latest snapshot per system
-        latest_snapshots: Dict[UUID, Dict[str, Any]] = {}
-        for system_id, snapshots in system_snapshots.items():
-            if snapshots:
-                latest = max(snapshots, key=lambda s: s.timestamp)
-                latest_snapshots[system_id] = {
-                    "name": latest.name,
-                    "timestamp": latest.timestamp.isoformat(),
-                    "size": latest.size,
-                }
+        all_snapshots = name_counts.keys()
+        missing_snapshots: Dict[UUID, List[str]] = {
+            system_id: sorted(all_snapshots - names)
+            for system_id, names in system_snapshot_names.items()
+        }
+
+        # Latest snapshot per system
+        latest_snapshots: Dict[UUID, Dict[str, Any]] = {
+            system_id: {"name": name, "timestamp": timestamp.isoformat(), "size": size}
+            for system_id, name, timestamp, size in self.snapshot_repo.get_latest_dataset_rows(
+                dataset, system_ids
+            )
+        }
 
         return {
             "dataset": dataset,
-            "common_snapshots": sorted(list(common_snapshots)),
+            "common_snapshots": sorted(common_snapshots),
             "unique_snapshots": {str(sid): names for sid, names in unique_snapshots.items()},
             "missing_snapshots": {str(sid): names for sid, names in missing_snapshots.items()},
             "latest_snapshots": {str(sid): info for sid, info in latest_snapshots.items()},
@@ -113,15 +187,13 @@ class SnapshotComparisonService:
             - only_in_system_2: Snapshots only in second system
             - in_both: Snapshots in both systems
         """
-        snapshots_1 = self.snapshot_repo.get_by_dataset(dataset=dataset, system_id=system_id_1)
-        snapshots_2 = self.snapshot_repo.get_by_dataset(dataset=dataset, system_id=system_id_2)
-
-        names_1 = {self.extract_snapshot_name(s.name) for s in snapshots_1}
-        names_2 = {self.extract_snapshot_name(s.name) for s in snapshots_2}
+        system_snapshot_names = self._load_dataset_names(dataset, [system_id_1, system_id_2])
+        names_1 = system_snapshot_names[system_id_1]
+        names_2 = system_snapshot_names[system_id_2]
 
-        only_in_1 = sorted(list(names_1 - names_2))
-        only_in_2 = sorted(list(names_2 - names_1))
-        in_both = sorted(list(names_1 & names_2))
+        only_in_1 = sorted(names_1 - names_2)
+        only_in_2 = sorted(names_2 - names_1)
+        in_both = sorted(names_1 & names_2)
 
         return {
             "system_1": str(system_id_1),
@@ -140,41 +212,26 @@ class SnapshotComparisonService:
         Returns a list of gaps found, where a gap is a missing snapshot
         that exists on other systems but not on a particular system.
         """
-        comparison = self.compare_snapshots_by_dataset(dataset, system_ids)
+        system_snapshot_names = self._load_dataset_names(dataset, system_ids)
         gaps = []
 
         # Build a map of snapshot_name -> list of system_ids that have it
         snapshot_to_systems: Dict[str, List[str]] = {}
-        all_system_ids_str = [str(sid) for sid in system_ids]
-
-        # Common snapshots are present on all systems
-        common_snapshots = comparison.get("common_snapshots", [])
-        for snapshot_name in common_snapshots:
-            snapshot_to_systems[snapshot_name] = all_system_ids_str.copy()
-
-        # Unique snapshots are only on specific systems
-        unique_snapshots = comparison.get("unique_snapshots", {})
-        for system_id_str, names in unique_snapshots.items():
+        for system_id, names in system_snapshot_names.items():
+            system_id_str = str(system_id)
             for snapshot_name in names:
-                if snapshot_name not in snapshot_to_systems:
-                    snapshot_to_systems[snapshot_name] = []
-                if system_id_str not in snapshot_to_systems[snapshot_name]:
-                    snapshot_to_systems[snapshot_name].append(system_id_str)
-
-        for system_id_str, missing_names in comparison["missing_snapshots"].items():
-            for snapshot_name in missing_names:
-                # Find which systems have this snapshot from our map
-                systems_with_snapshot = snapshot_to_systems.get(snapshot_name, [])
-                # Filter out the current system
-                systems_with_snapshot = [
-                    sid for sid in systems_with_snapshot if sid != system_id_str
-                ]
+                snapshot_to_systems.setdefault(snapshot_name, []).append(system_id_str)
 
+        for system_id, names in system_snapshot_names.items():
+            system_id_str = str(system_id)
+            for snapshot_name in sorted(snapshot_to_systems.keys() - names):
                 gaps.append(
                     {
                         "system_id": system_id_str,
                         "missing_snapshot": snapshot_name,
-                        "available_on_systems": systems_with_snapshot,
+                        # The current system lacks it, so it is never in this list.
+                        # Each gap gets its own copy so callers can't alias them
+                        "available_on_systems": list(snapshot_to_systems[snapshot_name]),
                         "dataset": dataset,
                     }
                 )
@@ -188,6 +245,4 @@ class SnapshotComparisonService:
 
         Example: "tank/data@snapshot-20240115" -> "snapshot-20240115"
         """
-        if "@" in full_name:
-            return full_name.split("@")[-1]
-        return full_name
+        return extract_snapshot_name(full_name)
@@ -1,10 +1,10 @@
 """Service for tracking snapshot history and changes."""
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, desc
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from zfs_sync.database.models import SnapshotModel
@@ -14,6 +14,11 @@ from zfs_sync.logging_config import get_logger
 logger = get_logger(__name__)
 
 
+def _full_names(keys: Iterable[Tuple[str, str, str]]) -> List[str]:
+    """Format (pool, dataset, name) keys as sorted "pool/dataset@name" strings."""
+    return sorted(f"{pool}/{dataset}@{name}" for pool, dataset, name in keys)
+
+
 class SnapshotHistoryService:
     """Service for tracking and querying snapshot history."""
 
@@ -43,31 +48,42 @@ class SnapshotHistoryService:
         Returns:
             List of snapshot history entries
         """
-        query = self.db.query(SnapshotModel).filter(SnapshotModel.system_id == system_id)
+        # Plain rows rather than ORM entities: the result is only turned into dicts
+        stmt = select(
+            SnapshotModel.id,
+            SnapshotModel.name,
+            SnapshotModel.pool,
+            SnapshotModel.dataset,
+            SnapshotModel.timestamp,
+            SnapshotModel.size,
+            SnapshotModel.referenced,
+            SnapshotModel.used,
+            SnapshotModel.created_at,
+        ).where(SnapshotModel.system_id == system_id)
 
         if pool:
-            query = query.filter(SnapshotModel.pool == pool)
+            stmt = stmt.where(SnapshotModel.pool == pool)
         if dataset:
-            query = query.filter(SnapshotModel.dataset == dataset)
+            stmt = stmt.where(SnapshotModel.dataset == dataset)
         if days:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-            query = query.filter(SnapshotModel.timestamp >= cutoff_date)
+            stmt = stmt.where(SnapshotModel.timestamp >= cutoff_date)
 
-        snapshots = query.order_by(desc(SnapshotModel.timestamp)).limit(limit).all()
+        rows = self.db.execute(stmt.order_by(SnapshotModel.timestamp.desc()).limit(limit))
 
         return [
             {
-                "id": str(snapshot.id),
-                "name": snapshot.name,
-                "pool": snapshot.pool,
-                "dataset": snapshot.dataset,
-                "timestamp": snapshot.timestamp.isoformat(),
-                "size": snapshot.size,
-                "referenced": snapshot.referenced,
-                "used": snapshot.used,
-                "created_at": snapshot.created_at.isoformat(),
+                "id": str(row.id),
+                "name": row.name,
+                "pool": row.pool,
+                "dataset": row.dataset,
+                "timestamp": row.timestamp.isoformat(),
+                "size": row.size,
+                "referenced": row.referenced,
+                "used": row.used,
+                "created_at": row.created_at.isoformat(),
             }
-            for snapshot in snapshots
+            for row in rows
         ]
 
     def get_snapshot_timeline(
@@ -78,24 +94,19 @@ class SnapshotHistoryService:
 
         Returns snapshots ordered by timestamp with system information.
         """
-        all_snapshots = []
-        for system_id in system_ids:
-            snapshots = self.snapshot_repo.get_by_pool_dataset(
-                pool=pool, dataset=dataset, system_id=system_id
+        # One query for every system, already ordered by timestamp in the database
+        all_snapshots = [
+            {
+                "snapshot_id": str(snapshot.id),
+                "name": snapshot.name,
+                "system_id": str(snapshot.system_id),
+                "timestamp": snapshot.timestamp.isoformat(),
+                "size": snapshot.size,
+            }
+            for snapshot in self.snapshot_repo.get_by_pool_dataset_for_systems(
+                pool, dataset, system_ids
             )
-            for snapshot in snapshots:
-                all_snapshots.append(
-                    {
-                        "snapshot_id": str(snapshot.id),
-                        "name": snapshot.name,
-                        "system_id": str(system_id),
-                        "timestamp": snapshot.timestamp.isoformat(),
-                        "size": snapshot.size,
-                    }
-                )
-
-        # Sort by timestamp
-        all_snapshots.sort(key=lambda x: x["timestamp"])
+        ]
 
         return {
             "pool": pool,
@@ -113,18 +124,24 @@ class SnapshotHistoryService:
         """
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
 
-        snapshots = (
-            self.db.query(SnapshotModel)
-            .filter(
-                and_(
-                    SnapshotModel.system_id == system_id,
-                    SnapshotModel.timestamp >= cutoff_date,
-                )
+        # Aggregate per dataset in the database; only one row per dataset comes back
+        rows = self.db.execute(
+            select(
+                SnapshotModel.pool,
+                SnapshotModel.dataset,
+                func.count(),
+                func.coalesce(func.sum(SnapshotModel.size), 0),
+                func.min(SnapshotModel.timestamp),
+                func.max(SnapshotModel.timestamp),
+            )
+            .where(
+                SnapshotModel.system_id == system_id,
+                SnapshotModel.timestamp >= cutoff_date,
             )
-            .all()
-        )
+            .group_by(SnapshotModel.pool, SnapshotModel.dataset)
+        ).all()
 
-        if not snapshots:
+        if not rows:
             return {
                 "system_id": str(system_id),
                 "period_days": days,
@@ -134,25 +151,27 @@ class SnapshotHistoryService:
                 "datasets": {},
             }
 
-        total_size = sum(s.size or 0 for s in snapshots)
+        total_snapshots = 0
+        total_size = 0
         pools: Dict[str, int] = {}
         datasets: Dict[str, int] = {}
 
-        for snapshot in snapshots:
-            pools[snapshot.pool] = pools.get(snapshot.pool, 0) + 1
-            dataset_key = f"{snapshot.pool}/{snapshot.dataset}"
-            datasets[dataset_key] = datasets.get(dataset_key, 0) + 1
+        for pool, dataset, count, size, _, _ in rows:
+            total_snapshots += count
+            total_size += size
+            pools[pool] = pools.get(pool, 0) + count
+            datasets[f"{pool}/{dataset}"] = count
 
         return {
             "system_id": str(system_id),
             "period_days": days,
-            "total_snapshots": len(snapshots),
+            "total_snapshots": total_snapshots,
             "total_size": total_size,
-            "average_size": total_size / len(snapshots) if snapshots else 0,
+            "average_size": total_size / total_snapshots,
             "pools": pools,
             "datasets": datasets,
-            "oldest_snapshot": min(s.timestamp for s in snapshots).isoformat(),
-            "newest_snapshot": max(s.timestamp for s in snapshots).isoformat(),
+            "oldest_snapshot": min(row[4] for row in rows).isoformat(),
+            "newest_snapshot": max(row[5] for row in rows).isoformat(),
         }
 
     def track_snapshot_changes(
@@ -164,20 +183,19 @@ class SnapshotHistoryService:
         Returns:
             Dictionary with added, removed, and unchanged snapshots
         """
-        # Get existing snapshots from database
-        existing_snapshots = self.snapshot_repo.get_by_system(system_id)
-
-        existing_names = {f"{s.pool}/{s.dataset}@{s.name}" for s in existing_snapshots}
-        current_names = {f"{s['pool']}/{s['dataset']}@{s['name']}" for s in current_snapshots}
+        # Compare (pool, dataset, name) keys as returned by the database; only the
+        # keys that end up in the result are formatted as full snapshot names
+        existing_keys = set(self.snapshot_repo.get_keys_by_system(system_id))
+        current_keys = {(s["pool"], s["dataset"], s["name"]) for s in current_snapshots}
 
-        added = current_names - existing_names
-        removed = existing_names - current_names
-        unchanged = existing_names & current_names
+        added = current_keys - existing_keys
+        removed = existing_keys - current_keys
+        unchanged = current_keys - added
 
         return {
             "system_id": str(system_id),
-            "added_snapshots": sorted(list(added)),
-            "removed_snapshots": sorted(list(removed)),
-            "unchanged_snapshots": sorted(list(unchanged)),
+            "added_snapshots": _full_names(added),
+            "removed_snapshots": _full_names(removed),
+            "unchanged_snapshots": _full_names(unchanged),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
@@ -1,17 +1,62 @@
 """Service for generating SSH-based ZFS send/receive commands."""
 
 import shlex
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from zfs_sync.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# The generators are pure functions of their (hashable) arguments and are called
+# with the same pools, datasets and hosts over and over by the scheduler, so their
+# results are memoized
+COMMAND_CACHE_MAXSIZE = 4096
+
+
+@lru_cache(maxsize=256)
+def _ssh_prefix(hostname: str, user: Optional[str], port: int) -> str:
+    """
+    "ssh [-p port] [user@]hostname" for an endpoint.
+
+    Cached per endpoint, since a sync batch sends many snapshots to the same host.
+    The target isn't escaped as it's part of SSH syntax.
+    """
+    ssh_parts = ["ssh"]
+    if port != 22:
+        ssh_parts.append(f"-p {port}")
+    ssh_parts.append(f"{user}@{hostname}" if user else hostname)
+    return " ".join(ssh_parts)
+
+
+def _dataset_path(pool: str, dataset: str) -> str:
+    """Full dataset path; dataset may already include the pool (e.g. "tank/data")."""
+    return dataset if "/" in dataset else f"{pool}/{dataset}"
+
+
+def _quoted_path(pool: str, dataset: str, snapshot_name: str) -> str:
+    """Shell-quoted full snapshot path."""
+    return shlex.quote(f"{_dataset_path(pool, dataset)}@{snapshot_name}")
+
+
+def _sync_pipeline(
+    send_tokens: Tuple[str, ...], target_ssh_hostname: str, target_pool: str, target_dataset: str
+) -> str:
+    """
+    Join a local zfs send with a zfs receive run on the target over SSH.
+
+    The whole pipeline is built with one join over already-quoted tokens;
+    -s makes the receive resumable.
+    """
+    receive_cmd = f"zfs receive -s {shlex.quote(_dataset_path(target_pool, target_dataset))}"
+    return " ".join((*send_tokens, "|", "ssh", target_ssh_hostname, shlex.quote(receive_cmd)))
+
 
 class SSHCommandGenerator:
     """Service for generating SSH-based ZFS send/receive commands."""
 
     @staticmethod
+    @lru_cache(maxsize=COMMAND_CACHE_MAXSIZE)
     def escape_shell_string(value: str) -> str:
         """
         Escape a string for safe use in shell commands.
@@ -25,6 +70,7 @@ class SSHCommandGenerator:
         return shlex.quote(value)
 
     @staticmethod
+    @lru_cache(maxsize=COMMAND_CACHE_MAXSIZE)
     def generate_ssh_command(
         hostname: str,
         user: Optional[str] = None,
@@ -43,26 +89,14 @@ class SSHCommandGenerator:
         Returns:
             SSH command string
         """
-        ssh_parts = ["ssh"]
-        if port != 22:
-            ssh_parts.append(f"-p {port}")
-
-        # Build target (user@hostname or just hostname)
-        # Note: We don't escape the target as it's part of SSH syntax
-        if user:
-            target = f"{user}@{hostname}"
-        else:
-            target = hostname
-
-        ssh_parts.append(target)
-
-        if command:
-            # Command should be quoted as a single argument to SSH
-            ssh_parts.append(SSHCommandGenerator.escape_shell_string(command))
-
-        return " ".join(ssh_parts)
+        prefix = _ssh_prefix(hostname, user, port)
+        if not command:
+            return prefix
+        # Command should be quoted as a single argument to SSH
+        return f"{prefix} {SSHCommandGenerator.escape_shell_string(command)}"
 
     @staticmethod
+    @lru_cache(maxsize=COMMAND_CACHE_MAXSIZE)
     def generate_zfs_send_command(
         pool: str,
         dataset: str,
@@ -87,25 +121,16 @@ class SSHCommandGenerator:
         Returns:
             ZFS send command string ready to pipe to zfs receive
         """
-        # Construct full snapshot path
-        # Dataset may already include pool (e.g., "tank/data") or just be dataset name
-        # Use dataset as-is if it contains '/', otherwise prepend pool
-        if "/" in dataset:
-            full_snapshot = f"{dataset}@{snapshot_name}"
-        else:
-            full_snapshot = f"{pool}/{dataset}@{snapshot_name}"
-
         if incremental_base:
             # Incremental send: zfs send -I base_snapshot ending_snapshot
-            # Order: base_snapshot (earlier/common) first, full_snapshot (later/ending) second
-            if "/" in dataset:
-                base_snapshot = f"{dataset}@{incremental_base}"
-            else:
-                base_snapshot = f"{pool}/{dataset}@{incremental_base}"
-            zfs_command = f"zfs send -I {SSHCommandGenerator.escape_shell_string(base_snapshot)} {SSHCommandGenerator.escape_shell_string(full_snapshot)}"
+            # Order: base_snapshot (earlier/common) first, ending snapshot second
+            zfs_command = (
+                f"zfs send -I {_quoted_path(pool, dataset, incremental_base)} "
+                f"{_quoted_path(pool, dataset, snapshot_name)}"
+            )
         else:
             # Full send: zfs send snapshot
-            zfs_command = f"zfs send {SSHCommandGenerator.escape_shell_string(full_snapshot)}"
+            zfs_command = f"zfs send {_quoted_path(pool, dataset, snapshot_name)}"
 
         ssh_cmd = SSHCommandGenerator.generate_ssh_command(
             hostname=ssh_hostname, user=ssh_user, port=ssh_port, command=zfs_command
@@ -114,6 +139,7 @@ class SSHCommandGenerator:
         return ssh_cmd
 
     @staticmethod
+    @lru_cache(maxsize=COMMAND_CACHE_MAXSIZE)
     def generate_zfs_receive_command(
         pool: str,
         dataset: str,
@@ -131,16 +157,10 @@ class SSHCommandGenerator:
             ZFS receive command string
         """
         flags = "-F" if force else ""
-        # Dataset may already include pool (e.g., "tank/data") or just be dataset name
-        if "/" in dataset:
-            target_dataset = dataset
-        else:
-            target_dataset = f"{pool}/{dataset}"
-        return (
-            f"zfs receive {flags} {SSHCommandGenerator.escape_shell_string(target_dataset)}".strip()
-        )
+        return f"zfs receive {flags} {shlex.quote(_dataset_path(pool, dataset))}".strip()
 
     @staticmethod
+    @lru_cache(maxsize=COMMAND_CACHE_MAXSIZE)
     def generate_full_sync_command(
         pool: str,
         dataset: str,
@@ -169,34 +189,12 @@ class SSHCommandGenerator:
         tgt_pool = target_pool if target_pool else pool
         tgt_dataset = target_dataset if target_dataset else dataset
 
-        # Build full snapshot path for source
-        if "/" in dataset:
-            full_snapshot = f"{dataset}@{snapshot_name}"
-        else:
-            full_snapshot = f"{pool}/{dataset}@{snapshot_name}"
-
-        # Build target dataset path
-        if "/" in tgt_dataset:
-            target_dataset_path = tgt_dataset
-        else:
-            target_dataset_path = f"{tgt_pool}/{tgt_dataset}"
-
-        # Generate zfs send command (runs locally on source)
-        # -c flag for compressed send
-        send_cmd = f"zfs send -c {SSHCommandGenerator.escape_shell_string(full_snapshot)}"
-
-        # Generate SSH receive command (runs on target)
-        # -s flag for sparse receive
-        receive_cmd = (
-            f"zfs receive -s {SSHCommandGenerator.escape_shell_string(target_dataset_path)}"
-        )
-        ssh_receive = (
-            f"ssh {target_ssh_hostname} {SSHCommandGenerator.escape_shell_string(receive_cmd)}"
-        )
-
-        return f"{send_cmd} | {ssh_receive}"
+        # zfs send runs locally on source; -c flag for compressed send
+        send_tokens = ("zfs", "send", "-c", _quoted_path(pool, dataset, snapshot_name))
+        return _sync_pipeline(send_tokens, target_ssh_hostname, tgt_pool, tgt_dataset)
 
     @staticmethod
+    @lru_cache(maxsize=COMMAND_CACHE_MAXSIZE)
     def generate_incremental_sync_command(
         pool: str,
         dataset: str,
@@ -229,32 +227,15 @@ class SSHCommandGenerator:
         tgt_pool = target_pool if target_pool else pool
         tgt_dataset = target_dataset if target_dataset else dataset
 
-        # Build full snapshot paths for source
-        if "/" in dataset:
-            full_snapshot = f"{dataset}@{snapshot_name}"
-            base_snapshot = f"{dataset}@{incremental_base}"
-        else:
-            full_snapshot = f"{pool}/{dataset}@{snapshot_name}"
-            base_snapshot = f"{pool}/{dataset}@{incremental_base}"
-
-        # Build target dataset path
-        if "/" in tgt_dataset:
-            target_dataset_path = tgt_dataset
-        else:
-            target_dataset_path = f"{tgt_pool}/{tgt_dataset}"
-
-        # Generate zfs send command (runs locally on source)
-        # -c flag for compressed send; -I flag for incremental send (base snapshot first, ending snapshot second)
+        # zfs send runs locally on source; -c flag for compressed send; -I flag for
+        # incremental send (base snapshot first, ending snapshot second)
         # Order: base_snapshot (earlier/common) first, full_snapshot (later/ending) second
-        send_cmd = f"zfs send -c -I {SSHCommandGenerator.escape_shell_string(base_snapshot)} {SSHCommandGenerator.escape_shell_string(full_snapshot)}"
-
-        # Generate SSH receive command (runs on target)
-        # -s flag for sparse receive
-        receive_cmd = (
-            f"zfs receive -s {SSHCommandGenerator.escape_shell_string(target_dataset_path)}"
+        send_tokens = (
+            "zfs",
+            "send",
+            "-c",
+            "-I",
+            _quoted_path(pool, dataset, incremental_base),
+            _quoted_path(pool, dataset, snapshot_name),
         )
-        ssh_receive = (
-            f"ssh {target_ssh_hostname} {SSHCommandGenerator.escape_shell_string(receive_cmd)}"
-        )
-
-        return f"{send_cmd} | {ssh_receive}"
+        return _sync_pipeline(send_tokens, target_ssh_hostname, tgt_pool, tgt_dataset)
@@ -6,7 +6,7 @@ from uuid import UUID
 
 from sqlalchemy.orm import Session
 
-from zfs_sync.database.models import SyncStateModel
+from zfs_sync.database.models import SnapshotModel, SyncStateModel
 from zfs_sync.config import get_settings
 from zfs_sync.database.repositories import (
     SnapshotRepository,
@@ -524,7 +524,7 @@ class SyncCoordinationService:
             logger.debug("Filtering to sync group %s", sync_group_id)
         else:
             # Find all sync groups containing this system
-            all_groups = self.sync_group_repo.get_all()
+            all_groups = self.sync_group_repo.get_all_with_systems()
             sync_groups = [
                 group
                 for group in all_groups
@@ -864,7 +864,7 @@ class SyncCoordinationService:
                 existing.error_message = error_message
             else:
                 existing.error_message = None
-            self.db.commit()
+            self.sync_state_repo.commit()
             self.db.refresh(existing)
             return existing
         else:
@@ -905,12 +905,7 @@ class SyncCoordinationService:
 
     def _get_datasets_for_systems(self, system_ids: List[UUID]) -> List[str]:
         """Get unique dataset names from snapshots for given systems."""
-        datasets: Set[str] = set()
-        for system_id in system_ids:
-            snapshots = self.snapshot_repo.get_by_system(system_id)
-            for snapshot in snapshots:
-                datasets.add(snapshot.dataset)
-        return list(datasets)
+        return self.snapshot_repo.get_datasets(system_ids)
 
     def _find_snapshot_id_and_pool(
         self, dataset: str, snapshot_name: str, system_id: UUID
@@ -1030,14 +1025,21 @@ class SyncCoordinationService:
 
         # Get all systems in the sync group
         system_ids = [assoc.system_id for assoc in sync_group.system_associations]
-        systems_info = []
-        for system_id in system_ids:
-            system = self.system_repo.get(system_id)
-            if system:
-                systems_info.append({"system_id": str(system_id), "hostname": system.hostname})
+        systems = self.system_repo.get_many(system_ids)
+        systems_info = [
+            {"system_id": str(system_id), "hostname": systems[system_id].hostname}
+            for system_id in system_ids
+            if system_id in systems
+        ]
 
-        # Get all datasets for this sync group
-        datasets = self._get_datasets_for_systems(system_ids)
+        # Load the group's snapshots once and group them by dataset and system,
+        # rather than querying every (dataset, system) pair
+        snapshots_by_dataset: Dict[str, Dict[UUID, List[SnapshotModel]]] = {}
+        for snapshot in self.snapshot_repo.get_by_systems(system_ids):
+            snapshots_by_dataset.setdefault(snapshot.dataset, {}).setdefault(
+                snapshot.system_id, []
+            ).append(snapshot)
+        datasets = sorted(snapshots_by_dataset)
 
         # Get detected mismatches
         mismatches = self.detect_sync_mismatches(sync_group_id=sync_group_id)
@@ -1059,9 +1061,7 @@ class SyncCoordinationService:
             dataset_systems = []
             system_snapshot_names: Dict[UUID, Set[str]] = {}
             for system_id in system_ids:
-                snapshots = self.snapshot_repo.get_by_dataset(
-                    dataset=dataset_name, system_id=system_id
-                )
+                snapshots = snapshots_by_dataset[dataset_name].get(system_id, [])
                 last_snapshot = None
                 pool = None
                 if snapshots:
@@ -1069,7 +1069,7 @@ class SyncCoordinationService:
                     last_snapshot = self.comparison_service.extract_snapshot_name(latest.name)
                     pool = latest.pool
 
-                system = self.system_repo.get(system_id)
+                system = systems.get(system_id)
                 dataset_systems.append(
                     {
                         "system_id": str(system_id),
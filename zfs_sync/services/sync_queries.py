@@ -28,16 +28,8 @@ def get_datasets_for_systems(
     """
     dataset_mappings: Dict[str, List[Tuple[str, UUID]]] = {}
     for system_id in system_ids:
-        snapshots = snapshot_repo.get_by_system(system_id)
-        for snapshot in snapshots:
-            # SQLAlchemy attributes are Column[str] at type-check time but str at runtime
-            dataset_name: str = str(snapshot.dataset)  # type: ignore
-            if dataset_name not in dataset_mappings:  # type: ignore
-                dataset_mappings[dataset_name] = []  # type: ignore
-            # Add (pool, system_id) if not already present
-            pool_system: Tuple[str, UUID] = (str(snapshot.pool), system_id)  # type: ignore
-            if pool_system not in dataset_mappings[dataset_name]:  # type: ignore
-                dataset_mappings[dataset_name].append(pool_system)  # type: ignore
+        for pool, dataset_name in snapshot_repo.get_pool_datasets(system_id):
+            dataset_mappings.setdefault(dataset_name, []).append((pool, system_id))
     return dataset_mappings
 
 
@@ -56,7 +48,7 @@ def find_systems_with_snapshot(
             pool=pool, dataset=dataset, system_id=system_id
         )
         for snapshot in snapshots:
-            if comparison_service._extract_snapshot_name(snapshot.name) == snapshot_name:
+            if comparison_service.extract_snapshot_name(snapshot.name) == snapshot_name:
                 systems_with_snapshot.append(system_id)
                 break
     return systems_with_snapshot
@@ -86,13 +78,11 @@ def find_systems_with_snapshot_by_dataset_name(
     """
     systems_with_snapshot = []
     for system_id in system_ids:
-        # Get all snapshots for this system
-        all_snapshots = snapshot_repo.get_by_system(system_id)
-        # Filter by dataset name (ignoring pool)
-        for snapshot in all_snapshots:
-            if snapshot.dataset == dataset_name:
-                if comparison_service._extract_snapshot_name(snapshot.name) == snapshot_name:
-                    systems_with_snapshot.append((system_id, snapshot.pool))
+        # Filter by dataset name (ignoring pool); only the keys are needed
+        for pool, dataset, name in snapshot_repo.get_keys_by_system(system_id):
+            if dataset == dataset_name:
+                if comparison_service.extract_snapshot_name(name) == snapshot_name:
+                    systems_with_snapshot.append((system_id, pool))
                     break
     return systems_with_snapshot
 
@@ -123,7 +113,7 @@ def find_snapshot_id(
     """
     snapshots = snapshot_repo.get_by_pool_dataset(pool=pool, dataset=dataset, system_id=system_id)
     for snapshot in snapshots:
-        if comparison_service._extract_snapshot_name(snapshot.name) == snapshot_name:
+        if comparison_service.extract_snapshot_name(snapshot.name) == snapshot_name:
             return snapshot.id
     logger.warning(
         "Could not find snapshot_id for %s on system %s for %s/%s",
@@ -161,7 +151,7 @@ def estimate_snapshot_size(
         pool=pool, dataset=dataset, system_id=source_system_id
     )
     for snapshot in snapshots:
-        if comparison_service._extract_snapshot_name(snapshot.name) == snapshot_name:
+        if comparison_service.extract_snapshot_name(snapshot.name) == snapshot_name:
             return snapshot.size
     return None
 
@@ -201,10 +191,10 @@ def find_incremental_base(
 
     # Extract snapshot names (without pool/dataset prefix)
     target_names = {
-        comparison_service._extract_snapshot_name(s.name): s.timestamp for s in target_snapshots
+        comparison_service.extract_snapshot_name(s.name): s.timestamp for s in target_snapshots
     }
     source_names = {
-        comparison_service._extract_snapshot_name(s.name): s.timestamp for s in source_snapshots
+        comparison_service.extract_snapshot_name(s.name): s.timestamp for s in source_snapshots
     }
 
     # Find common snapshots, sorted by timestamp (most recent first)
@@ -258,14 +248,14 @@ def find_incremental_base_by_dataset_name(
 
     # Extract snapshot names (without pool/dataset prefix) - only midnight snapshots
     target_names = {
-        comparison_service._extract_snapshot_name(s.name): s.timestamp
+        comparison_service.extract_snapshot_name(s.name): s.timestamp
         for s in target_snapshots
-        if is_midnight_snapshot(comparison_service._extract_snapshot_name(s.name))
+        if is_midnight_snapshot(comparison_service.extract_snapshot_name(s.name))
     }
     source_names = {
-        comparison_service._extract_snapshot_name(s.name): s.timestamp
+        comparison_service.extract_snapshot_name(s.name): s.timestamp
         for s in source_snapshots
-        if is_midnight_snapshot(comparison_service._extract_snapshot_name(s.name))
+        if is_midnight_snapshot(comparison_service.extract_snapshot_name(s.name))
     }
 
     # Find common snapshots, sorted by timestamp (most recent first)
@@ -303,9 +293,7 @@ def calculate_priority(
     latest_snapshots = comparison.get("latest_snapshots", {})
     for latest_info in latest_snapshots.values():
         # Extract snapshot name from full name (e.g., "tank/data@snapshot-20240115" -> "snapshot-20240115")
-        latest_snapshot_name = comparison_service._extract_snapshot_name(
-            latest_info.get("name", "")
-        )
+        latest_snapshot_name = comparison_service.extract_snapshot_name(latest_info.get("name", ""))
         if latest_snapshot_name == snapshot_name:
             priority += 20
             break
@@ -1,7 +1,7 @@
 """Background scheduler service for automatic snapshot synchronization."""
 
 import asyncio
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -76,20 +76,25 @@ class SyncSchedulerService:
         db = next(get_db())
         try:
             sync_group_repo = SyncGroupRepository(db)
-            enabled_groups = sync_group_repo.get_enabled()
+            # Read every group's members up front with their associations preloaded:
+            # processing a group commits, which expires the loaded groups
+            members = {
+                sync_group.id: [assoc.system_id for assoc in sync_group.system_associations]
+                for sync_group in sync_group_repo.get_enabled_with_systems()
+            }
 
-            logger.debug(f"Processing {len(enabled_groups)} enabled sync groups")
+            logger.debug(f"Processing {len(members)} enabled sync groups")
 
-            for sync_group in enabled_groups:
+            for sync_group_id, system_ids in members.items():
                 if not self._running:
                     break
 
-                if self.should_process_sync_group(sync_group.id, db):
+                if self._has_enough_systems(sync_group_id, system_ids):
                     try:
-                        await self._process_sync_group(sync_group.id, db)
+                        await self._process_sync_group(sync_group_id, db, system_ids)
                     except Exception as e:
                         logger.error(
-                            f"Error processing sync group {sync_group.id}: {e}",
+                            f"Error processing sync group {sync_group_id}: {e}",
                             exc_info=True,
                         )
         finally:
@@ -110,8 +115,12 @@ class SyncSchedulerService:
         if not sync_group.enabled:
             return False
 
-        # Check if sync group has at least 2 systems
         system_ids = [assoc.system_id for assoc in sync_group.system_associations]
+        return self._has_enough_systems(sync_group_id, system_ids)
+
+    @staticmethod
+    def _has_enough_systems(sync_group_id: UUID, system_ids: List[UUID]) -> bool:
+        """Check that a sync group has at least 2 systems to sync between."""
         if len(system_ids) < 2:
             logger.debug(f"Sync group {sync_group_id} has less than 2 systems, skipping")
             return False
@@ -120,10 +129,15 @@ class SyncSchedulerService:
         # For now, process every time (can be enhanced with last_processed tracking)
         return True
 
-    async def _process_sync_group(self, sync_group_id: UUID, db: Session) -> None:
+    async def _process_sync_group(
+        self, sync_group_id: UUID, db: Session, system_ids: Optional[List[UUID]] = None
+    ) -> None:
         """
         Process a single sync group.
 
+        system_ids are the group's members when the caller already loaded them;
+        otherwise the group is looked up.
+
         This includes:
         - Detecting conflicts and logging them
         - Detecting mismatches
@@ -135,15 +149,16 @@ class SyncSchedulerService:
         try:
             # Detect and log conflicts
             conflict_service = ConflictResolutionService(db)
-            sync_group_repo = SyncGroupRepository(db)
-            sync_group = sync_group_repo.get(sync_group_id)
+            if system_ids is None:
+                sync_group = SyncGroupRepository(db).get(sync_group_id)
+
+                if not sync_group:
+                    logger.warning(f"Sync group {sync_group_id} not found")
+                    return
 
-            if not sync_group:
-                logger.warning(f"Sync group {sync_group_id} not found")
-                return
+                system_ids = [assoc.system_id for assoc in sync_group.system_associations]
 
             # Get all datasets for this sync group (now returns dataset_name -> [(pool, system_id), ...])
-            system_ids = [assoc.system_id for assoc in sync_group.system_associations]
             sync_coord_service = SyncCoordinationService(db)
             dataset_mappings = get_datasets_for_systems(
                 system_ids, sync_coord_service.snapshot_repo
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from zfs_sync.config import get_settings
 from zfs_sync.database.repositories import SystemRepository
 from zfs_sync.logging_config import get_logger
+from zfs_sync.models import ConnectivityStatus
 
 logger = get_logger(__name__)
 
@@ -28,27 +29,25 @@ class SystemHealthService:
 
         Updates last_seen timestamp and connectivity status.
         """
-        system = self.system_repo.get(system_id)
-        if not system:
-            raise ValueError(
-                f"System '{system_id}' not found. "
-                f"Cannot record heartbeat for non-existent system."
-            )
-
         now = datetime.now(timezone.utc)
-        self.system_repo.update(
+        system = self.system_repo.update_by_id(
             system_id,
             last_seen=now,
-            connectivity_status="online",
+            connectivity_status=ConnectivityStatus.ONLINE.value,
             extra_metadata=metadata or {},
         )
+        if not system:
+            raise ValueError(
+                f"System '{system_id}' not found. "
+                f"Cannot record heartbeat for non-existent system."
+            )
 
         logger.debug(f"Heartbeat recorded for system {system_id}")
 
         return {
             "system_id": str(system_id),
             "last_seen": now.isoformat(),
-            "status": "online",
+            "status": ConnectivityStatus.ONLINE.value,
         }
 
     def check_system_health(self, system_id: UUID) -> Dict[str, Any]:
@@ -74,7 +73,9 @@ class SystemHealthService:
             is_online = time_since_last_seen < timeout_seconds
 
         # Update connectivity status if needed
-        new_status = "online" if is_online else "offline"
+        new_status = (
+            ConnectivityStatus.ONLINE.value if is_online else ConnectivityStatus.OFFLINE.value
+        )
         if system.connectivity_status != new_status:
             self.system_repo.update(system_id, connectivity_status=new_status)
             logger.info(f"System {system_id} status changed to {new_status}")